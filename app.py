@@ -1,23 +1,86 @@
-import os
+import functools
 import streamlit as st
 from dotenv import load_dotenv
 from src.utils.helpers import *
-from src.generator.question_generator import QuestionGenerator
+from src.config.settings import settings
+from src.metrics.registry import start_metrics_server
 
 load_dotenv()
 
 
+def stream_quiz(generator, topic, question_type, difficulty, num_questions):
+    """Show each question as soon as it is generated instead of waiting for the whole quiz."""
+    progress = st.progress(0, text="Generating questions...")
+    preview = st.container()
+    try:
+        stream = st.session_state.quiz_manager.generate_questions_stream(
+            generator, topic, question_type, difficulty, num_questions
+        )
+        for i, q in enumerate(stream, start=1):
+            progress.progress(i / num_questions, text=f"{i}/{num_questions} questions ready")
+            preview.markdown(f"**Question {i}: {q['question']}**")
+    except Exception as e:
+        st.error(f"Error generating questions: {e}")
+        return False
+    finally:
+        progress.empty()
+    return True
+
+
+@st.fragment(run_every=settings.JOBS_POLL_INTERVAL)
+def poll_quiz_job():
+    """Show the background job's progress; load the quiz into the session once it is done."""
+    job_id = st.session_state.get("quiz_job")
+    if not job_id:
+        return
+    from src.jobs.job_queue import get_job_queue, RUNNING, DONE, FAILED
+
+    jobs = get_job_queue()
+    status = jobs.status(job_id)
+    if status is None:
+        # expired, or from before a restart
+        st.session_state.quiz_job = None
+        st.query_params.pop("job", None)
+        return
+    if status["status"] not in (DONE, FAILED):
+        text = f"{status['ready']}/{status['total']} questions ready" if status["status"] == RUNNING else "Waiting for a free worker..."
+        st.progress(status["ready"] / status["total"], text=text)
+        return
+
+    job = jobs.fetch(job_id)
+    st.session_state.quiz_job = None
+    if job.status == FAILED:
+        st.query_params.pop("job", None)
+        st.error(f"Error generating questions: {job.error}")
+        return
+    st.session_state.quiz_manager.adopt(job.manager)
+    st.session_state.quiz_generated = True
+    st.rerun()
+
+
 def main():
     st.set_page_config(page_title="SmartLearn AI", page_icon="🎓", layout="wide")
 
+    if settings.METRICS_ENABLED:
+        start_metrics_server()
+
     if "quiz_manager" not in st.session_state:
-        st.session_state.quiz_manager = QuizManager()
+        if settings.API_URL:
+            from src.api.client import RemoteQuizManager
+            st.session_state.quiz_manager = RemoteQuizManager()
+        else:
+            st.session_state.quiz_manager = QuizManager()
     if "quiz_generated" not in st.session_state:
         st.session_state.quiz_generated = False
     if "quiz_submitted" not in st.session_state:
         st.session_state.quiz_submitted = False
+    if "quiz_report" not in st.session_state:
+        st.session_state.quiz_report = None
     if "rerun_trigger" not in st.session_state:
         st.session_state.rerun_trigger = False
+    if "quiz_job" not in st.session_state:
+        # the job id survives a page reload in the URL, so the quiz is not generated twice
+        st.session_state.quiz_job = st.query_params.get("job") if settings.JOBS_ENABLED else None
 
     st.markdown(
         """
@@ -62,44 +125,76 @@ def main():
 
     if st.sidebar.button("🎯 Generate Quiz"):
         st.session_state.quiz_submitted = False
+        st.session_state.quiz_report = None
+        st.session_state.saved_quiz_id = None
         keys_to_remove = [key for key in st.session_state.keys() if key.startswith("user_answer_")]
         for key in keys_to_remove:
             del st.session_state[key]
 
-        generator = QuestionGenerator()
-        success = st.session_state.quiz_manager.generate_questions(
-            generator, topic, question_type, difficulty, num_questions
-        )
-        st.session_state.quiz_generated = success
-        rerun()
+        if settings.JOBS_ENABLED:
+            from streamlit.runtime.scriptrunner import get_script_run_ctx
+            from src.jobs.job_queue import get_job_queue, JobRejectedError
+
+            st.session_state.quiz_generated = False
+            try:
+                job_id = get_job_queue().submit(
+                    get_script_run_ctx().session_id, topic, question_type, difficulty, num_questions
+                )
+                st.session_state.quiz_job = job_id
+                st.query_params["job"] = job_id
+            except (JobRejectedError, ValueError) as e:
+                st.warning(str(e))
+        else:
+            if settings.API_URL:
+                generator = None  # the quiz API owns generation
+            else:
+                from src.generator.question_generator import QuestionGenerator
+                generator = QuestionGenerator()
+            if settings.STREAMING_ENABLED:
+                success = stream_quiz(generator, topic, question_type, difficulty, num_questions)
+            else:
+                success = st.session_state.quiz_manager.generate_questions(
+                    generator, topic, question_type, difficulty, num_questions
+                )
+            st.session_state.quiz_generated = success
+            rerun()
+
+    if st.session_state.quiz_job:
+        poll_quiz_job()
 
     if st.session_state.quiz_generated and st.session_state.quiz_manager.questions:
         st.markdown(
             "<h2 style='color:#4B8BBE;'>📝 Quiz</h2>", unsafe_allow_html=True
         )
-        with st.container():
+        if settings.QUIZ_RENDER_MODE == "form":
+            # answers are sent together on submit, so typing does not rerun the page
+            quiz_area = st.form("quiz_form", border=False)
+            submit = quiz_area.form_submit_button
+        else:
+            quiz_area = st.container()
+            submit = st.button
+        with quiz_area:
             st.session_state.quiz_manager.attempt_quiz()
             st.markdown("<br>", unsafe_allow_html=True)
-            if st.button("✅ Submit Quiz"):
+            if submit("✅ Submit Quiz"):
                 st.session_state.quiz_manager.evaluate_quiz()
+                st.session_state.quiz_report = st.session_state.quiz_manager.result_summary()
                 st.session_state.quiz_submitted = True
                 rerun()
 
     if st.session_state.quiz_submitted:
         st.markdown("<h2 style='color:#4B8BBE;'>📊 Quiz Results</h2>", unsafe_allow_html=True)
-        results_df = st.session_state.quiz_manager.generate_result_dataframe()
-
-        if not results_df.empty:
-            correct_count = results_df["is_correct"].sum()
-            total_questions = len(results_df)
-            score_percentage = (correct_count / total_questions) * 100
+        report = st.session_state.quiz_report
+        if report is None:
+            report = st.session_state.quiz_report = st.session_state.quiz_manager.result_summary()
 
+        if report["results"]:
             st.markdown(
-                f"<h3 style='color:#FF5733;'>🧩 Score: {score_percentage:.2f}%</h3>",
+                f"<h3 style='color:#FF5733;'>🧩 Score: {report['score_percentage']:.2f}%</h3>",
                 unsafe_allow_html=True
             )
 
-            for _, result in results_df.iterrows():
+            for result in report["results"]:
                 question_num = result["question_number"]
                 if result["is_correct"]:
                     st.success(
@@ -109,21 +204,26 @@ def main():
                     st.error(f"❌ Question {question_num}: {result['question']}")
                     st.info(f"Your answer: {result['user_answer']}")
                     st.info(f"Correct answer: {result['correct_answer']}")
+                if result.get("score") is not None:
+                    st.caption(f"Answer coverage: {result['score']:.0%}")
                 st.markdown("<hr>", unsafe_allow_html=True)
 
             st.markdown("<br>", unsafe_allow_html=True)
             if st.button("💾 Save Results"):
-                saved_file = st.session_state.quiz_manager.save_to_csv()
-                if saved_file:
-                    with open(saved_file, "rb") as f:
-                        st.download_button(
-                            label="⬇️ Download Results",
-                            data=f.read(),
-                            file_name=os.path.basename(saved_file),
-                            mime="text/csv",
-                        )
-                else:
+                st.session_state.saved_quiz_id = st.session_state.quiz_manager.save_results()
+                if not st.session_state.saved_quiz_id:
                     st.warning("⚠️ No results available.")
+            quiz_id = st.session_state.get("saved_quiz_id")
+            if quiz_id:
+                from src.results.store import get_results_store
+
+                # rendered from the store on click, on Streamlit's download thread
+                st.download_button(
+                    label="⬇️ Download Results",
+                    data=functools.partial(get_results_store().export_csv, quiz_id=quiz_id),
+                    file_name=f"quiz_results_{quiz_id[:8]}.csv",
+                    mime="text/csv",
+                )
         else:
             st.warning("⚠️ No results to display.")
 
@@ -0,0 +1,282 @@
+"""Deterministic stand-in for the Groq chat model used by the offline benchmarks.
+
+`FakeLLM` answers the prompts in `src.prompts.templates` with schema-valid JSON
+after a sampled delay, and can be told to return malformed output or raise 429s
+at a fixed rate. It can also replay responses captured from the real model with
+`RecordingLLM`, so parse behaviour is measured on realistic text. Structured
+output (`with_structured_output`) is supported and fails at its own, usually
+much lower, `structured_error_rate`.
+
+    from benchmarks.fake_llm import FakeLLM, Latency
+    llm = FakeLLM(latency=Latency.parse("lognormal:0.8:0.4"), malformed_rate=0.1, rate_limit_rate=0.02)
+    generator = QuestionGenerator(llm=llm)
+"""
+import re
+import json
+import time
+import random
+import asyncio
+import itertools
+import threading
+from types import SimpleNamespace
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+# Phrase each prompt template uses for its question type.
+PROMPT_TYPES = {
+    "multiple-choice": "mcq",
+    "fill-in-the-blank": "fill_blank",
+    "true-or-false": "true_false",
+    "short-answer": "short_answer",
+    "descriptive": "descriptive",
+    "ordering": "ordering",
+    "multi-select": "multi_select",
+    "numerical": "numerical",
+}
+_PROMPT_RE = re.compile(
+    r"Generate (?:a |(\d+) distinct )\S+ (" + "|".join(re.escape(p) for p in PROMPT_TYPES) + r") questions? about"
+)
+
+_VOCAB = (
+    "algorithm array binary cache compiler database entropy function gradient hash heap index kernel "
+    "latency matrix network object pointer queue recursion scheduler semaphore stack thread tree vector "
+    "atom cell energy enzyme force galaxy gravity molecule neuron orbit photon protein quantum velocity "
+    "empire revolution treaty dynasty parliament colony reform trade river mountain climate glacier "
+    "desert volcano ocean prairie canyon island delta harbor novel poem sonnet metaphor rhythm chorus"
+).split()
+
+MALFORMED_KINDS = ("prose", "trailing_comma", "truncated", "missing_field", "garbage")
+
+
+def prompt_kind(prompt) -> tuple:
+    """(question type, batch count or None) for a formatted prompt."""
+    match = _PROMPT_RE.search(str(prompt))
+    if not match:
+        raise ValueError(f"Unrecognised prompt: {str(prompt)[:80]!r}")
+    return PROMPT_TYPES[match.group(2)], int(match.group(1)) if match.group(1) else None
+
+
+class FakeRateLimitError(Exception):
+    """Looks like a Groq 429 to `classify_error` and `retry_after`."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__("Rate limit reached (injected)")
+        self.response = SimpleNamespace(status_code=429, headers={"retry-after": str(retry_after)})
+
+
+class Latency:
+    """Per-call delay distribution: fixed, uniform or lognormal (given by its median)."""
+
+    def __init__(self, kind: str = "fixed", a: float = 0.0, b: float = 0.0):
+        if kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        self.kind, self.a, self.b = kind, a, b
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        """`fixed:0.2`, `uniform:0.1:0.6` or `lognormal:<median>:<sigma>`."""
+        kind, *params = spec.split(":")
+        values = [float(p) for p in params] + [0.0, 0.0]
+        return cls(kind, values[0], values[1])
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            return self.a * rng.lognormvariate(0.0, self.b) if self.a > 0 else 0.0
+        return self.a
+
+    def __repr__(self):
+        return f"{self.kind}:{self.a:g}:{self.b:g}"
+
+
+class FakeLLM:
+    """Drop-in for the ChatGroq instance returned by `get_groq_llm()` (invoke, ainvoke, stream)."""
+
+    def __init__(self, latency: Latency = None, malformed_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 retry_after: float = 0.05, replay: str = None, seed: int = 0, structured_error_rate: float = 0.0):
+        self.latency = latency or Latency()
+        self.malformed_rate = malformed_rate
+        self.structured_error_rate = structured_error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._replay = self._load_replay(replay) if replay else None
+        self.stats = {"calls": 0, "rate_limited": 0, "malformed": 0}
+
+    @staticmethod
+    def _load_replay(path):
+        """Recorded responses grouped by (question type, batch?) and served round-robin."""
+        grouped = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    grouped.setdefault((record["question_type"], bool(record["batch"])), []).append(record["content"])
+        return {key: itertools.cycle(contents) for key, contents in grouped.items()}
+
+    def _plan(self, prompt, structured=False):
+        """Decide delay, failure and content for one call under the lock so runs are reproducible."""
+        question_type, count = prompt_kind(prompt)
+        with self._lock:
+            self.stats["calls"] += 1
+            delay = self.latency.sample(self._rng)
+            if self._rng.random() < self.rate_limit_rate:
+                self.stats["rate_limited"] += 1
+                return delay, FakeRateLimitError(self.retry_after), None
+            content = self._content(question_type, count, structured)
+            if self._rng.random() < (self.structured_error_rate if structured else self.malformed_rate):
+                self.stats["malformed"] += 1
+                content = self._malform(content, self._rng.choice(MALFORMED_KINDS))
+        return delay, None, content
+
+    def _content(self, question_type, count, structured=False):
+        replay = self._replay.get((question_type, count is not None)) if self._replay else None
+        if replay is not None:
+            return next(replay)
+        if count is None:
+            return json.dumps(self._question(question_type))
+        if structured:
+            return json.dumps({"questions": [self._question(question_type) for _ in range(count)]})
+        return "```json\n" + json.dumps([self._question(question_type) for _ in range(count)], indent=2) + "\n```"
+
+    def _question(self, question_type):
+        rng = self._rng
+        stem = " ".join(rng.sample(_VOCAB, 6))
+        options = rng.sample(_VOCAB, 4)
+        if question_type == "mcq":
+            return {"question": f"Which term relates to {stem}?", "options": options, "correct_answer": options[0]}
+        if question_type == "fill_blank":
+            return {"question": f"The ___ connects {stem}.", "answer": options[0]}
+        if question_type == "true_false":
+            return {"question": f"Every {stem} is equivalent.", "answer": rng.random() < 0.5}
+        if question_type == "short_answer":
+            return {"question": f"Briefly explain {stem}.", "expected_keywords": options[:3]}
+        if question_type == "descriptive":
+            return {"question": f"Discuss {stem} in depth.", "rubric": f"Covers {', '.join(options)} with examples."}
+        if question_type == "ordering":
+            return {"question": f"Order the stages of {stem}.", "items": rng.sample(options, 4), "correct_order": options}
+        if question_type == "multi_select":
+            return {"question": f"Select all that apply to {stem}.", "options": options, "correct_answers": options[:2]}
+        return {"question": f"How many {stem} are there?", "correct_value": rng.randint(1, 500), "tolerance": 0.5}
+
+    def _malform(self, content, kind):
+        if kind == "prose":
+            return f"Sure! Here is what you asked for:\n{content}\nLet me know if you need more."
+        if kind == "trailing_comma":
+            return re.sub(r"(\]|\})(\s*)$", r",\2\1", content.replace("```json\n", "").replace("\n```", ""), count=1)
+        if kind == "truncated":
+            return content[: max(1, int(len(content) * 0.7))]
+        if kind == "missing_field":
+            return content.replace('"question"', '"prompt"')
+        return "I'm sorry, I can't produce JSON right now."
+
+    @staticmethod
+    def _usage(prompt, content):
+        prompt_tokens, completion_tokens = len(str(prompt)) // 4, len(content) // 4
+        return {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    def invoke(self, prompt, **kwargs):
+        delay, error, content = self._plan(prompt)
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return AIMessage(content=content, usage_metadata=self._usage(prompt, content))
+
+    async def ainvoke(self, prompt, **kwargs):
+        delay, error, content = self._plan(prompt)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return AIMessage(content=content, usage_metadata=self._usage(prompt, content))
+
+    def with_structured_output(self, schema, method: str = "function_calling", include_raw: bool = False, **kwargs):
+        return StructuredFakeLLM(self, schema, include_raw)
+
+    def stream(self, prompt, chunk_size: int = 16, **kwargs):
+        """Yield the response in small chunks, spreading the sampled delay over them."""
+        delay, error, content = self._plan(prompt)
+        if error is not None:
+            time.sleep(delay)
+            raise error
+        chunks = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)] or [""]
+        for i, chunk in enumerate(chunks):
+            time.sleep(delay / len(chunks))
+            usage = self._usage(prompt, content) if i == len(chunks) - 1 else None
+            yield AIMessageChunk(content=chunk, usage_metadata=usage)
+
+
+class StructuredFakeLLM:
+    """What `FakeLLM.with_structured_output` returns: the same plan, validated against `schema`."""
+
+    def __init__(self, llm: FakeLLM, schema, include_raw: bool):
+        self.llm = llm
+        self.schema = schema
+        self.include_raw = include_raw
+
+    def _result(self, prompt, content):
+        raw = AIMessage(content=content, usage_metadata=self.llm._usage(prompt, content))
+        try:
+            parsed, error = self.schema.parse_obj(json.loads(content)), None
+        except Exception as e:
+            parsed, error = None, e
+        if self.include_raw:
+            return {"raw": raw, "parsed": parsed, "parsing_error": error}
+        if error is not None:
+            raise error
+        return parsed
+
+    def invoke(self, prompt, **kwargs):
+        delay, error, content = self.llm._plan(prompt, structured=True)
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return self._result(prompt, content)
+
+    async def ainvoke(self, prompt, **kwargs):
+        delay, error, content = self.llm._plan(prompt, structured=True)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return self._result(prompt, content)
+
+
+class RecordingLLM:
+    """Wraps a real model and appends every response to a JSONL file that `FakeLLM(replay=...)` can serve."""
+
+    def __init__(self, llm, path: str):
+        self.llm = llm
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _record(self, prompt, response):
+        question_type, count = prompt_kind(prompt)
+        raw = response["raw"] if isinstance(response, dict) else response
+        line = json.dumps({
+            "question_type": question_type,
+            "batch": count is not None,
+            "content": raw.content,
+            "usage": getattr(raw, "usage_metadata", None),
+        })
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        return response
+
+    def invoke(self, prompt, **kwargs):
+        return self._record(prompt, self.llm.invoke(prompt, **kwargs))
+
+    async def ainvoke(self, prompt, **kwargs):
+        return self._record(prompt, await self.llm.ainvoke(prompt, **kwargs))
+
+    def with_structured_output(self, schema, **kwargs):
+        return RecordingLLM(self.llm.with_structured_output(schema, **kwargs), self.path)
+
+    def stream(self, prompt, **kwargs):
+        return self.llm.stream(prompt, **kwargs)
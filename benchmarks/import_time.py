@@ -0,0 +1,85 @@
+"""Cold-start import benchmark.
+
+Imports each module in a fresh interpreter several times and records the median
+wall time and the number of modules pulled in, so startup regressions show up
+before they reach the pods.
+
+    python benchmarks/import_time.py --output benchmarks/results/import_time.json
+    python benchmarks/import_time.py --compare benchmarks/results/import_time_baseline.json
+"""
+import os
+import sys
+import json
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "src.utils.helpers",
+    "src.grading.engine",
+    "src.generator.question_generator",
+    "app",
+]
+
+_PROBE = (
+    "import sys, time, json\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "print(json.dumps([time.perf_counter() - start, len(sys.modules)]))\n"
+)
+
+
+def measure(module: str, runs: int) -> dict:
+    timings, loaded = [], 0
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1]
+        elapsed, loaded = json.loads(out)
+        timings.append(elapsed)
+    return {
+        "median_s": round(statistics.median(timings), 4),
+        "min_s": round(min(timings), 4),
+        "modules_loaded": loaded,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Write results JSON here.")
+    parser.add_argument("--compare", help="Baseline results JSON to diff against.")
+    args = parser.parse_args(argv)
+
+    results = {
+        "benchmark": "import_time",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "runs": args.runs,
+        "modules": {module: measure(module, args.runs) for module in MODULES},
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["modules"]
+
+    for module, stats in results["modules"].items():
+        line = f"{module:<36} {stats['median_s']:>8.3f}s  {stats['modules_loaded']:>5} modules"
+        if baseline and module in baseline:
+            line += f"  (baseline {baseline[module]['median_s']:.3f}s, {baseline[module]['modules_loaded']} modules)"
+        print(line)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
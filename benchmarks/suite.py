@@ -0,0 +1,284 @@
+"""Offline performance suite driven by the stub LLM in `benchmarks/fake_llm.py`.
+
+Measures, without spending Groq quota:
+- generation: end-to-end `QuizManager.generate_questions` latency and throughput per question type
+- retry: `QuestionGenerator._retry_and_parse` on clean, malformed and rate-limited responses
+- grading: `QuizManager.evaluate_quiz` throughput on a synthetic mixed quiz
+
+    python benchmarks/suite.py --output benchmarks/results/suite.json
+    python benchmarks/suite.py --compare benchmarks/results/suite_baseline.json
+    python benchmarks/suite.py --replay recorded.jsonl --latency lognormal:0.8:0.4
+
+`--compare` exits non-zero when a latency grows, or a throughput drops, by more
+than `--tolerance` against the baseline, so it can gate a deploy.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from benchmarks.fake_llm import FakeLLM, Latency  # noqa: E402
+from src.config.settings import settings  # noqa: E402
+
+# Keys where a larger value is better; every other timing key is "lower is better".
+HIGHER_IS_BETTER = {"questions_per_s", "records_per_s"}
+TIMING_KEYS = {"p50_s", "p95_s", "mean_s", "total_s"} | HIGHER_IS_BETTER
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies):
+    return {
+        "p50_s": round(percentile(latencies, 0.5), 4),
+        "p95_s": round(percentile(latencies, 0.95), 4),
+        "mean_s": round(statistics.fmean(latencies), 4) if latencies else 0.0,
+    }
+
+
+def configure(args):
+    """Isolate the run from the cache, pool and (optionally) production rate limits."""
+    settings.CACHE_ENABLED = False
+    settings.POOL_ENABLED = False
+    settings.METRICS_ENABLED = False
+    settings.GENERATION_MODE = args.generation_mode
+    settings.HEDGING_ENABLED = args.hedging
+    settings.HEDGE_MIN_DELAY = 0.0  # stub latencies sit well below the production floor
+    if not args.keep_rate_limits:
+        settings.GROQ_REQUESTS_PER_MINUTE = 10 ** 7
+        settings.GROQ_TOKENS_PER_MINUTE = 10 ** 9
+    # st.* calls outside `streamlit run` warn on every access
+    from streamlit import config
+    from streamlit.logger import set_log_level
+    config.set_option("global.showWarningOnDirectExecution", False)
+    set_log_level("error")
+
+
+def make_llm(args, malformed_rate=None, rate_limit_rate=None, seed_offset=0):
+    return FakeLLM(
+        latency=Latency.parse(args.latency),
+        malformed_rate=args.malformed_rate if malformed_rate is None else malformed_rate,
+        rate_limit_rate=args.rate_limit_rate if rate_limit_rate is None else rate_limit_rate,
+        structured_error_rate=args.structured_error_rate if malformed_rate is None else malformed_rate,
+        replay=args.replay,
+        seed=args.seed + seed_offset,
+    )
+
+
+def bench_generation(args) -> dict:
+    from src.utils.helpers import QuizManager, QUESTION_BUILDERS
+    from src.generator.question_generator import QuestionGenerator
+
+    labels = {method: label for label, (method, _) in QUESTION_BUILDERS.items()}
+    results = {}
+    for offset, question_type in enumerate(args.types):
+        llm = make_llm(args, seed_offset=offset)
+        generator = QuestionGenerator(llm=llm)
+        latencies, produced = [], 0
+        for run in range(args.repeats):
+            manager = QuizManager()
+            start = time.perf_counter()
+            manager.generate_questions(generator, f"benchmark topic {run}", labels[question_type], "medium", args.questions)
+            latencies.append(time.perf_counter() - start)
+            produced += len(manager.questions)
+
+        total = sum(latencies)
+        results[question_type] = {
+            **summarize(latencies),
+            "questions_per_s": round(produced / total, 2) if total else 0.0,
+            "questions": produced,
+            "requested": args.questions * args.repeats,
+            "llm_calls": llm.stats["calls"],
+            "malformed": llm.stats["malformed"],
+            "rate_limited": llm.stats["rate_limited"],
+        }
+        print(f"generation {question_type:<13} p50 {results[question_type]['p50_s']:.3f}s  "
+              f"{results[question_type]['questions_per_s']:>8.2f} q/s  {llm.stats['calls']} calls")
+    return results
+
+
+def bench_retry(args) -> dict:
+    from src.generator.question_generator import QuestionGenerator
+
+    scenarios = {
+        "clean": (0.0, 0.0),
+        "malformed": (args.retry_malformed_rate, 0.0),
+        "rate_limited": (0.0, args.retry_rate_limit_rate),
+    }
+    results = {}
+    for offset, (name, (malformed_rate, rate_limit_rate)) in enumerate(scenarios.items()):
+        llm = make_llm(args, malformed_rate=malformed_rate, rate_limit_rate=rate_limit_rate, seed_offset=100 + offset)
+        generator = QuestionGenerator(llm=llm)
+        latencies, failures = [], 0
+        for _ in range(args.retry_calls):
+            start = time.perf_counter()
+            try:
+                generator._retry_and_parse("mcq", "benchmark topic", "medium")
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - start)
+
+        successes = args.retry_calls - failures
+        results[name] = {
+            **summarize(latencies),
+            "attempts_per_success": round(llm.stats["calls"] / successes, 3) if successes else None,
+            "failures": failures,
+            "malformed": llm.stats["malformed"],
+            "rate_limited": llm.stats["rate_limited"],
+        }
+        print(f"retry      {name:<13} p50 {results[name]['p50_s']:.3f}s  "
+              f"p95 {results[name]['p95_s']:.3f}s  {results[name]['attempts_per_success']} attempts/success")
+    return results
+
+
+def _graded_quiz(size: int, seed: int):
+    """A mixed quiz of UI question dicts with plausible right and wrong answers."""
+    rng = random.Random(seed)
+    words = "gradient neural network loss entropy scattering atmosphere wavelength protein enzyme orbit gravity".split()
+    templates = [
+        ({"type": "MCQ", "question": "q", "options": ["a", "b", "c", "d"], "correct_answer": "b"}, lambda: rng.choice("abcd")),
+        ({"type": "Fill in the blank", "question": "The ___", "correct_answer": "Paris"}, lambda: rng.choice(["paris", "Rome"])),
+        ({"type": "True/False", "question": "s", "correct_answer": True}, lambda: rng.choice(["True", "False"])),
+        ({"type": "Short Answer", "question": "Why", "expected_keywords": ["scattering", "atmosphere", "wavelength"]},
+         lambda: " ".join(rng.choice(words) for _ in range(12))),
+        ({"type": "Descriptive", "question": "Discuss how neural network training minimises loss",
+          "rubric": "gradient descent, loss function, examples"},
+         lambda: " ".join(rng.choice(words) for _ in range(60))),
+        ({"type": "Ordering", "question": "o", "items": ["b", "a", "c"], "correct_order": ["a", "b", "c"]},
+         lambda: rng.choice(["a, b, c", "c, b, a"])),
+        ({"type": "Multi-Select", "question": "m", "options": ["a", "b", "c"], "correct_answer": ["a", "b"]},
+         lambda: rng.choice([["a", "b"], ["a"]])),
+        ({"type": "Numerical", "question": "n", "correct_answer": 9.0}, lambda: rng.choice(["9", "9.5", "x"])),
+    ]
+    questions, answers = [], {}
+    for i in range(size):
+        question, answer = rng.choice(templates)
+        questions.append(question)
+        answers[f"user_answer_{i}"] = answer()
+    return questions, answers
+
+
+def bench_grading(args) -> dict:
+    import streamlit as st
+    from src.utils.helpers import QuizManager
+
+    questions, answers = _graded_quiz(args.grading_records, args.seed)
+    for key, value in answers.items():
+        st.session_state[key] = value
+
+    manager = QuizManager()
+    manager.questions = questions
+    timings = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        manager.evaluate_quiz()
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    result = {
+        **summarize(timings),
+        "records": args.grading_records,
+        "records_per_s": round(args.grading_records / best, 1) if best else 0.0,
+    }
+    print(f"grading    {args.grading_records} records  p50 {result['p50_s']:.3f}s  {result['records_per_s']:,.0f} records/s")
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Human-readable regressions of `results` against `baseline` beyond `tolerance`."""
+    regressions = []
+
+    def walk(new, old, path):
+        for key, value in new.items():
+            if key not in old:
+                continue
+            if isinstance(value, dict) and isinstance(old[key], dict):
+                walk(value, old[key], path + [key])
+            elif key in TIMING_KEYS and isinstance(value, (int, float)) and old[key]:
+                ratio = value / old[key]
+                worse = ratio < 1 - tolerance if key in HIGHER_IS_BETTER else ratio > 1 + tolerance
+                if worse:
+                    regressions.append(f"{'.'.join(path + [key])}: {old[key]} -> {value} ({ratio:.2f}x)")
+
+    for section in ("generation", "retry", "grading"):
+        if section in results and section in baseline:
+            walk(results[section], baseline[section], [section])
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", choices=["generation", "retry", "grading"], action="append",
+                        help="Run only these sections (repeatable).")
+    parser.add_argument("--types", nargs="+", default=None, help="Question types for the generation section.")
+    parser.add_argument("--questions", type=int, default=10, help="Questions per generated quiz.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--latency", default="lognormal:0.05:0.5", help="fixed:S, uniform:A:B or lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--malformed-rate", type=float, default=0.05)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--generation-mode", choices=["structured", "parser"], default=settings.GENERATION_MODE)
+    parser.add_argument("--structured-error-rate", type=float, default=0.01,
+                        help="Schema violations that get through structured output.")
+    parser.add_argument("--hedging", action="store_true", help="Hedge slow single-question LLM calls.")
+    parser.add_argument("--retry-calls", type=int, default=40)
+    parser.add_argument("--retry-malformed-rate", type=float, default=0.3)
+    parser.add_argument("--retry-rate-limit-rate", type=float, default=0.1)
+    parser.add_argument("--grading-records", type=int, default=20000)
+    parser.add_argument("--replay", help="JSONL of recorded responses (see RecordingLLM) to serve instead of synthetic ones.")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="Apply the production Groq rate limits.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write results JSON here.")
+    parser.add_argument("--compare", help="Baseline results JSON to diff against.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown before failing.")
+    args = parser.parse_args(argv)
+
+    from src.prompts.registry import PROMPT_SOURCES
+    args.types = args.types or list(PROMPT_SOURCES)
+    sections = args.only or ["generation", "retry", "grading"]
+    configure(args)
+
+    results = {
+        "benchmark": "suite",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "only")},
+    }
+    if "generation" in sections:
+        results["generation"] = bench_generation(args)
+    if "retry" in sections:
+        results["retry"] = bench_retry(args)
+    if "grading" in sections:
+        results["grading"] = bench_grading(args)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# Lets plain `pytest` (not only `python -m pytest`) import `src` from the repository root.
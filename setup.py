@@ -9,4 +9,10 @@ setup(
     author="Andrew-Adel",
     packages=find_packages(),
     install_requires = requirements,
+    entry_points={
+        "console_scripts": [
+            "smartlearn-grade=src.grading.cli:main",
+            "smartlearn-api=src.api.server:main",
+        ],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,82 @@
+import httpx
+import streamlit as st
+from src.prompts.registry import PROMPT_SOURCES
+from src.utils.helpers import QuizManager, BUILDERS_BY_METHOD
+from src.config.settings import settings
+
+
+class QuizApiClient:
+    """Blocking client for `src.api.server`."""
+
+    def __init__(self, base_url: str = None, timeout: float = None):
+        self._client = httpx.Client(
+            base_url=(base_url or settings.API_URL).rstrip("/"),
+            timeout=timeout or settings.HTTP_TIMEOUT,
+        )
+
+    def _call(self, method: str, path: str, **kwargs) -> dict:
+        response = self._client.request(method, path, **kwargs)
+        if response.is_error:
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            raise RuntimeError(f"Quiz API {response.status_code}: {detail}")
+        return response.json()
+
+    def create_quiz(self, topic: str, question_type: str, difficulty: str, num_questions: int,
+                    include_answers: bool = False) -> dict:
+        payload = {"topic": topic, "question_type": question_type, "difficulty": difficulty, "num_questions": num_questions}
+        params = {"include_answers": "true"} if include_answers else None
+        return self._call("POST", "/quizzes", json=payload, params=params)
+
+    def get_quiz(self, quiz_id: str, include_answers: bool = False) -> dict:
+        params = {"include_answers": "true"} if include_answers else None
+        return self._call("GET", f"/quizzes/{quiz_id}", params=params)
+
+    def submit_answers(self, quiz_id: str, answers: list) -> dict:
+        return self._call("POST", f"/quizzes/{quiz_id}/answers", json={"answers": answers})
+
+
+class RemoteQuizManager(QuizManager):
+    """QuizManager whose generation and grading run on the quiz API; Streamlit only renders."""
+
+    def __init__(self, client: QuizApiClient = None):
+        super().__init__()
+        self.client = client or QuizApiClient()
+        self.quiz_id = None
+
+    def _load_quiz(self, topic, question_type, difficulty, num_questions):
+        self.questions = []
+        self._graded = []
+        quiz = self.client.create_quiz(topic, question_type, difficulty, num_questions, include_answers=True)
+        method = quiz["question_type"]
+        schema, to_dict = PROMPT_SOURCES[method][0], BUILDERS_BY_METHOD[method]
+        self.quiz_id = quiz["quiz_id"]
+        self.question_type, self.topic, self.difficulty = method, topic, difficulty
+        self.questions = [to_dict(schema.parse_obj(q)) for q in quiz["questions"]]
+
+    def generate_questions(self, generator, topic: str, question_type: str, difficulty: str, num_questions: int, max_concurrency: int = None):
+        try:
+            self._load_quiz(topic, question_type, difficulty, num_questions)
+        except Exception as e:
+            st.error(f"Error generating questions: {e}")
+            return False
+        if len(self.question_ids) < num_questions:
+            st.warning(f"Only {len(self.question_ids)} unique questions could be generated.")
+        return True
+
+    def generate_questions_stream(self, generator, topic: str, question_type: str, difficulty: str, num_questions: int):
+        self._load_quiz(topic, question_type, difficulty, num_questions)
+        yield from self.questions
+
+    def adopt(self, other: "RemoteQuizManager"):
+        super().adopt(other)
+        self.quiz_id = other.quiz_id
+
+    def grade(self, answers):
+        result = self.client.submit_answers(self.quiz_id, list(answers))
+        self._graded = [
+            (r["question_number"], r["user_answer"], r["correct_answer"], r["is_correct"], r.get("score"))
+            for r in result["results"]
+        ]
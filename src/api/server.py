@@ -0,0 +1,230 @@
+"""Headless HTTP API for quiz generation and grading.
+
+    python -m src.api.server --port 8000
+
+    POST /quizzes                    QuizRequest -> QuizResponse
+    GET  /quizzes/{quiz_id}          -> QuizResponse (add ?include_answers=true for answer keys)
+    POST /quizzes/{quiz_id}/answers  AnswerSubmission -> QuizResult
+
+LLM calls run on the shared LLM event loop, and grading and result recording
+run in Starlette's thread pool, so neither blocks the server's own loop. This
+module does not import Streamlit.
+"""
+import time
+import argparse
+import threading
+from uuid import uuid4
+from collections import OrderedDict
+from pydantic import ValidationError
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from src.models.api_schemas import QuizRequest, QuizResponse, AnswerSubmission, QuizResult
+from src.prompts.registry import PROMPT_SOURCES
+from src.utils.questions import QUESTION_BUILDERS, BUILDERS_BY_METHOD, acollect_questions
+from src.grading.engine import get_grading_engine
+from src.llm.groq_client import arun
+from src.metrics.registry import registry, CONTENT_TYPE, QUIZ_SECONDS, QUESTIONS_GRADED
+from src.config.settings import settings
+from src.common.logger import get_logger, log_context
+
+# Schema fields that reveal the answer; stripped unless the client asks for them.
+ANSWER_FIELDS = frozenset({
+    "correct_answer", "answer", "expected_keywords", "rubric",
+    "correct_order", "correct_answers", "correct_value", "tolerance",
+})
+
+
+def resolve_question_type(value: str) -> str:
+    """Generator type for either a generator type (`mcq`) or a UI label (`Multiple Choice`)."""
+    key = str(value).strip().lower()
+    if key in PROMPT_SOURCES:
+        return key
+    if key in QUESTION_BUILDERS:
+        return QUESTION_BUILDERS[key][0]
+    raise ValueError(f"Unsupported question type: {value}")
+
+
+class Quiz:
+    """A generated quiz: `questions` in the generator's schema for clients, `items` in the grader's shape."""
+
+    __slots__ = ("quiz_id", "topic", "question_type", "difficulty", "questions", "items", "created_at")
+
+    def __init__(self, quiz_id: str, topic: str, question_type: str, difficulty: str, questions: list):
+        self.quiz_id = quiz_id
+        self.topic = topic
+        self.question_type = question_type
+        self.difficulty = difficulty
+        self.questions = [q.dict() for q in questions]
+        self.items = [BUILDERS_BY_METHOD[question_type](q) for q in questions]
+        self.created_at = time.monotonic()
+
+    def response(self, include_answers: bool = False) -> QuizResponse:
+        questions = self.questions if include_answers else [
+            {k: v for k, v in q.items() if k not in ANSWER_FIELDS} for q in self.questions
+        ]
+        return QuizResponse(
+            quiz_id=self.quiz_id,
+            topic=self.topic,
+            question_type=self.question_type,
+            difficulty=self.difficulty,
+            questions=questions,
+        )
+
+
+class QuizService:
+    """Quizzes live in memory for `ttl` seconds, at most `max_quizzes` of them (oldest dropped first)."""
+
+    def __init__(self, generator_factory=None, max_quizzes: int = None, ttl: float = None):
+        self.generator_factory = generator_factory
+        self.max_quizzes = max_quizzes or settings.API_MAX_QUIZZES
+        self.ttl = ttl or settings.API_QUIZ_TTL
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._quizzes = OrderedDict()
+        self._generator = None
+
+    def _get_generator(self):
+        with self._lock:
+            if self._generator is None:
+                if self.generator_factory is None:
+                    from src.generator.question_generator import QuestionGenerator
+                    self.generator_factory = QuestionGenerator
+                self._generator = self.generator_factory()
+            return self._generator
+
+    def _store(self, quiz: Quiz):
+        with self._lock:
+            self._quizzes[quiz.quiz_id] = quiz
+            while len(self._quizzes) > self.max_quizzes:
+                self._quizzes.popitem(last=False)
+
+    def get(self, quiz_id: str) -> Quiz:
+        with self._lock:
+            quiz = self._quizzes.get(quiz_id)
+            if quiz is not None and time.monotonic() - quiz.created_at > self.ttl:
+                del self._quizzes[quiz_id]
+                quiz = None
+        if quiz is None:
+            raise KeyError(quiz_id)
+        return quiz
+
+    async def create_quiz(self, request: QuizRequest) -> Quiz:
+        method = resolve_question_type(request.question_type)
+        quiz_id = uuid4().hex
+
+        with log_context(request_id=quiz_id, question_type=method), \
+                QUIZ_SECONDS.time(operation="generate", question_type=method):
+            questions = await arun(acollect_questions(
+                self._get_generator(), method, request.topic, request.difficulty, request.num_questions
+            ))
+        if not questions:
+            raise RuntimeError("No valid questions could be generated.")
+
+        quiz = Quiz(quiz_id, request.topic, method, request.difficulty, questions)
+        await run_in_threadpool(get_grading_engine().prepare, quiz.items)
+        self._store(quiz)
+        self.logger.info("Created quiz %s with %s %s questions", quiz_id, len(questions), method)
+        return quiz
+
+    def submit(self, quiz_id: str, submission: AnswerSubmission) -> QuizResult:
+        """Grade a submission. Blocking (grading and the results store); async callers use a thread."""
+        quiz = self.get(quiz_id)
+        answers = list(submission.answers[:len(quiz.items)])
+        answers += [""] * (len(quiz.items) - len(answers))
+        with QUIZ_SECONDS.time(operation="evaluate", question_type=quiz.question_type):
+            results = get_grading_engine().grade_batch(zip(quiz.items, answers))
+        QUESTIONS_GRADED.inc(len(results), question_type=quiz.question_type)
+
+        graded = [r for r in results if r["is_correct"] is not None]
+        correct = sum(1 for r in graded if r["is_correct"])
+        if settings.API_RECORD_RESULTS:
+            from src.results.store import get_results_store
+            get_results_store().record_quiz(results, quiz.topic, quiz.question_type, quiz.difficulty)
+
+        return QuizResult(
+            quiz_id=quiz_id,
+            score=correct / len(graded) if graded else 0.0,
+            correct=correct,
+            total=len(results),
+            results=results,
+        )
+
+
+def _error(status: int, message: str) -> JSONResponse:
+    return JSONResponse({"detail": message}, status_code=status)
+
+
+async def _parse(request, model):
+    return model.parse_obj(await request.json())
+
+
+def create_app(service: QuizService = None) -> Starlette:
+    service = service or QuizService()
+    logger = get_logger("QuizAPI")
+
+    async def create_quiz(request):
+        try:
+            body = await _parse(request, QuizRequest)
+            resolve_question_type(body.question_type)
+        except (ValidationError, ValueError) as e:
+            return _error(422, str(e))
+        try:
+            quiz = await service.create_quiz(body)
+        except Exception as e:
+            logger.error("Quiz generation failed: %s", e)
+            return _error(502, f"Quiz generation failed: {e}")
+        include_answers = request.query_params.get("include_answers") == "true"
+        return JSONResponse(quiz.response(include_answers).dict(), status_code=201)
+
+    async def get_quiz(request):
+        try:
+            quiz = service.get(request.path_params["quiz_id"])
+        except KeyError:
+            return _error(404, "Quiz not found or expired.")
+        return JSONResponse(quiz.response(request.query_params.get("include_answers") == "true").dict())
+
+    async def submit_answers(request):
+        try:
+            body = await _parse(request, AnswerSubmission)
+            result = await run_in_threadpool(service.submit, request.path_params["quiz_id"], body)
+        except KeyError:
+            return _error(404, "Quiz not found or expired.")
+        except (ValidationError, ValueError) as e:
+            return _error(422, str(e))
+        except Exception as e:
+            # the request parsed, so a failure here means an answer the grader could not handle
+            logger.warning("Could not grade submission for quiz %s: %s", request.path_params["quiz_id"], e)
+            return _error(422, f"Could not grade the answers: {e}")
+        return JSONResponse(result.dict())
+
+    async def health(request):
+        return JSONResponse({"status": "ok"})
+
+    async def metrics(request):
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
+    return Starlette(routes=[
+        Route("/quizzes", create_quiz, methods=["POST"]),
+        Route("/quizzes/{quiz_id}", get_quiz, methods=["GET"]),
+        Route("/quizzes/{quiz_id}/answers", submit_answers, methods=["POST"]),
+        Route("/healthz", health, methods=["GET"]),
+        Route("/metrics", metrics, methods=["GET"]),
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the SmartLearn quiz API.")
+    parser.add_argument("--host", default=settings.API_HOST)
+    parser.add_argument("--port", type=int, default=settings.API_PORT)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    uvicorn.run(create_app(), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,203 @@
+import os
+import json
+import asyncio
+import time
+import random
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from src.config.settings import settings
+from src.common.logger import get_logger
+from src.metrics.registry import CACHE_LOOKUPS, CACHE_EVICTIONS
+
+
+def normalize_topic(topic: str) -> str:
+    return " ".join(str(topic).lower().split())
+
+
+class QuestionCache:
+    """Two-tier (in-memory LRU + SQLite) cache of validated questions.
+
+    Every key holds up to `variants` questions. A key only counts as a hit once
+    it is full, so the first requests for a topic keep producing fresh variants
+    and later ones are served a random sample of them.
+    """
+
+    def __init__(self, db_path: str = None, memory_size: int = None, max_entries: int = None,
+                 ttl_seconds: int = None, variants: int = None):
+        self.db_path = db_path or settings.CACHE_DB_PATH
+        self.memory_size = memory_size or settings.CACHE_MEMORY_SIZE
+        self.max_entries = max_entries or settings.CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or settings.CACHE_TTL_SECONDS
+        self.variants = variants or settings.CACHE_VARIANTS
+        self.logger = get_logger(self.__class__.__name__)
+
+        # `_lock` guards only the memory tier, so coroutines reading it never wait on SQLite;
+        # `_db_lock` serialises the connection and is always taken before `_lock`
+        self._lock = threading.Lock()
+        self._db_lock = threading.RLock()
+        self._memory = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "evictions": 0}
+
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS question_cache ("
+            "key TEXT PRIMARY KEY, variants TEXT NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_question_cache_accessed ON question_cache (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(question_type: str, topic: str, difficulty: str, model: str = None) -> str:
+        """Key for questions generated by `model` (with routing, each tier's model caches apart)."""
+        raw = json.dumps([
+            question_type,
+            normalize_topic(topic),
+            str(difficulty).strip().lower(),
+            model or settings.MODEL_NAME,
+            settings.TEMPERATURE,
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _fresh(self, variants):
+        cutoff = time.time() - self.ttl_seconds
+        return [v for v in variants if v[0] >= cutoff]
+
+    def _cached(self, key):
+        """Live variants held in memory for `key`, or None if the memory tier does not have it."""
+        with self._lock:
+            if key not in self._memory:
+                return None
+            self._memory.move_to_end(key)
+            return self._fresh(self._memory[key])
+
+    def _load(self, key):
+        """Return the live variants for `key` and their tier, promoting disk entries into memory."""
+        variants = self._cached(key)
+        if variants is not None:
+            return variants, "memory"
+
+        with self._db_lock:
+            row = self._conn.execute("SELECT variants FROM question_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return [], None
+
+        variants = self._fresh(json.loads(row[0]))
+        self._remember(key, variants)
+        return variants, "disk"
+
+    def _remember(self, key, variants):
+        with self._lock:
+            self._memory[key] = variants
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _sample(self, variants, tier, n):
+        """Count the lookup and return up to `n` payloads, or none while the key is not full yet."""
+        if len(variants) < self.variants:
+            with self._lock:
+                self.stats["misses"] += 1
+            CACHE_LOOKUPS.inc(result="miss", tier="none")
+            return []
+
+        with self._lock:
+            self.stats["hits"] += 1
+            self.stats[f"{tier}_hits"] += 1
+        CACHE_LOOKUPS.inc(result="hit", tier=tier)
+        return [payload for _, payload in random.sample(variants, min(n, len(variants)))]
+
+    def _touch(self, key):
+        with self._db_lock:
+            self._conn.execute("UPDATE question_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+    def get_many(self, key: str, n: int) -> list:
+        """Return up to `n` distinct cached payloads, or an empty list if the key is not full yet."""
+        variants, tier = self._load(key)
+        payloads = self._sample(variants, tier, n)
+        if payloads:
+            self._touch(key)
+        return payloads
+
+    async def aget_many(self, key: str, n: int) -> list:
+        """`get_many` for coroutines: only the memory tier is read on the event loop, SQLite in a thread."""
+        variants = self._cached(key)
+        if variants is None:
+            return await asyncio.to_thread(self.get_many, key, n)
+        payloads = self._sample(variants, "memory", n)
+        if payloads:
+            await asyncio.to_thread(self._touch, key)
+        return payloads
+
+    def get(self, key: str):
+        payloads = self.get_many(key, 1)
+        return payloads[0] if payloads else None
+
+    def put_many(self, key: str, payloads: list):
+        if not payloads:
+            return
+        # the database lock also makes read-merge-write of one key atomic
+        with self._db_lock:
+            variants, _ = self._load(key)
+            now = time.time()
+            variants = (variants + [[now, p] for p in payloads])[-self.variants:]
+            self._remember(key, variants)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO question_cache (key, variants, accessed_at) VALUES (?, ?, ?)",
+                (key, json.dumps(variants), now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    async def aput_many(self, key: str, payloads: list):
+        """`put_many` for coroutines, run in a thread so SQLite writes never block the event loop."""
+        if payloads:
+            await asyncio.to_thread(self.put_many, key, payloads)
+
+    def put(self, key: str, payload: dict):
+        self.put_many(key, [payload])
+
+    def _evict(self):
+        """Drop expired rows and the least recently used keys beyond `max_entries`. Caller holds the database lock."""
+        cutoff = time.time() - self.ttl_seconds
+        expired = self._conn.execute("DELETE FROM question_cache WHERE accessed_at < ?", (cutoff,)).rowcount
+        overflow = self._conn.execute("SELECT COUNT(*) FROM question_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            stale = self._conn.execute(
+                "SELECT key FROM question_cache ORDER BY accessed_at ASC LIMIT ?", (overflow,)
+            ).fetchall()
+            self._conn.executemany("DELETE FROM question_cache WHERE key = ?", stale)
+            with self._lock:
+                for (key,) in stale:
+                    self._memory.pop(key, None)
+        evicted = expired + max(overflow, 0)
+        if evicted:
+            with self._lock:
+                self.stats["evictions"] += evicted
+            CACHE_EVICTIONS.inc(evicted)
+            self.logger.info("Evicted %s question cache entries.", evicted)
+
+    def clear(self):
+        with self._db_lock:
+            self._conn.execute("DELETE FROM question_cache")
+            self._conn.commit()
+            with self._lock:
+                self._memory.clear()
+
+
+_question_cache = None
+_question_cache_lock = threading.Lock()
+
+
+def get_question_cache() -> QuestionCache:
+    """Process-wide cache shared by every QuestionGenerator."""
+    global _question_cache
+    with _question_cache_lock:
+        if _question_cache is None:
+            _question_cache = QuestionCache()
+        return _question_cache
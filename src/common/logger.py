@@ -1,19 +1,85 @@
 import os
+import json
+import queue
+import atexit
 import logging
-from datetime import datetime
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 
 LOGS_DIR = "logs"
 os.makedirs(LOGS_DIR, exist_ok=True)
 
-LOG_FILE = os.path.join(LOGS_DIR, f"log_{datetime.now().strftime('%Y-%m-%d')}.log")
+LOG_FILE = os.path.join(LOGS_DIR, "smartlearn.log")
+LOG_MAX_BYTES = 0  # > 0 switches from daily to size-based rotation
+LOG_BACKUP_COUNT = 14
+
+CONTEXT_FIELDS = ("request_id", "session_id", "question_type")
+_context = {field: contextvars.ContextVar(field, default=None) for field in CONTEXT_FIELDS}
+
+
+@contextmanager
+def log_context(**values):
+    """Attach request/session/question-type fields to every record logged inside the block."""
+    tokens = [(_context[key], _context[key].set(value)) for key, value in values.items() if key in _context]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class ContextQueueHandler(QueueHandler):
+    """Hands records to the listener thread without formatting them.
+
+    Only the context fields are captured on the calling thread; message
+    interpolation, JSON encoding and file I/O all happen in the listener.
+    """
+
+    def prepare(self, record):
+        for field, var in _context.items():
+            setattr(record, field, var.get())
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def _build_file_handler():
+    if LOG_MAX_BYTES > 0:
+        handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+    else:
+        handler = TimedRotatingFileHandler(LOG_FILE, when="midnight", backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
+_log_queue = queue.SimpleQueue()
+_listener = QueueListener(_log_queue, _build_file_handler(), respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
+
+_root = logging.getLogger()
+_root.addHandler(ContextQueueHandler(_log_queue))
+_root.setLevel(logging.INFO)
 
-logging.basicConfig(
-    filename=LOG_FILE,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
 
 def get_logger(name):
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
-    return logger
\ No newline at end of file
+    return logger
@@ -8,5 +8,136 @@ class Settings():
     MODEL_NAME = "openai/gpt-oss-120b"
     TEMPERATURE = 0.8
     MAX_RETRIES = 5
+    RETRY_BASE_DELAY = 0.5
+    RETRY_MAX_DELAY = 20
+    GROQ_REQUESTS_PER_MINUTE = 30
+    GROQ_TOKENS_PER_MINUTE = 8000
+    RATE_LIMIT_COMPLETION_TOKENS = 300
+    MAX_CONCURRENCY = 4
+    BATCH_SIZE = 5
+    STREAMING_ENABLED = True
+    # "form" submits all answers at once, "fragment" reruns only the question
+    # being answered, "inline" reruns the whole page on every widget change.
+    QUIZ_RENDER_MODE = "form"
+    PROMPT_STYLE = "compact"  # "verbose" sends the hand-written templates with examples
+
+    # "structured" binds the question schema through the model's structured-output
+    # API; "parser" asks for free-text JSON and runs PydanticOutputParser on it.
+    # A structured attempt the provider rejects as off-schema is retried on the
+    # parser path. Streaming always uses the parser path: structured output is not
+    # incremental, so it could not yield questions as they arrive.
+    GENERATION_MODE = "structured"
+    GENERATION_MODE_OVERRIDES = {}  # question type -> mode, e.g. {"numerical": "parser"}
+    STRUCTURED_OUTPUT_METHOD = "json_schema"  # or "function_calling" / "json_mode"
+    STRUCTURED_OUTPUT_METHOD_OVERRIDES = {"llama-3.1-8b-instant": "function_calling"}  # model -> method
+
+    # (question type, difficulty) -> model tier; "*" matches any value.
+    ROUTING_ENABLED = True
+    MODEL_TIERS = {
+        "fast": "llama-3.1-8b-instant",
+        "balanced": "openai/gpt-oss-20b",
+        "strong": MODEL_NAME,
+    }
+    ROUTING_RULES = {
+        ("true_false", "easy"): "fast",
+        ("true_false", "medium"): "fast",
+        ("mcq", "easy"): "fast",
+        ("mcq", "medium"): "balanced",
+        ("fill_blank", "easy"): "fast",
+        ("fill_blank", "medium"): "balanced",
+        ("multi_select", "easy"): "balanced",
+        ("multi_select", "medium"): "balanced",
+        ("ordering", "easy"): "balanced",
+        ("ordering", "medium"): "balanced",
+        ("numerical", "easy"): "balanced",
+    }
+    ROUTING_DEFAULT_TIER = "strong"
+    ROUTING_FALLBACK = {"fast": "balanced", "balanced": "strong", "strong": "balanced"}
+    ROUTING_LATENCY_SLO = {"fast": 3.0, "balanced": 6.0, "strong": 15.0}  # rolling p90, seconds
+    ROUTING_MAX_ERROR_RATE = 0.3
+    ROUTING_WINDOW = 50
+    ROUTING_MIN_SAMPLES = 10
+    ROUTING_COOLDOWN = 60
+
+    # Send a second identical request when the first is slower than the rolling
+    # HEDGE_PERCENTILE latency for its question type; the first valid reply wins.
+    HEDGING_ENABLED = False
+    HEDGE_PERCENTILE = 0.9
+    HEDGE_MIN_DELAY = 1.0  # never hedge sooner than this, seconds
+    HEDGE_WINDOW = 200
+    HEDGE_MIN_SAMPLES = 20
+    HEDGE_BUDGET_RATIO = 0.1  # extra requests allowed per primary request
+    HEDGE_BUDGET_BURST = 5
+
+    DEDUP_ENABLED = True
+    DEDUP_SIMILARITY = 0.6
+    DEDUP_NUM_PERM = 64
+    DEDUP_MAX_ROUNDS = 2
+    DEDUP_HINT_MAX_STEMS = 20
+
+    HTTP_MAX_CONNECTIONS = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+    HTTP_KEEPALIVE_EXPIRY = 60
+    HTTP_TIMEOUT = 60
+    HTTP_CONNECT_TIMEOUT = 5
+
+    CACHE_ENABLED = True
+    CACHE_DB_PATH = "cache/questions.sqlite"
+    CACHE_MEMORY_SIZE = 256
+    CACHE_MAX_ENTRIES = 10000
+    CACHE_TTL_SECONDS = 7 * 24 * 3600
+    CACHE_VARIANTS = 20
+
+    # Process-wide question records shared by all sessions; unreferenced ones are evicted LRU.
+    QUESTION_STORE_MAX_RECORDS = 50000
+
+    # Short Answer / Descriptive: share of the keyword or rubric weight an answer must cover.
+    GRADING_SHORT_ANSWER_THRESHOLD = 0.3
+    GRADING_DESCRIPTIVE_THRESHOLD = 0.25
+    GRADING_BM25_K1 = 1.2
+
+    # Generate quizzes on background workers and poll for progress instead of
+    # blocking the Streamlit script run. Workers consume the question stream, so
+    # the progress bar still moves per question; when off, the script run itself
+    # generates (and shows questions as they arrive if STREAMING_ENABLED).
+    JOBS_ENABLED = True
+    JOBS_WORKERS = 4
+    JOBS_MAX_QUEUED = 100
+    JOBS_MAX_PER_USER = 2
+    JOBS_RESULT_TTL = 3600  # unfetched results
+    JOBS_FETCHED_TTL = 600  # fetched results, so a reload can pick them up again
+    JOBS_POLL_INTERVAL = 1.0
+
+    POOL_ENABLED = True
+    POOL_TARGET_DEPTH = 20
+    POOL_LOW_WATER = 10
+    POOL_HOT_KEYS = 50
+    POOL_MIN_REQUESTS = 2
+    POOL_HISTORY_SIZE = 1000
+    POOL_WORKERS = 2
+    POOL_REFILL_INTERVAL = 30
+
+    # Graded quizzes; point RESULTS_DB_PATH at a persistent volume in production.
+    RESULTS_DB_PATH = os.getenv("RESULTS_DB_PATH", "results/quiz_results.sqlite")
+    RESULTS_BATCH_SIZE = 500  # rows per insert transaction
+    RESULTS_FLUSH_INTERVAL = 1.0
+    RESULTS_PARQUET_ENABLED = True  # needs pyarrow
+    RESULTS_PARQUET_DIR = os.getenv("RESULTS_PARQUET_DIR", "results/segments")
+    RESULTS_COMPACT_AFTER = 30 * 24 * 3600
+    RESULTS_COMPACT_MIN_ROWS = 10000
+    RESULTS_COMPACT_INTERVAL = 3600
+
+    # Headless quiz API (python -m src.api.server). Setting SMARTLEARN_API_URL turns
+    # the Streamlit app into a thin client of it.
+    API_URL = os.getenv("SMARTLEARN_API_URL")
+    API_HOST = "0.0.0.0"
+    API_PORT = 8000
+    API_MAX_QUESTIONS = 50
+    API_MAX_QUIZZES = 10000
+    API_QUIZ_TTL = 6 * 3600
+    API_RECORD_RESULTS = True
+
+    METRICS_ENABLED = True
+    METRICS_PORT = 9100
 
 settings = Settings()  
\ No newline at end of file
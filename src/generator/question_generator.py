@@ -1,4 +1,8 @@
-from langchain_core.output_parsers import PydanticOutputParser
+import time
+import asyncio
+from functools import partialmethod
+from langchain_core.exceptions import OutputParserException
+from langchain_core.utils.json import parse_json_markdown
 from src.models.question_schemas import (
     MCQQuestion,
     FillBlankQuestion,
@@ -9,170 +13,488 @@ from src.models.question_schemas import (
     MultiSelectQuestion,
     NumericalQuestion,
 )
-from src.prompts.templates import (
-    mcq_prompt_template,
-    fill_blank_prompt_template,
-    true_false_prompt_template,
-    short_answer_prompt_template,
-    descriptive_prompt_template,
-    ordering_prompt_template,
-    multi_select_prompt_template,
-    numerical_prompt_template,
-)
-from src.llm.groq_client import get_groq_llm
+from src.prompts.registry import PROMPT_SOURCES, get_prompt_registry
+from src.llm.groq_client import get_groq_llm, run_async
+from src.llm.hedging import get_hedger
+from src.llm.router import get_model_router
+from src.llm.retry import classify_error, backoff_delay, estimate_tokens, get_rate_limiter, FATAL, RATE_LIMIT, PARSE
+from src.cache.question_cache import get_question_cache
+from src.utils.json_repair import repair_json, coerce_to_schema, parse_with_repair, record_repair
+from src.utils.json_stream import IncrementalJSONParser
+from src.utils.dedup import exclusion_hint
+from src.metrics.registry import STAGE_SECONDS, GENERATE_SECONDS, ATTEMPTS, FAILURES, record_usage
 from src.config.settings import settings
 from src.common.logger import get_logger
 from src.common.custom_exception import CustomException
 
 
+SCHEMA_TYPES = {schema: question_type for question_type, (schema, _, _) in PROMPT_SOURCES.items()}
+
+
 class QuestionGenerator:
-    def __init__(self):
-        self.llm = get_groq_llm()
+    def __init__(self, llm=None):
+        self.llm = llm or get_groq_llm()
+        # an injected LLM (tests, benchmarks) is used as-is; otherwise requests are routed by tier
+        self.router = get_model_router() if llm is None and settings.ROUTING_ENABLED else None
+        self.prompts = get_prompt_registry()
         self.logger = get_logger(self.__class__.__name__)
-
-    def _retry_and_parse(self, prompt, parser, topic, difficulty):
-        """Internal helper for retrying LLM generation and parsing output."""
-        for attempt in range(settings.MAX_RETRIES):
+        self.cache = get_question_cache() if settings.CACHE_ENABLED else None
+        self.hedger = get_hedger() if settings.HEDGING_ENABLED else None
+        self._structured_llms = {}
+
+    def _cache_key(self, schema, topic, difficulty, model=None):
+        """Cache key for questions from `model`; by default the model routing prefers for this request."""
+        if self.cache is None:
+            return None
+        question_type = SCHEMA_TYPES[schema]
+        if model is None:
+            if self.router is not None:
+                model = self.router.tiers[self.router.tier_for(question_type, difficulty)]
+            else:
+                model = getattr(self.llm, "model_name", None)
+        return self.cache.make_key(question_type, topic, difficulty, model)
+
+    def _cached_questions(self, cache_key, schema, n):
+        if cache_key is None:
+            return []
+        return [schema.parse_obj(payload) for payload in self.cache.get_many(cache_key, n)]
+
+    def _cache_questions(self, cache_key, questions):
+        """Store questions that already passed structural validation."""
+        if cache_key is None or not questions:
+            return
+        self.cache.put_many(cache_key, [q.dict() for q in questions])
+
+    async def _acached_questions(self, cache_key, schema, n):
+        """`_cached_questions` for the event loop: SQLite lookups run in a worker thread."""
+        if cache_key is None:
+            return []
+        return [schema.parse_obj(payload) for payload in await self.cache.aget_many(cache_key, n)]
+
+    async def _acache_questions(self, cache_key, questions):
+        if cache_key is None or not questions:
+            return
+        await self.cache.aput_many(cache_key, [q.dict() for q in questions])
+
+    @staticmethod
+    def _content(response):
+        return response.content if hasattr(response, 'content') else str(response)
+
+    @staticmethod
+    def _used_tokens(response):
+        usage = getattr(response, "usage_metadata", None) or {}
+        return usage.get("total_tokens", 0)
+
+    @staticmethod
+    def _generation_mode(question_type):
+        return settings.GENERATION_MODE_OVERRIDES.get(question_type, settings.GENERATION_MODE)
+
+    def _route(self, question_type, difficulty):
+        """(model name, LLM) for one attempt; the model is None when routing is off."""
+        if self.router is None:
+            return None, self.llm
+        model = self.router.route(question_type, difficulty)
+        return model, get_groq_llm(model)
+
+    def _record_route(self, model, start, ok):
+        """Feed one call back to the router; `start` is when the limiter let it through, None if it never was."""
+        if model is not None and start is not None:
+            self.router.record(model, time.perf_counter() - start, ok)
+
+    def _runnable(self, spec, batch=False, llm=None, structured=True):
+        """The model to call for `spec`: bound to its schema in structured mode, the plain LLM otherwise.
+
+        `structured=False` forces the parser path, e.g. after the provider rejected a structured response.
+        """
+        llm = llm or self.llm
+        if not structured or self._generation_mode(spec.question_type) != "structured":
+            return llm
+        model = getattr(llm, "model_name", None)
+        key = (model, spec.question_type, batch)
+        if key not in self._structured_llms:
             try:
-                self.logger.info(f"Generating question for topic '{topic}' with difficulty '{difficulty}' (attempt {attempt+1})")
-
-                formatted_prompt = prompt.format(
-                    topic=topic, 
-                    difficulty=difficulty, 
-                    format_instructions=parser.get_format_instructions()
+                self._structured_llms[key] = llm.with_structured_output(
+                    spec.batch_schema if batch else spec.schema,
+                    method=settings.STRUCTURED_OUTPUT_METHOD_OVERRIDES.get(model, settings.STRUCTURED_OUTPUT_METHOD),
+                    include_raw=True,
                 )
-                
-                response = self.llm.invoke(formatted_prompt) 
-                
-                content = response.content if hasattr(response, 'content') else str(response)
+            except (AttributeError, NotImplementedError, ValueError) as e:
+                self.logger.warning("Structured output unavailable for %s, using the parser path: %s", spec.question_type, e)
+                self._structured_llms[key] = llm
+        return self._structured_llms[key]
+
+    def _response(self, response, question_type, estimate):
+        """Charge the limiter and metrics, then return the text, or the structured result as-is."""
+        raw = response["raw"] if isinstance(response, dict) else response
+        get_rate_limiter().charge(self._used_tokens(raw) - estimate)
+        record_usage(question_type, raw)
+        return response if isinstance(response, dict) else self._content(response)
+
+    @staticmethod
+    async def _aacquire(formatted_prompt) -> int:
+        """Wait for rate-limiter capacity for one call; returns the token estimate taken."""
+        estimate = estimate_tokens(formatted_prompt)
+        await get_rate_limiter().aacquire(estimate)
+        return estimate
+
+    async def _ainvoke(self, formatted_prompt, question_type, runnable, estimate):
+        """One LLM call; the caller has already acquired `estimate` tokens for it."""
+        with STAGE_SECONDS.time(question_type=question_type, stage="llm"):
+            response = await runnable.ainvoke(formatted_prompt)
+        return self._response(response, question_type, estimate)
+
+    async def _aattempt(self, spec, formatted_prompt, runnable, estimate):
+        content = await self._ainvoke(formatted_prompt, spec.question_type, runnable, estimate)
+        with STAGE_SECONDS.time(question_type=spec.question_type, stage="parse"):
+            return self._parse(spec.parser, content)
+
+    async def _ahedged_attempt(self, spec, formatted_prompt, runnable, estimate):
+        call = lambda: self._aattempt(spec, formatted_prompt, runnable, estimate)
+        if self.hedger is not None:
+            # the hedge clock starts only once the primary is dispatched, and a
+            # hedge that would have to queue in the limiter is not sent at all
+            return await self.hedger.run(spec.question_type, call, lambda: get_rate_limiter().try_acquire(estimate))
+        return await call()
+
+    def _keep_structured(self, structured, error, question_type):
+        """Whether the next attempt may use structured output; a schema-level parse failure drops to the parser path."""
+        if structured and self._generation_mode(question_type) == "structured" and classify_error(error) == PARSE:
+            self.logger.warning("Structured output failed for %s, retrying on the parser path.", question_type)
+            return False
+        return structured
+
+    def _retry_delay(self, error, attempt, question_type):
+        """Classify a failed attempt and return the backoff before the next one.
+
+        Raises once the error is not retryable or the attempt budget is spent.
+        """
+        kind = classify_error(error)
+        FAILURES.inc(question_type=question_type, kind=kind)
+        self.logger.error("Error generating question (%s): %s", kind, error)
+        if kind == FATAL or attempt == settings.MAX_RETRIES - 1:
+            raise CustomException(f"Generation failed after {attempt+1} attempts", error)
+
+        delay = backoff_delay(kind, attempt, error)
+        if kind == RATE_LIMIT:
+            # the shared limiter holds back every session, not just this one
+            get_rate_limiter().pause(delay)
+            return 0.0
+        return delay
+
+    def _validate(self, question_type, question):
+        """Run the structural validator for `question_type`; raises ValueError on a bad question."""
+        with STAGE_SECONDS.time(question_type=question_type, stage="validate"):
+            getattr(self, f"_validate_{question_type}")(question)
+
+    def _structured_payload(self, result):
+        """Plain data from a structured-output result, salvaging the raw tool call or text if parsing failed."""
+        parsed = result.get("parsed")
+        if parsed is not None:
+            return parsed.dict() if hasattr(parsed, "dict") else parsed
+
+        raw = result.get("raw")
+        for call in getattr(raw, "tool_calls", None) or []:
+            return call["args"]
+        content = self._content(raw) if raw is not None else ""
+        if content.strip():
+            data, applied = repair_json(content)
+            record_repair(applied)
+            return data
+        raise result.get("parsing_error") or OutputParserException("Empty structured output.")
+
+    def _parse(self, parser, content):
+        """Strict parse first, then local JSON repair before giving up on the response."""
+        if isinstance(content, dict):
+            if isinstance(content.get("parsed"), parser.pydantic_object):
+                return content["parsed"]
+            try:
+                data = self._structured_payload(content)
+                item, coerced = coerce_to_schema(data, parser.pydantic_object)
+                parsed = parser.pydantic_object.parse_obj(item)
+            except Exception as e:
+                raise OutputParserException(f"Structured output did not match {parser.pydantic_object.__name__}: {e}")
+            record_repair(coerced)
+            return parsed
 
-                parsed = parser.parse(content)
-                
+        try:
+            return parser.parse(content)
+        except Exception as parse_error:
+            try:
+                parsed = parse_with_repair(content, parser.pydantic_object)
+            except Exception:
+                raise parse_error
+            self.logger.info("Recovered malformed response with local JSON repair.")
+            return parsed
+
+    def _retry_and_parse(self, question_type, topic, difficulty):
+        """Blocking `_aretry_and_parse`, run on the shared LLM event loop."""
+        return run_async(self._aretry_and_parse(question_type, topic, difficulty))
+
+    async def _aretry_and_parse(self, question_type, topic, difficulty):
+        """One validated question of `question_type`: cache first, then LLM attempts with retries."""
+        spec = self.prompts.get(question_type)
+        cache_key = self._cache_key(spec.schema, topic, difficulty)
+        cached = await self._acached_questions(cache_key, spec.schema, 1)
+        if cached:
+            self.logger.info("Serving cached question for topic '%s' with difficulty '%s'", topic, difficulty)
+            return cached[0]
+
+        structured = True
+        for attempt in range(settings.MAX_RETRIES):
+            model, llm = self._route(question_type, difficulty)
+            start = None
+            try:
+                self.logger.info("Generating question for topic '%s' with difficulty '%s' (attempt %s)", topic, difficulty, attempt + 1)
+
+                with STAGE_SECONDS.time(question_type=question_type, stage="prompt"):
+                    formatted_prompt = spec.render(topic, difficulty)
+
+                estimate = await self._aacquire(formatted_prompt)
+                # the router judges the model, so time queued in our own limiter does not count
+                start = time.perf_counter()
+                parsed = await self._ahedged_attempt(spec, formatted_prompt, self._runnable(spec, llm=llm, structured=structured), estimate)
+                # a structurally invalid question is a failed attempt: retried, and held against the model
+                self._validate(question_type, parsed)
+                self._record_route(model, start, True)
+                # a fallback tier's questions are cached under its own model, not the preferred one
+                await self._acache_questions(self._cache_key(spec.schema, topic, difficulty, model), [parsed])
+
+                ATTEMPTS.observe(attempt + 1, question_type=question_type)
                 self.logger.info("Successfully parsed question response.")
                 return parsed
 
             except Exception as e:
-                self.logger.error(f"Error generating question: {str(e)}")
-                if attempt == settings.MAX_RETRIES - 1:
-                    raise CustomException(f"Generation failed after {settings.MAX_RETRIES} attempts", e)
-
-
-    def generate_mcq(self, topic: str, difficulty: str = "medium") -> MCQQuestion:
-        try:
-            parser = PydanticOutputParser(pydantic_object=MCQQuestion)
-            question = self._retry_and_parse(mcq_prompt_template, parser, topic, difficulty)
-
-            if len(question.options) != 4 or question.correct_answer not in question.options:
-                raise ValueError("Invalid MCQ structure: must have 4 options and a valid correct answer.")
-            
-            self.logger.info("Generated a valid MCQ question.")
-            return question
-
-        except Exception as e:
-            self.logger.error(f"Failed to generate MCQ: {str(e)}")
-            raise CustomException("MCQ generation failed", e)
-
-    def generate_fill_blank(self, topic: str, difficulty: str = "medium") -> FillBlankQuestion:
-        try:
-            parser = PydanticOutputParser(pydantic_object=FillBlankQuestion)
-            question = self._retry_and_parse(fill_blank_prompt_template, parser, topic, difficulty)
-
-            if "___" not in question.question:
-                raise ValueError("Fill-in-the-blank question must contain '___'.")
-            
-            self.logger.info("Generated a valid Fill-in-the-Blank question.")
-            return question
-
-        except Exception as e:
-            self.logger.error(f"Failed to generate Fill-in-the-Blank: {str(e)}")
-            raise CustomException("Fill-in-the-Blank generation failed", e)
-
-    def generate_true_false(self, topic: str, difficulty: str = "medium") -> TrueFalseQuestion:
-        try:
-            parser = PydanticOutputParser(pydantic_object=TrueFalseQuestion)
-            question = self._retry_and_parse(true_false_prompt_template, parser, topic, difficulty)
-
-            if not isinstance(question.answer, bool):
-                raise ValueError("Answer must be a boolean value (true/false).")
-
-            self.logger.info("Generated a valid True/False question.")
-            return question
-
-        except Exception as e:
-            self.logger.error(f"Failed to generate True/False: {str(e)}")
-            raise CustomException("True/False generation failed", e)
-
-    def generate_short_answer(self, topic: str, difficulty: str = "medium") -> ShortAnswerQuestion:
+                self._record_route(model, start, False)
+                delay = self._retry_delay(e, attempt, question_type)
+                structured = self._keep_structured(structured, e, question_type)
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _validate_mcq(question: MCQQuestion):
+        if len(question.options) != 4 or question.correct_answer not in question.options:
+            raise ValueError("Invalid MCQ structure: must have 4 options and a valid correct answer.")
+
+    @staticmethod
+    def _validate_fill_blank(question: FillBlankQuestion):
+        if "___" not in question.question:
+            raise ValueError("Fill-in-the-blank question must contain '___'.")
+
+    @staticmethod
+    def _validate_true_false(question: TrueFalseQuestion):
+        if not isinstance(question.answer, bool):
+            raise ValueError("Answer must be a boolean value (true/false).")
+
+    @staticmethod
+    def _validate_short_answer(question: ShortAnswerQuestion):
+        if not question.expected_keywords:
+            raise ValueError("Expected keywords list cannot be empty.")
+
+    @staticmethod
+    def _validate_descriptive(question: DescriptiveQuestion):
+        if not question.rubric:
+            raise ValueError("Descriptive question must include a rubric for evaluation.")
+
+    @staticmethod
+    def _validate_ordering(question: OrderingQuestion):
+        if set(question.items) != set(question.correct_order):
+            raise ValueError("Items and correct_order must contain the same elements.")
+
+    @staticmethod
+    def _validate_multi_select(question: MultiSelectQuestion):
+        if not set(question.correct_answers).issubset(set(question.options)):
+            raise ValueError("All correct answers must exist within the provided options.")
+
+    @staticmethod
+    def _validate_numerical(question: NumericalQuestion):
+        if not isinstance(question.correct_value, (int, float)):
+            raise ValueError("Numerical question must have a valid numeric value.")
+
+    def generate(self, question_type: str, topic: str, difficulty: str = "medium"):
+        """One validated question of `question_type` (mcq, fill_blank, ...)."""
+        return run_async(self.agenerate(question_type, topic, difficulty))
+
+    async def agenerate(self, question_type: str, topic: str, difficulty: str = "medium"):
+        start = time.perf_counter()
         try:
-            parser = PydanticOutputParser(pydantic_object=ShortAnswerQuestion)
-            question = self._retry_and_parse(short_answer_prompt_template, parser, topic, difficulty)
-
-            if not question.expected_keywords:
-                raise ValueError("Expected keywords list cannot be empty.")
+            question = await self._aretry_and_parse(question_type, topic, difficulty)
 
-            self.logger.info("Generated a valid Short Answer question.")
+            self.logger.info("Generated a valid %s question.", question_type)
             return question
 
         except Exception as e:
-            self.logger.error(f"Failed to generate Short Answer: {str(e)}")
-            raise CustomException("Short Answer generation failed", e)
-
-    def generate_descriptive(self, topic: str, difficulty: str = "medium") -> DescriptiveQuestion:
+            self.logger.error("Failed to generate %s question: %s", question_type, e)
+            raise CustomException(f"{question_type} generation failed", e)
+        finally:
+            GENERATE_SECONDS.observe(time.perf_counter() - start, question_type=question_type, mode="single")
+
+    generate_mcq = partialmethod(generate, "mcq")
+    generate_fill_blank = partialmethod(generate, "fill_blank")
+    generate_true_false = partialmethod(generate, "true_false")
+    generate_short_answer = partialmethod(generate, "short_answer")
+    generate_descriptive = partialmethod(generate, "descriptive")
+    generate_ordering = partialmethod(generate, "ordering")
+    generate_multi_select = partialmethod(generate, "multi_select")
+    generate_numerical = partialmethod(generate, "numerical")
+
+    agenerate_mcq = partialmethod(agenerate, "mcq")
+    agenerate_fill_blank = partialmethod(agenerate, "fill_blank")
+    agenerate_true_false = partialmethod(agenerate, "true_false")
+    agenerate_short_answer = partialmethod(agenerate, "short_answer")
+    agenerate_descriptive = partialmethod(agenerate, "descriptive")
+    agenerate_ordering = partialmethod(agenerate, "ordering")
+    agenerate_multi_select = partialmethod(agenerate, "multi_select")
+    agenerate_numerical = partialmethod(agenerate, "numerical")
+
+    def _batch_spec(self, question_type: str):
+        if question_type not in SCHEMA_TYPES.values():
+            raise ValueError(f"Unsupported question type for batch generation: {question_type}")
+        spec = self.prompts.get(question_type)
+        return spec.schema, spec, getattr(self, f"_validate_{question_type}")
+
+    def _collect_batch_items(self, content, schema, validate, questions, n):
+        """Validate a batch response item by item, keeping the valid ones up to `n`."""
+        question_type = SCHEMA_TYPES[schema]
+        with STAGE_SECONDS.time(question_type=question_type, stage="parse"):
+            try:
+                data = self._structured_payload(content) if isinstance(content, dict) else parse_json_markdown(content)
+            except Exception:
+                try:
+                    data, applied = repair_json(content)
+                    record_repair(applied)
+                except Exception as e:
+                    FAILURES.inc(question_type=question_type, kind=PARSE)
+                    self.logger.error("Could not parse batch response: %s", e)
+                    return
+
+        items = data.get("questions", [data]) if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            FAILURES.inc(question_type=question_type, kind=PARSE)
+            self.logger.error("Batch response is not a JSON array.")
+            return
+
+        for item in items:
+            if len(questions) >= n:
+                break
+            question = self._validated_item(item, schema, validate)
+            if question is not None:
+                questions.append(question)
+
+    def _validated_item(self, item, schema, validate):
+        """Parse one batch item into `schema` and validate it, or return None if it is unusable."""
+        question_type = SCHEMA_TYPES[schema]
         try:
-            parser = PydanticOutputParser(pydantic_object=DescriptiveQuestion)
-            question = self._retry_and_parse(descriptive_prompt_template, parser, topic, difficulty)
-
-            if not question.rubric:
-                raise ValueError("Descriptive question must include a rubric for evaluation.")
-
-            self.logger.info("Generated a valid Descriptive question.")
+            try:
+                question = schema.parse_obj(item)
+            except Exception:
+                item, coerced = coerce_to_schema(item, schema)
+                question = schema.parse_obj(item)
+                record_repair(coerced)
+            with STAGE_SECONDS.time(question_type=question_type, stage="validate"):
+                validate(question)
             return question
-
         except Exception as e:
-            self.logger.error(f"Failed to generate Descriptive question: {str(e)}")
-            raise CustomException("Descriptive question generation failed", e)
+            FAILURES.inc(question_type=question_type, kind=classify_error(e))
+            self.logger.warning("Dropping invalid batch item: %s", e)
+            return None
 
-    def generate_ordering(self, topic: str, difficulty: str = "medium") -> OrderingQuestion:
-        try:
-            parser = PydanticOutputParser(pydantic_object=OrderingQuestion)
-            question = self._retry_and_parse(ordering_prompt_template, parser, topic, difficulty)
+    def generate_batch(self, question_type: str, topic: str, difficulty: str = "medium", n: int = 5, exclude: list = None) -> list:
+        """Blocking `agenerate_batch`, run on the shared LLM event loop."""
+        return run_async(self.agenerate_batch(question_type, topic, difficulty, n, exclude))
 
-            if set(question.items) != set(question.correct_order):
-                raise ValueError("Items and correct_order must contain the same elements.")
+    async def agenerate_batch(self, question_type: str, topic: str, difficulty: str = "medium", n: int = 5, exclude: list = None) -> list:
+        """Generate `n` questions of one type, asking the LLM for the whole shortfall in each call.
 
-            self.logger.info("Generated a valid Ordering question.")
-            return question
-
-        except Exception as e:
-            self.logger.error(f"Failed to generate Ordering question: {str(e)}")
-            raise CustomException("Ordering question generation failed", e)
-
-    def generate_multi_select(self, topic: str, difficulty: str = "medium") -> MultiSelectQuestion:
+        `exclude` lists question stems the new questions must not repeat; it bypasses the cache.
+        """
         try:
-            parser = PydanticOutputParser(pydantic_object=MultiSelectQuestion)
-            question = self._retry_and_parse(multi_select_prompt_template, parser, topic, difficulty)
-
-            if not set(question.correct_answers).issubset(set(question.options)):
-                raise ValueError("All correct answers must exist within the provided options.")
-
-            self.logger.info("Generated a valid Multi-Select question.")
-            return question
+            schema, spec, validate = self._batch_spec(question_type)
+            start = time.perf_counter()
+            cache_key = self._cache_key(schema, topic, difficulty)
+            questions = [] if exclude else await self._acached_questions(cache_key, schema, n)
+            attempts, structured = 0, True
+
+            for attempt in range(settings.MAX_RETRIES):
+                missing = n - len(questions)
+                if missing <= 0:
+                    break
+
+                attempts += 1
+                self.logger.info("Generating %s %s questions for topic '%s' with difficulty '%s' (attempt %s)", missing, question_type, topic, difficulty, attempt + 1)
+                model, llm = self._route(question_type, difficulty)
+                attempt_start = None
+                try:
+                    with STAGE_SECONDS.time(question_type=question_type, stage="prompt"):
+                        formatted_prompt = spec.render_batch(topic, difficulty, missing) + exclusion_hint(exclude)
+                    estimate = await self._aacquire(formatted_prompt)
+                    attempt_start = time.perf_counter()
+                    content = await self._ainvoke(formatted_prompt, question_type, self._runnable(spec, batch=True, llm=llm, structured=structured), estimate)
+                except Exception as e:
+                    self._record_route(model, attempt_start, False)
+                    delay = self._retry_delay(e, attempt, question_type)
+                    structured = self._keep_structured(structured, e, question_type)
+                    await asyncio.sleep(delay)
+                    continue
+                before = len(questions)
+                self._collect_batch_items(content, schema, validate, questions, n)
+                self._record_route(model, attempt_start, len(questions) > before)
+                await self._acache_questions(self._cache_key(schema, topic, difficulty, model), questions[before:])
+
+            if len(questions) < n:
+                raise ValueError(f"Only {len(questions)} of {n} questions were valid after {settings.MAX_RETRIES} attempts.")
+
+            if attempts:
+                ATTEMPTS.observe(attempts, question_type=question_type)
+            GENERATE_SECONDS.observe(time.perf_counter() - start, question_type=question_type, mode="batch")
+            self.logger.info("Generated a valid batch of %s %s questions.", n, question_type)
+            return questions
 
         except Exception as e:
-            self.logger.error(f"Failed to generate Multi-Select question: {str(e)}")
-            raise CustomException("Multi-Select generation failed", e)
-
-    def generate_numerical(self, topic: str, difficulty: str = "medium") -> NumericalQuestion:
-        try:
-            parser = PydanticOutputParser(pydantic_object=NumericalQuestion)
-            question = self._retry_and_parse(numerical_prompt_template, parser, topic, difficulty)
+            self.logger.error("Failed to generate %s batch: %s", question_type, e)
+            raise CustomException(f"Batch generation failed for {question_type}", e)
+
+    def stream_questions(self, question_type: str, topic: str, difficulty: str = "medium", n: int = 5):
+        """Yield validated questions one by one as the LLM streams a batch response.
+
+        Cached questions come first; anything the stream fails to deliver is topped
+        up with a regular `generate_batch` call at the end. The stream always takes
+        the text parser path whatever `GENERATION_MODE` says, since structured output
+        only arrives once the whole response is complete; the top-up honours the mode.
+        """
+        schema, spec, validate = self._batch_spec(question_type)
+        cache_key = self._cache_key(schema, topic, difficulty)
+        cached = self._cached_questions(cache_key, schema, n)
+        yield from cached
+
+        produced = []
+        missing = n - len(cached)
+        if missing > 0:
+            model, llm = self._route(question_type, difficulty)
+            start, dispatched = time.perf_counter(), None
+            try:
+                self.logger.info("Streaming %s %s questions for topic '%s' with difficulty '%s'", missing, question_type, topic, difficulty)
+                formatted_prompt = spec.render_batch(topic, difficulty, missing)
+                get_rate_limiter().acquire(estimate_tokens(formatted_prompt))
+                dispatched = time.perf_counter()
+
+                stream_parser = IncrementalJSONParser()
+                for chunk in llm.stream(formatted_prompt):
+                    record_usage(question_type, chunk)
+                    for item in stream_parser.feed(self._content(chunk)):
+                        question = self._validated_item(item, schema, validate)
+                        if question is not None and len(produced) < missing:
+                            produced.append(question)
+                            yield question
+                GENERATE_SECONDS.observe(time.perf_counter() - start, question_type=question_type, mode="stream")
+                self._record_route(model, dispatched, bool(produced))
 
-            if not isinstance(question.correct_value, (int, float)):
-                raise ValueError("Numerical question must have a valid numeric value.")
+            except Exception as e:
+                self._record_route(model, dispatched, False)
+                FAILURES.inc(question_type=question_type, kind=classify_error(e))
+                self.logger.error("Streaming generation interrupted (%s): %s", classify_error(e), e)
 
-            self.logger.info("Generated a valid Numerical question.")
-            return question
+            self._cache_questions(self._cache_key(schema, topic, difficulty, model), produced)
 
-        except Exception as e:
-            self.logger.error(f"Failed to generate Numerical question: {str(e)}")
-            raise CustomException("Numerical question generation failed", e)
\ No newline at end of file
+        shortfall = missing - len(produced)
+        if shortfall > 0:
+            self.logger.info("Topping up %s %s questions after streaming.", shortfall, question_type)
+            yield from self.generate_batch(question_type, topic, difficulty, shortfall)
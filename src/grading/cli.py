@@ -0,0 +1,143 @@
+import os
+import sys
+import csv
+import json
+import argparse
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from src.grading.engine import get_grading_engine
+
+
+def _decode_answer(value):
+    """CSV answers are plain strings unless they hold a JSON list (Multi-Select)."""
+    if isinstance(value, str) and value.lstrip().startswith("["):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _to_record(item):
+    fmt, line_no, raw = item
+    if fmt == "jsonl":
+        record = json.loads(raw)
+    else:
+        record = dict(raw)
+        record["question"] = json.loads(record["question"])
+        record["answer"] = _decode_answer(record.get("answer", ""))
+    return line_no, record
+
+
+def grade_chunk(chunk: list) -> list:
+    """Grade one chunk of raw input records and return serialized result lines."""
+    results, records = [None] * len(chunk), []
+    for i, item in enumerate(chunk):
+        try:
+            records.append((i, *_to_record(item)))
+        except Exception as e:
+            results[i] = {"question_number": item[1], "error": str(e)}
+
+    if records:
+        engine = get_grading_engine()
+        try:
+            graded = engine.grade_batch((record["question"], record.get("answer", "")) for _, _, record in records)
+        except Exception:
+            # one malformed question fails the whole batch; grade the records one by one to isolate it
+            graded = []
+            for _, line_no, record in records:
+                try:
+                    graded.append(engine.grade(record["question"], record.get("answer", "")))
+                except Exception as e:
+                    graded.append({"question_number": line_no, "error": str(e)})
+        for (i, line_no, record), result in zip(records, graded):
+            result["question_number"] = line_no
+            if "id" in record:
+                result["id"] = record["id"]
+            results[i] = result
+    return [json.dumps(result, default=str) for result in results]
+
+
+def read_records(stream, fmt: str):
+    """Yield (format, line number, raw record) without loading the whole input."""
+    if fmt == "jsonl":
+        for line_no, line in enumerate(stream, start=1):
+            if line.strip():
+                yield fmt, line_no, line
+    else:
+        for line_no, row in enumerate(csv.DictReader(stream), start=1):
+            yield fmt, line_no, row
+
+
+def chunked(iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def bounded_map(executor, fn, chunks, max_pending: int):
+    """Ordered `executor.map` that never has more than `max_pending` chunks in flight."""
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(fn, chunk))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def grade_stream(input_stream, output_stream, fmt: str, workers: int, chunk_size: int) -> int:
+    chunks = chunked(read_records(input_stream, fmt), chunk_size)
+    count = 0
+
+    if workers <= 1:
+        results = map(grade_chunk, chunks)
+        for lines in results:
+            output_stream.write("\n".join(lines) + "\n")
+            count += len(lines)
+        return count
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for lines in bounded_map(executor, grade_chunk, chunks, max_pending=workers * 2):
+            output_stream.write("\n".join(lines) + "\n")
+            count += len(lines)
+    return count
+
+
+def _detect_format(path: str, fmt: str) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="smartlearn-grade",
+        description="Grade quiz submissions (JSONL or CSV) with the SmartLearn AI evaluation rules.",
+    )
+    parser.add_argument("input", help="Submissions file, or '-' for stdin. Each record has 'question' and 'answer'.")
+    parser.add_argument("-o", "--output", default="-", help="Where to write JSONL results (default: stdout).")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from file extension).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Grading processes.")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Records per worker task.")
+    args = parser.parse_args(argv)
+
+    fmt = _detect_format(args.input, args.format)
+    input_stream = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    output_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    try:
+        count = grade_stream(input_stream, output_stream, fmt, args.workers, args.chunk_size)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+    print(f"Graded {count} records.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
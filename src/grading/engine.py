@@ -0,0 +1,161 @@
+import re
+from src.config.settings import settings
+from src.common.logger import get_logger
+
+# src.grading.lexical (numpy) is imported on first lexical grade to keep cold starts fast.
+
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+
+def normalize(text) -> str:
+    return _PUNCT_RE.sub('', str(text)).strip().lower()
+
+
+class GradingEngine:
+    """Streamlit-free grader behind `QuizManager.grade`, the grading CLI and the API.
+
+    Short Answer and Descriptive answers get a lexical `score` in [0, 1] against
+    the expected keywords or rubric (see `src.grading.lexical`) and are correct
+    at or above their type's threshold. The score depends only on the question
+    and the answer, so `grade` and `grade_batch` agree; a batch just scores all
+    of them in one vectorized pass. Reference vectors are cached per question,
+    and `prepare` builds them when the questions are generated.
+    """
+
+    def __init__(self):
+        self.logger = get_logger(self.__class__.__name__)
+        self.k1 = settings.GRADING_BM25_K1
+        self._graders = {
+            'MCQ': self._grade_mcq,
+            'Fill in the blank': self._grade_fill_blank,
+            'True/False': self._grade_true_false,
+            'Ordering': self._grade_ordering,
+            'Multi-Select': self._grade_multi_select,
+            'Numerical': self._grade_numerical,
+        }
+        # question type -> (reference phrases, shown correct answer, pass threshold)
+        self._references = {
+            'Short Answer': self._short_answer_reference,
+            'Descriptive': self._descriptive_reference,
+        }
+
+    def grade(self, question: dict, answer, question_number: int = 1) -> dict:
+        return self._grade_many([(question, answer, question_number)])[0]
+
+    def grade_batch(self, records) -> list:
+        """Grade an iterable of (question, answer) pairs, numbering them from 1."""
+        return self._grade_many((question, answer, i) for i, (question, answer) in enumerate(records, start=1))
+
+    def prepare(self, questions):
+        """Build the reference vectors of lexically graded questions ahead of grading."""
+        from src.grading.lexical import reference_vector
+        for q in questions:
+            reference = self._references.get(q['type'])
+            if reference is not None:
+                reference_vector(reference(q)[0], self.k1)
+
+    def _grade_many(self, items) -> list:
+        results, lexical = [], []
+        for question, answer, number in items:
+            qtype = question['type']
+            result = {
+                'question_number': number,
+                'question_type': qtype,
+                'question': question.get('question', question.get('prompt', '')),
+                'user_answer': answer,
+                'is_correct': False
+            }
+            results.append(result)
+
+            reference = self._references.get(qtype)
+            if reference is not None:
+                lexical.append((result, reference(question), answer))
+                continue
+            grader = self._graders.get(qtype)
+            if grader is None:
+                result['correct_answer'] = "Manual Review Needed"
+                result['is_correct'] = None
+            else:
+                grader(question, answer, result)
+
+        if lexical:
+            self._score_lexical(lexical)
+        return results
+
+    def _score_lexical(self, pending):
+        from src.grading.lexical import reference_vector, score_batch
+        scores = score_batch(
+            [reference_vector(phrases, self.k1) for _, (phrases, _, _), _ in pending],
+            [answer for _, _, answer in pending],
+        )
+        for (result, (_, correct_answer, threshold), _), score in zip(pending, scores.tolist()):
+            result['correct_answer'] = correct_answer
+            result['score'] = round(score, 3)
+            result['is_correct'] = score >= threshold
+
+    @staticmethod
+    def _short_answer_reference(q):
+        keywords = [kw.lower().strip() for kw in q.get('expected_keywords', [])]
+        return tuple(keywords), ", ".join(keywords), settings.GRADING_SHORT_ANSWER_THRESHOLD
+
+    @staticmethod
+    def _descriptive_reference(q):
+        rubric = q.get("rubric", "")
+        if isinstance(rubric, (list, tuple)):
+            rubric = " ".join(map(str, rubric))
+        return tuple(f"{q.get('question', '')} {rubric}".split()), rubric, settings.GRADING_DESCRIPTIVE_THRESHOLD
+
+    @staticmethod
+    def _grade_mcq(q, ans, result):
+        result['correct_answer'] = q['correct_answer']
+        result['is_correct'] = ans == q['correct_answer']
+
+    @staticmethod
+    def _grade_fill_blank(q, ans, result):
+        result['correct_answer'] = q['correct_answer']
+        result['is_correct'] = normalize(ans) == normalize(q['correct_answer'])
+
+    @staticmethod
+    def _grade_true_false(q, ans, result):
+        correct = str(q['correct_answer']).lower()
+        result['correct_answer'] = correct
+        result['is_correct'] = str(ans).lower() == correct
+
+    @staticmethod
+    def _grade_ordering(q, ans, result):
+        correct_order = [str(x).strip().lower() for x in q.get("correct_order", [])]
+        result["correct_answer"] = ", ".join(q.get("correct_order", []))
+        # the UI sends "a, b, c"; API clients may send the list itself
+        parts = ans if isinstance(ans, (list, tuple)) else str(ans).split(",")
+        user_order = [str(x).strip().lower() for x in parts if str(x).strip()]
+        result["is_correct"] = user_order == correct_order
+
+    @staticmethod
+    def _grade_multi_select(q, ans, result):
+        correct = set(q.get('correct_answer', []))
+        result['correct_answer'] = list(correct)
+        # anything but a collection of options (a number, a list of dicts, ...) is just wrong
+        try:
+            result['is_correct'] = isinstance(ans, (list, tuple, set)) and set(ans) == correct
+        except TypeError:
+            result['is_correct'] = False
+
+    @staticmethod
+    def _grade_numerical(q, ans, result):
+        correct = float(q['correct_answer'])
+        try:
+            user_ans = float(ans)
+            result['is_correct'] = abs(user_ans - correct) < 0.001
+        except (ValueError, TypeError):
+            result['is_correct'] = False
+        result['correct_answer'] = correct
+
+
+_grading_engine = None
+
+
+def get_grading_engine() -> GradingEngine:
+    global _grading_engine
+    if _grading_engine is None:
+        _grading_engine = GradingEngine()
+    return _grading_engine
@@ -0,0 +1,86 @@
+import re
+import zlib
+from functools import lru_cache
+import numpy as np
+from src.grading.stopwords import ENGLISH_STOPWORDS
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_EMPTY = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+
+
+def stem(word: str) -> str:
+    """Strip common inflections so "cells"/"cell" and "scattering"/"scattered" match."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 5 and word.endswith("ing"):
+        return word[:-3]
+    if len(word) > 4 and word.endswith("ed"):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+@lru_cache(maxsize=65536)
+def term_id(token: str) -> int:
+    # crc32 rather than hash() so ids agree across grading processes
+    return zlib.crc32(stem(token).encode("utf-8"))
+
+
+def term_ids(text) -> list:
+    return [term_id(t) for t in _TOKEN_RE.findall(str(text).lower()) if len(t) > 1 and t not in ENGLISH_STOPWORDS]
+
+
+def answer_terms(text) -> set:
+    """Distinct term ids of an answer; only presence counts when scoring."""
+    return {term_id(t) for t in set(_TOKEN_RE.findall(str(text).lower())) - ENGLISH_STOPWORDS if len(t) > 1}
+
+
+@lru_cache(maxsize=4096)
+def reference_vector(phrases: tuple, k1: float) -> tuple:
+    """Term ids of a reference and their weights, BM25-saturated term frequencies.
+
+    Each phrase (an expected keyword, a rubric word) counts once, split evenly
+    across its terms, so a multi-word keyword weighs as much as a single word.
+    The weights depend on this reference alone, so an answer scores the same
+    whichever batch it is graded in.
+    """
+    counts, shares = {}, {}
+    for phrase in phrases:
+        ids = term_ids(phrase)
+        for t in ids:
+            counts[t] = counts.get(t, 0) + 1
+            shares[t] = shares.get(t, 0.0) + 1.0 / len(ids)
+    if not counts:
+        return _EMPTY
+    terms = np.fromiter(counts, dtype=np.int64, count=len(counts))
+    tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    share = np.fromiter(shares.values(), dtype=np.float64, count=len(counts))
+    # saturate repeats of a term, keeping each phrase's total weight at one
+    return terms, share / tf * (tf * (k1 + 1) / (tf + k1))
+
+
+def score_batch(references: list, answers: list) -> np.ndarray:
+    """Score each answer against its reference vector, in one pass over the whole batch.
+
+    The score is the share of the reference's weight that the answer covers, in
+    [0, 1]. Each row is scored independently of the others.
+    """
+    n = len(references)
+    if n == 0:
+        return np.empty(0)
+
+    lengths = [len(terms) for terms, _ in references]
+    ref_rows = np.repeat(np.arange(n, dtype=np.int64), lengths)
+    ref_terms = np.concatenate([terms for terms, _ in references])
+    weights = np.concatenate([w for _, w in references])
+
+    answer_ids = [answer_terms(answer) for answer in answers]
+    ans_rows = np.repeat(np.arange(n, dtype=np.int64), [len(ids) for ids in answer_ids])
+    ans_terms = np.fromiter((t for ids in answer_ids for t in ids), dtype=np.int64, count=len(ans_rows))
+
+    # (row, term) pairs packed into one int64 key; crc32 ids fit in the low 32 bits
+    covered = np.isin((ref_rows << 32) | ref_terms, (ans_rows << 32) | ans_terms)
+    totals = np.bincount(ref_rows, weights=weights, minlength=n)
+    matched = np.bincount(ref_rows, weights=weights * covered, minlength=n)
+    return np.divide(matched, totals, out=np.zeros(n), where=totals > 0)
@@ -0,0 +1,199 @@
+import time
+import threading
+from uuid import uuid4
+from collections import OrderedDict, deque
+from src.config.settings import settings
+from src.utils.questions import QUESTION_BUILDERS
+from src.metrics.registry import JOBS, JOB_WAIT_SECONDS
+from src.common.logger import get_logger, log_context
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobRejectedError(Exception):
+    """The queue, or the user's share of it, is full."""
+
+
+class Job:
+    def __init__(self, user: str, topic: str, question_type: str, difficulty: str, num_questions: int):
+        self.id = uuid4().hex
+        self.user = user
+        self.topic = topic
+        self.question_type = question_type
+        self.difficulty = difficulty
+        self.num_questions = num_questions
+        self.status = QUEUED
+        self.ready = 0
+        self.manager = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.fetched_at = None
+
+    def snapshot(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "ready": self.ready,
+            "total": self.num_questions,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """Bounded background quiz generation.
+
+    Users are served round-robin, so one user's burst cannot starve the others;
+    `max_queued` caps the whole backlog and `max_per_user` each user's share.
+    Finished jobs are kept until fetched (then for `fetched_ttl`, so a reload
+    can fetch again), or for `result_ttl` if nobody fetches them.
+    """
+
+    def __init__(self, manager_factory=None, generator_factory=None, workers: int = None, max_queued: int = None,
+                 max_per_user: int = None, result_ttl: float = None, fetched_ttl: float = None):
+        self.manager_factory = manager_factory
+        self.generator_factory = generator_factory
+        self.max_queued = max_queued or settings.JOBS_MAX_QUEUED
+        self.max_per_user = max_per_user or settings.JOBS_MAX_PER_USER
+        self.result_ttl = result_ttl or settings.JOBS_RESULT_TTL
+        self.fetched_ttl = settings.JOBS_FETCHED_TTL if fetched_ttl is None else fetched_ttl
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._lock = threading.Condition()
+        self._jobs = {}
+        self._queues = OrderedDict()  # user -> deque of queued jobs, in round-robin order
+        self._queued = 0
+        self._generator = None
+        self._threads = [
+            threading.Thread(target=self._work, name=f"quiz-job-{i}", daemon=True)
+            for i in range(workers or settings.JOBS_WORKERS)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _get_generator(self):
+        with self._lock:
+            if self._generator is None and self.generator_factory is not None:
+                self._generator = self.generator_factory()
+            return self._generator
+
+    def submit(self, user: str, topic: str, question_type: str, difficulty: str, num_questions: int) -> str:
+        if str(question_type).strip().lower() not in QUESTION_BUILDERS:
+            JOBS.inc(event="rejected")
+            raise ValueError(f"Unsupported question type: {question_type}")
+        job = Job(user, topic, question_type, difficulty, num_questions)
+        with self._lock:
+            self._expire()
+            pending = sum(1 for j in self._jobs.values() if j.user == user and j.status in (QUEUED, RUNNING))
+            if self._queued >= self.max_queued or pending >= self.max_per_user:
+                JOBS.inc(event="rejected")
+                raise JobRejectedError(
+                    "Too many quizzes are being generated right now; please try again shortly."
+                    if self._queued >= self.max_queued else
+                    f"You already have {pending} quizzes generating; wait for one to finish."
+                )
+            self._jobs[job.id] = job
+            self._queues.setdefault(user, deque()).append(job)
+            self._queued += 1
+            self._lock.notify()
+        JOBS.inc(event="submitted")
+        return job.id
+
+    def status(self, job_id: str) -> dict:
+        """Progress of a job, or None if it is unknown or expired."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.snapshot() if job else None
+
+    def fetch(self, job_id: str):
+        """The finished job (its `manager` holds the questions), or None while it is still running."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in (DONE, FAILED):
+                return None
+            job.fetched_at = job.fetched_at or time.time()
+            return job
+
+    def _next_job(self):
+        """Pop the head job of the next user in rotation. Caller holds the lock."""
+        user, jobs = next(iter(self._queues.items()))
+        job = jobs.popleft()
+        del self._queues[user]
+        if jobs:
+            self._queues[user] = jobs  # back of the rotation
+        self._queued -= 1
+        return job
+
+    def _work(self):
+        while True:
+            with self._lock:
+                while not self._queues:
+                    self._lock.wait()
+                job = self._next_job()
+                job.status = RUNNING
+            JOB_WAIT_SECONDS.observe(time.time() - job.created_at)
+            self._run(job)
+
+    def _run(self, job: Job):
+        manager = self.manager_factory()
+        try:
+            with log_context(request_id=job.id, question_type=job.question_type):
+                stream = manager.generate_questions_stream(
+                    self._get_generator(), job.topic, job.question_type, job.difficulty, job.num_questions
+                )
+                for _ in stream:
+                    job.ready += 1
+            if not manager.question_ids:
+                raise RuntimeError("No valid questions could be generated.")
+            job.manager, job.status = manager, DONE
+            JOBS.inc(event="completed")
+        except Exception as e:
+            job.error, job.status = str(e), FAILED
+            JOBS.inc(event="failed")
+            self.logger.error("Quiz job %s failed: %s", job.id, e)
+        finally:
+            job.finished_at = time.time()
+
+    def _expire(self):
+        """Drop finished jobs past their TTL. Caller holds the lock."""
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and (
+                (job.fetched_at is not None and now - job.fetched_at > self.fetched_ttl)
+                or now - job.finished_at > self.result_ttl
+            )
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def depth(self) -> int:
+        with self._lock:
+            return self._queued
+
+
+def _default_manager():
+    if settings.API_URL:
+        from src.api.client import RemoteQuizManager
+        return RemoteQuizManager()
+    from src.utils.helpers import QuizManager
+    return QuizManager()
+
+
+def _default_generator():
+    if settings.API_URL:
+        return None  # the quiz API owns generation
+    from src.generator.question_generator import QuestionGenerator
+    return QuestionGenerator()
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(_default_manager, _default_generator)
+        return _job_queue
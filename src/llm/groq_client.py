@@ -1,9 +1,105 @@
+import atexit
+import asyncio
+import threading
+import contextvars
+import httpx
 from langchain_groq import ChatGroq
 from src.config.settings import settings
 
-def get_groq_llm():
-    return ChatGroq(
-        api_key=settings.GROQ_API_KEY,
-        model=settings.MODEL_NAME,
-        temperature=settings.TEMPERATURE
-    )
\ No newline at end of file
+_clients = {}
+_clients_lock = threading.Lock()
+_http_clients = None
+_loop = None
+_loop_thread = None
+
+
+def _build_http_clients():
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT)
+    return (
+        httpx.Client(limits=limits, timeout=timeout),
+        httpx.AsyncClient(limits=limits, timeout=timeout),
+    )
+
+
+def get_groq_llm(model: str = None, temperature: float = None):
+    """Return the shared ChatGroq client for a (model, temperature) configuration."""
+    global _http_clients
+    key = (model or settings.MODEL_NAME, settings.TEMPERATURE if temperature is None else temperature)
+
+    with _clients_lock:
+        if key not in _clients:
+            if _http_clients is None:
+                _http_clients = _build_http_clients()
+            sync_client, async_client = _http_clients
+            _clients[key] = ChatGroq(
+                api_key=settings.GROQ_API_KEY,
+                model=key[0],
+                temperature=key[1],
+                request_timeout=settings.HTTP_TIMEOUT,
+                max_retries=0,
+                http_client=sync_client,
+                http_async_client=async_client,
+            )
+        return _clients[key]
+
+
+def _get_loop():
+    global _loop, _loop_thread
+    with _clients_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="groq-event-loop", daemon=True)
+            _loop_thread.start()
+        return _loop
+
+
+def run_async(coro):
+    """Run `coro` on the process-wide LLM event loop and block for its result.
+
+    The shared async HTTP client keeps its pooled connections bound to one event
+    loop, so every async LLM call goes through this loop instead of `asyncio.run`.
+    """
+    return asyncio.run_coroutine_threadsafe(_with_context(contextvars.copy_context(), coro), _get_loop()).result()
+
+
+async def arun(coro):
+    """Await `coro` on the shared LLM event loop from another event loop (e.g. an HTTP server's)."""
+    return await asyncio.wrap_future(
+        asyncio.run_coroutine_threadsafe(_with_context(contextvars.copy_context(), coro), _get_loop())
+    )
+
+
+async def _with_context(ctx, coro):
+    """Carry the caller's context variables (log context, ...) onto the loop thread."""
+    for var, value in ctx.items():
+        var.set(value)
+    return await coro
+
+
+def shutdown_groq_clients():
+    """Close pooled HTTP connections and stop the shared event loop."""
+    global _http_clients, _loop, _loop_thread
+    with _clients_lock:
+        _clients.clear()
+        http_clients, _http_clients = _http_clients, None
+        loop, _loop = _loop, None
+        loop_thread, _loop_thread = _loop_thread, None
+
+    if http_clients is not None:
+        sync_client, async_client = http_clients
+        sync_client.close()
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(async_client.aclose(), loop).result(timeout=5)
+
+    if loop is not None:
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join(timeout=5)
+        loop.close()
+
+
+atexit.register(shutdown_groq_clients)
@@ -0,0 +1,120 @@
+import time
+import asyncio
+import threading
+from collections import deque
+from src.config.settings import settings
+from src.common.logger import get_logger
+from src.metrics.registry import HEDGES
+
+
+class Hedger:
+    """Races a backup request against a slow primary one.
+
+    The hedge fires once the primary has run longer than the rolling
+    `percentile` latency of its question type. Every primary request earns
+    `budget_ratio` of a hedge (capped at `budget_burst`), so hedging can add at
+    most that fraction of extra load no matter how slow the model gets.
+
+    `call` must already have its rate-limiter capacity when `run` starts, so
+    time spent queued locally neither counts as latency nor triggers a hedge.
+    """
+
+    def __init__(self, percentile: float = None, min_delay: float = None, window: int = None,
+                 min_samples: int = None, budget_ratio: float = None, budget_burst: float = None):
+        self.percentile = percentile or settings.HEDGE_PERCENTILE
+        self.min_delay = settings.HEDGE_MIN_DELAY if min_delay is None else min_delay
+        self.window = window or settings.HEDGE_WINDOW
+        self.min_samples = min_samples or settings.HEDGE_MIN_SAMPLES
+        self.budget_ratio = settings.HEDGE_BUDGET_RATIO if budget_ratio is None else budget_ratio
+        self.budget_burst = settings.HEDGE_BUDGET_BURST if budget_burst is None else budget_burst
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._budget = 0.0
+
+    def observe(self, question_type: str, latency: float):
+        with self._lock:
+            self._latencies.setdefault(question_type, deque(maxlen=self.window)).append(latency)
+
+    def threshold(self, question_type: str):
+        """Seconds to wait before hedging, or None until enough latencies are known."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(question_type, ()))
+        if len(latencies) < self.min_samples:
+            return None
+        return max(self.min_delay, latencies[min(len(latencies) - 1, int(self.percentile * len(latencies)))])
+
+    def _credit(self):
+        with self._lock:
+            self._budget = min(self.budget_burst, self._budget + self.budget_ratio)
+
+    def _spend(self) -> bool:
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            return True
+
+    def _refund(self):
+        with self._lock:
+            self._budget = min(self.budget_burst, self._budget + 1)
+
+    async def run(self, question_type: str, call, reserve=None):
+        """Await `call()` (a coroutine factory), hedging it with a second call when it runs long.
+
+        `reserve()` takes rate-limiter capacity for the hedge without waiting; when
+        it returns False the process is throttled and the hedge is skipped. The
+        first call to succeed wins and the other is cancelled; if both fail, the
+        first error is raised.
+        """
+        self._credit()
+        start = time.perf_counter()
+        primary = asyncio.ensure_future(call())
+        hedge = None
+        tasks = [primary]
+        try:
+            delay = self.threshold(question_type)
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done:
+                    if not self._spend():
+                        HEDGES.inc(question_type=question_type, event="throttled")
+                    elif reserve is not None and not reserve():
+                        self._refund()
+                        HEDGES.inc(question_type=question_type, event="rate_limited")
+                    else:
+                        HEDGES.inc(question_type=question_type, event="fired")
+                        self.logger.info("Hedging %s request after %.2fs", question_type, delay)
+                        hedge = asyncio.ensure_future(call())
+                        tasks.append(hedge)
+
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: t is not primary):
+                    if task.exception() is None:
+                        if task is hedge:
+                            HEDGES.inc(question_type=question_type, event="won")
+                        self.observe(question_type, time.perf_counter() - start)
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # mark a losing failure as retrieved
+
+
+_hedger = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger() -> Hedger:
+    global _hedger
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = Hedger()
+        return _hedger
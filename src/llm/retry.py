@@ -0,0 +1,150 @@
+import time
+import random
+import asyncio
+import threading
+import groq
+import httpx
+from pydantic import ValidationError
+from langchain_core.exceptions import OutputParserException
+from src.config.settings import settings
+
+RATE_LIMIT = "rate_limit"
+TRANSIENT = "transient"
+PARSE = "parse"
+VALIDATION = "validation"
+FATAL = "fatal"
+
+
+def _status_code(error):
+    status = getattr(error, "status_code", None)
+    if status is None and getattr(error, "response", None) is not None:
+        status = getattr(error.response, "status_code", None)
+    return status
+
+
+def classify_error(error: Exception) -> str:
+    """Bucket a generation failure so each kind gets its own retry treatment."""
+    status = _status_code(error)
+    if isinstance(error, groq.RateLimitError) or status == 429:
+        return RATE_LIMIT
+    if isinstance(error, (groq.APITimeoutError, groq.APIConnectionError, groq.InternalServerError,
+                          httpx.TimeoutException, httpx.TransportError, TimeoutError, ConnectionError)):
+        return TRANSIENT
+    if status == 400 and ("tool_use_failed" in str(error) or "json_validate_failed" in str(error)):
+        # the model produced a tool call or JSON document that does not fit the bound schema
+        return PARSE
+    if status is not None:
+        return TRANSIENT if status >= 500 or status == 408 else FATAL
+    if isinstance(error, OutputParserException):
+        return PARSE
+    if isinstance(error, (ValidationError, ValueError)):
+        return VALIDATION
+    # anything else (KeyError, TypeError, ...) is a bug in local code; retrying cannot fix it
+    return FATAL
+
+
+def retry_after(error: Exception):
+    """Seconds requested by the server's Retry-After header, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def backoff_delay(kind: str, attempt: int, error: Exception = None) -> float:
+    """Exponential backoff with full jitter; parse and validation failures retry immediately."""
+    if kind in (PARSE, VALIDATION):
+        return 0.0
+    cap = min(settings.RETRY_MAX_DELAY, settings.RETRY_BASE_DELAY * (2 ** attempt))
+    delay = random.uniform(0, cap)
+    if kind == RATE_LIMIT:
+        delay = max(delay, retry_after(error) or 0.0)
+    return delay
+
+
+def estimate_tokens(text: str) -> int:
+    return len(str(text)) // 4 + settings.RATE_LIMIT_COMPLETION_TOKENS
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.refill_per_second
+
+
+class RateLimiter:
+    """Process-wide request and token buckets sized to the Groq per-minute quotas.
+
+    A 429 anywhere pauses every caller until the server's Retry-After has passed,
+    so one throttle event does not fan out into a retry storm.
+    """
+
+    def __init__(self, requests_per_minute: int = None, tokens_per_minute: int = None):
+        rpm = requests_per_minute or settings.GROQ_REQUESTS_PER_MINUTE
+        tpm = tokens_per_minute or settings.GROQ_TOKENS_PER_MINUTE
+        self.requests = TokenBucket(rpm, rpm / 60.0)
+        self.tokens = TokenBucket(tpm, tpm / 60.0)
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """Take capacity if available and return 0, otherwise return how long to wait."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(
+                self.paused_until - now,
+                self.requests.wait_time(1, now),
+                self.tokens.wait_time(tokens, now),
+            )
+            if wait <= 0:
+                self.requests.tokens -= 1
+                self.tokens.tokens -= min(tokens, self.tokens.capacity)
+            return wait
+
+    def acquire(self, tokens: int):
+        while (wait := self._reserve(tokens)) > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int):
+        while (wait := self._reserve(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+    def try_acquire(self, tokens: int) -> bool:
+        """Take capacity only if it is free right now."""
+        return self._reserve(tokens) <= 0
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def charge(self, tokens: int):
+        """Debit tokens actually used beyond the estimate taken at acquire time."""
+        if tokens > 0:
+            with self._lock:
+                self.tokens.tokens -= tokens
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
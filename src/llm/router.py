@@ -0,0 +1,122 @@
+import time
+import threading
+from collections import deque
+from src.config.settings import settings
+from src.common.logger import get_logger
+from src.metrics.registry import MODEL_ROUTES, MODEL_FALLBACKS
+
+
+class ModelStats:
+    """Rolling latency and error window for one model."""
+
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.tripped_until = 0.0
+
+    def p90(self) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))]
+
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+
+class ModelRouter:
+    """Picks a model tier per (question type, difficulty) and steers around unhealthy tiers.
+
+    A tier is tripped for `cooldown` seconds once its rolling p90 latency breaches
+    the tier SLO or its error rate (transport, parse and validation failures)
+    passes `max_error_rate`; requests for it then follow `ROUTING_FALLBACK`.
+    """
+
+    def __init__(self, rules: dict = None, tiers: dict = None, fallback: dict = None, window: int = None,
+                 min_samples: int = None, max_error_rate: float = None, cooldown: float = None):
+        self.rules = settings.ROUTING_RULES if rules is None else rules
+        self.tiers = tiers or settings.MODEL_TIERS
+        self.fallback = settings.ROUTING_FALLBACK if fallback is None else fallback
+        self.window = window or settings.ROUTING_WINDOW
+        self.min_samples = min_samples or settings.ROUTING_MIN_SAMPLES
+        self.max_error_rate = settings.ROUTING_MAX_ERROR_RATE if max_error_rate is None else max_error_rate
+        self.cooldown = settings.ROUTING_COOLDOWN if cooldown is None else cooldown
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def tier_for(self, question_type: str, difficulty: str) -> str:
+        difficulty = str(difficulty).strip().lower()
+        for key in ((question_type, difficulty), (question_type, "*"), ("*", difficulty)):
+            if key in self.rules:
+                return self.rules[key]
+        return settings.ROUTING_DEFAULT_TIER
+
+    def _healthy(self, model: str, now: float) -> bool:
+        stats = self._stats.get(model)
+        return stats is None or stats.tripped_until <= now
+
+    def route(self, question_type: str, difficulty: str) -> str:
+        """Model name to use for this request."""
+        tier = self.tier_for(question_type, difficulty)
+        chosen, seen, now = tier, set(), time.monotonic()
+        with self._lock:
+            while not self._healthy(self.tiers[chosen], now) and chosen not in seen:
+                seen.add(chosen)
+                chosen = self.fallback.get(chosen, chosen)
+            if not self._healthy(self.tiers[chosen], now):
+                chosen = tier  # every tier is tripped; keep the preferred one
+        if chosen != tier:
+            MODEL_FALLBACKS.inc(from_tier=tier, to_tier=chosen)
+        MODEL_ROUTES.inc(question_type=question_type, tier=chosen)
+        return self.tiers[chosen]
+
+    def record(self, model: str, latency: float, ok: bool):
+        """Feed one call's outcome back; trips the model when it breaches its SLO or error budget."""
+        with self._lock:
+            stats = self._stats.setdefault(model, ModelStats(self.window))
+            stats.latencies.append(latency)
+            stats.outcomes.append(ok)
+            if len(stats.outcomes) < self.min_samples or stats.tripped_until > time.monotonic():
+                return
+
+            slo = settings.ROUTING_LATENCY_SLO.get(self._tier_of(model))
+            p90, error_rate = stats.p90(), stats.error_rate()
+            if (slo is not None and p90 > slo) or error_rate > self.max_error_rate:
+                stats.tripped_until = time.monotonic() + self.cooldown
+                # start the next evaluation from a clean window
+                stats.latencies.clear()
+                stats.outcomes.clear()
+                self.logger.warning(
+                    "Routing around %s for %ss (p90 %.2fs, error rate %.0f%%)",
+                    model, self.cooldown, p90, error_rate * 100,
+                )
+
+    def _tier_of(self, model: str):
+        return next((tier for tier, name in self.tiers.items() if name == model), None)
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                model: {
+                    "p90_s": round(stats.p90(), 3),
+                    "error_rate": round(stats.error_rate(), 3),
+                    "samples": len(stats.outcomes),
+                    "tripped": stats.tripped_until > now,
+                }
+                for model, stats in self._stats.items()
+            }
+
+
+_model_router = None
+_model_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    global _model_router
+    with _model_router_lock:
+        if _model_router is None:
+            _model_router = ModelRouter()
+        return _model_router
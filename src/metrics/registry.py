@@ -0,0 +1,267 @@
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.config.settings import settings
+from src.common.logger import get_logger
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+ATTEMPT_BUCKETS = (1, 2, 3, 4, 5, 10)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.extend(self._samples(key, value))
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def _samples(self, key, state):
+        counts, total, count = state
+        lines, cumulative = [], 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            le = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+        le = _format_labels(self.labelnames, key, [("le", "+Inf")])
+        lines.append(f"{self.name}_bucket{le} {count}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """In-process metric store rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, *args, **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "smartlearn_generation_stage_seconds",
+    "Time spent per question generation stage (prompt, llm, parse, validate).",
+    ("question_type", "stage"),
+)
+GENERATE_SECONDS = registry.histogram(
+    "smartlearn_generate_seconds",
+    "End-to-end latency of QuestionGenerator generate calls.",
+    ("question_type", "mode"),
+)
+ATTEMPTS = registry.histogram(
+    "smartlearn_generation_attempts",
+    "LLM attempts needed per successful generation.",
+    ("question_type",),
+    buckets=ATTEMPT_BUCKETS,
+)
+FAILURES = registry.counter(
+    "smartlearn_generation_failures_total",
+    "Failed generation attempts by error kind (parse, validation, rate_limit, transient, fatal).",
+    ("question_type", "kind"),
+)
+CACHE_LOOKUPS = registry.counter(
+    "smartlearn_question_cache_lookups_total",
+    "Question cache lookups by result (hit, miss) and the tier that served hits (memory, disk).",
+    ("result", "tier"),
+)
+CACHE_EVICTIONS = registry.counter(
+    "smartlearn_question_cache_evictions_total",
+    "Question cache keys dropped for age or to stay under CACHE_MAX_ENTRIES.",
+)
+REPAIRED_RESPONSES = registry.counter(
+    "smartlearn_repaired_responses_total",
+    "LLM responses saved from a retry by local JSON repair or schema coercion.",
+)
+REPAIR_RULES_APPLIED = registry.counter(
+    "smartlearn_repair_rules_applied_total",
+    "Repair and coercion rules involved in saving a response.",
+    ("rule",),
+)
+LLM_TOKENS = registry.counter(
+    "smartlearn_llm_tokens_total",
+    "Prompt and completion tokens reported by the LLM.",
+    ("question_type", "kind"),
+)
+MODEL_ROUTES = registry.counter(
+    "smartlearn_model_routes_total",
+    "Requests routed to each model tier.",
+    ("question_type", "tier"),
+)
+MODEL_FALLBACKS = registry.counter(
+    "smartlearn_model_fallbacks_total",
+    "Requests sent to a fallback tier because the preferred one was unhealthy.",
+    ("from_tier", "to_tier"),
+)
+HEDGES = registry.counter(
+    "smartlearn_hedged_requests_total",
+    "Hedged LLM requests: fired, won (the hedge answered first), throttled by the budget and rate_limited (no limiter capacity).",
+    ("question_type", "event"),
+)
+JOBS = registry.counter(
+    "smartlearn_quiz_jobs_total",
+    "Background quiz generation jobs by event (submitted, rejected, completed, failed).",
+    ("event",),
+)
+JOB_WAIT_SECONDS = registry.histogram(
+    "smartlearn_quiz_job_wait_seconds",
+    "Time quiz jobs spend queued before a worker picks them up.",
+)
+QUIZ_SECONDS = registry.histogram(
+    "smartlearn_quiz_seconds",
+    "Latency of whole-quiz operations in QuizManager.",
+    ("operation", "question_type"),
+)
+QUESTIONS_GRADED = registry.counter(
+    "smartlearn_questions_graded_total",
+    "Answers graded, by question type.",
+    ("question_type",),
+)
+
+
+def record_usage(question_type: str, response):
+    """Count the prompt/completion tokens in a LangChain response's usage metadata."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    if usage.get("input_tokens"):
+        LLM_TOKENS.inc(usage["input_tokens"], question_type=question_type, kind="prompt")
+    if usage.get("output_tokens"):
+        LLM_TOKENS.inc(usage["output_tokens"], question_type=question_type, kind="completion")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = None, host: str = "0.0.0.0"):
+    """Serve `/metrics` on a side port from a daemon thread. Safe to call on every Streamlit rerun."""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server or None
+        port = settings.METRICS_PORT if port is None else port
+        try:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            get_logger(__name__).warning("Metrics server not started on port %s: %s", port, e)
+            _server = False
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        get_logger(__name__).info("Serving Prometheus metrics on port %s", port)
+        return _server
@@ -0,0 +1,46 @@
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field, validator
+from src.config.settings import settings
+
+
+class QuizRequest(BaseModel):
+    topic: str = Field(description="Subject the questions should cover.")
+    question_type: str = Field(description="Generator type (mcq, fill_blank, ...) or UI label (Multiple Choice, ...).")
+    difficulty: str = Field(default="medium", description="easy, medium or hard.")
+    num_questions: int = Field(default=5, ge=1, le=settings.API_MAX_QUESTIONS, description="Questions in the quiz.")
+
+    @validator("topic")
+    def topic_not_blank(cls, v):
+        if not v.strip():
+            raise ValueError("topic must not be blank")
+        return v.strip()
+
+
+class QuizResponse(BaseModel):
+    quiz_id: str
+    topic: str
+    question_type: str
+    difficulty: str
+    questions: List[dict] = Field(description="Questions serialised with the question type's schema from question_schemas.")
+
+
+class AnswerSubmission(BaseModel):
+    answers: List[Any] = Field(description="One answer per question, in question order; missing answers count as blank.")
+
+
+class GradedAnswer(BaseModel):
+    question_number: int
+    question_type: str
+    question: str
+    user_answer: Any = None
+    is_correct: Optional[bool] = None
+    correct_answer: Any = None
+    score: Optional[float] = Field(default=None, description="Lexical score in [0, 1] for Short Answer and Descriptive.")
+
+
+class QuizResult(BaseModel):
+    quiz_id: str
+    score: float = Field(description="Fraction of auto-graded questions answered correctly.")
+    correct: int
+    total: int
+    results: List[GradedAnswer]
@@ -91,4 +91,35 @@ class NumericalQuestion(BaseModel):
     def clean_question(cls, v):
         if isinstance(v, dict):
             return v.get("description", str(v))
-        return str(v)
\ No newline at end of file
+        return str(v)
+
+class MCQQuestionBatch(BaseModel):
+    questions: List[MCQQuestion] = Field(description="A list of multiple-choice questions.")
+
+
+class FillBlankQuestionBatch(BaseModel):
+    questions: List[FillBlankQuestion] = Field(description="A list of fill-in-the-blank questions.")
+
+
+class TrueFalseQuestionBatch(BaseModel):
+    questions: List[TrueFalseQuestion] = Field(description="A list of true/false questions.")
+
+
+class ShortAnswerQuestionBatch(BaseModel):
+    questions: List[ShortAnswerQuestion] = Field(description="A list of short-answer questions.")
+
+
+class DescriptiveQuestionBatch(BaseModel):
+    questions: List[DescriptiveQuestion] = Field(description="A list of descriptive questions.")
+
+
+class OrderingQuestionBatch(BaseModel):
+    questions: List[OrderingQuestion] = Field(description="A list of ordering questions.")
+
+
+class MultiSelectQuestionBatch(BaseModel):
+    questions: List[MultiSelectQuestion] = Field(description="A list of multi-select questions.")
+
+
+class NumericalQuestionBatch(BaseModel):
+    questions: List[NumericalQuestion] = Field(description="A list of numerical questions.")
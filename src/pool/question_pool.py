@@ -0,0 +1,143 @@
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from src.config.settings import settings
+from src.cache.question_cache import normalize_topic
+from src.generator.question_generator import QuestionGenerator
+from src.utils.dedup import QuestionDeduplicator
+from src.common.logger import get_logger
+
+
+class QuestionPool:
+    """Ready-to-serve questions per (question type, topic, difficulty).
+
+    Every request is recorded; the most requested keys are "hot" and background
+    workers keep their pools topped up to `target_depth` whenever they drop below
+    `low_water`. Cold keys are never pre-generated.
+    """
+
+    def __init__(self, generator_factory=None, target_depth: int = None, low_water: int = None,
+                 hot_keys: int = None, history_size: int = None, min_requests: int = None,
+                 workers: int = None, refill_interval: float = None):
+        self.generator_factory = generator_factory or QuestionGenerator
+        self.target_depth = target_depth or settings.POOL_TARGET_DEPTH
+        self.low_water = low_water or settings.POOL_LOW_WATER
+        self.hot_keys_limit = hot_keys or settings.POOL_HOT_KEYS
+        self.min_requests = min_requests or settings.POOL_MIN_REQUESTS
+        self.refill_interval = refill_interval or settings.POOL_REFILL_INTERVAL
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._pools = {}
+        self._topics = {}
+        self._refilling = set()
+        self._history = deque(maxlen=history_size or settings.POOL_HISTORY_SIZE)
+        self._executor = ThreadPoolExecutor(max_workers=workers or settings.POOL_WORKERS, thread_name_prefix="question-pool")
+        self._generator = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"hits": 0, "misses": 0, "served": 0, "refills": 0, "refill_failures": 0}
+
+    @staticmethod
+    def make_key(question_type: str, topic: str, difficulty: str):
+        return question_type, normalize_topic(topic), str(difficulty).strip().lower()
+
+    def _get_generator(self):
+        if self._generator is None:
+            self._generator = self.generator_factory()
+        return self._generator
+
+    def record_request(self, question_type: str, topic: str, difficulty: str):
+        key = self.make_key(question_type, topic, difficulty)
+        with self._lock:
+            self._history.append(key)
+            self._topics.setdefault(key, topic)
+        return key
+
+    def hot_keys(self) -> list:
+        with self._lock:
+            counts = Counter(self._history)
+        return [key for key, count in counts.most_common(self.hot_keys_limit) if count >= self.min_requests]
+
+    def take(self, question_type: str, topic: str, difficulty: str, n: int) -> list:
+        """Record the request and pop up to `n` pooled questions for it."""
+        key = self.record_request(question_type, topic, difficulty)
+        with self._lock:
+            pool = self._pools.get(key)
+            taken = [pool.popleft() for _ in range(min(n, len(pool)))] if pool else []
+            self.stats["hits" if len(taken) == n else "misses"] += 1
+            self.stats["served"] += len(taken)
+
+        if key in self.hot_keys():
+            self._maybe_refill(key)
+        return taken
+
+    def depth(self, question_type: str, topic: str, difficulty: str) -> int:
+        with self._lock:
+            return len(self._pools.get(self.make_key(question_type, topic, difficulty), ()))
+
+    def _maybe_refill(self, key):
+        with self._lock:
+            if key in self._refilling or len(self._pools.get(key, ())) >= self.low_water:
+                return
+            self._refilling.add(key)
+        self._executor.submit(self._refill, key)
+
+    def _refill(self, key):
+        question_type, _, difficulty = key
+        try:
+            with self._lock:
+                missing = self.target_depth - len(self._pools.get(key, ()))
+                topic = self._topics.get(key, key[1])
+            if missing <= 0:
+                return
+
+            dedup = QuestionDeduplicator()
+            with self._lock:
+                dedup.filter(list(self._pools.get(key, ())))
+
+            step = max(1, settings.BATCH_SIZE)
+            for size in (min(step, missing - i) for i in range(0, missing, step)):
+                questions = dedup.filter(self._get_generator().generate_batch(question_type, topic, difficulty, size))
+                with self._lock:
+                    self._pools.setdefault(key, deque()).extend(questions)
+            with self._lock:
+                self.stats["refills"] += 1
+            self.logger.info("Refilled pool for %s; %s near-duplicates dropped.", key, dedup.rejected)
+
+        except Exception as e:
+            with self._lock:
+                self.stats["refill_failures"] += 1
+            self.logger.error("Failed to refill pool for %s: %s", key, e)
+
+        finally:
+            with self._lock:
+                self._refilling.discard(key)
+
+    def _maintain(self):
+        while not self._stop.wait(self.refill_interval):
+            for key in self.hot_keys():
+                self._maybe_refill(key)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._maintain, name="question-pool-maintainer", daemon=True)
+            self._thread.start()
+
+    def shutdown(self):
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_question_pool = None
+_question_pool_lock = threading.Lock()
+
+
+def get_question_pool() -> QuestionPool:
+    """Process-wide pool, started on first use."""
+    global _question_pool
+    with _question_pool_lock:
+        if _question_pool is None:
+            _question_pool = QuestionPool()
+            _question_pool.start()
+        return _question_pool
@@ -0,0 +1,132 @@
+import threading
+from langchain_core.output_parsers import PydanticOutputParser
+from src.models import question_schemas
+from src.models.question_schemas import (
+    MCQQuestion,
+    FillBlankQuestion,
+    TrueFalseQuestion,
+    ShortAnswerQuestion,
+    DescriptiveQuestion,
+    OrderingQuestion,
+    MultiSelectQuestion,
+    NumericalQuestion,
+)
+from src.prompts import templates
+from src.config.settings import settings
+from src.common.logger import get_logger
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - falls back to a chars/4 estimate
+    tiktoken = None
+
+PROMPT_STYLES = ("verbose", "compact")
+
+# Question type -> (schema, single prompt, batch prompt).
+PROMPT_SOURCES = {
+    "mcq": (MCQQuestion, templates.mcq_prompt_template, templates.mcq_batch_prompt_template),
+    "fill_blank": (FillBlankQuestion, templates.fill_blank_prompt_template, templates.fill_blank_batch_prompt_template),
+    "true_false": (TrueFalseQuestion, templates.true_false_prompt_template, templates.true_false_batch_prompt_template),
+    "short_answer": (ShortAnswerQuestion, templates.short_answer_prompt_template, templates.short_answer_batch_prompt_template),
+    "descriptive": (DescriptiveQuestion, templates.descriptive_prompt_template, templates.descriptive_batch_prompt_template),
+    "ordering": (OrderingQuestion, templates.ordering_prompt_template, templates.ordering_batch_prompt_template),
+    "multi_select": (MultiSelectQuestion, templates.multi_select_prompt_template, templates.multi_select_batch_prompt_template),
+    "numerical": (NumericalQuestion, templates.numerical_prompt_template, templates.numerical_batch_prompt_template),
+}
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Token count with the o200k tokenizer when tiktoken is installed, else a chars/4 estimate."""
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding("o200k_base")
+        return len(_encoding.encode(text))
+    return max(1, len(text) // 4)
+
+
+class PromptSpec:
+    """Everything needed to prompt for and parse one question type, built once.
+
+    Templates are kept as plain `str.format` strings so rendering a prompt is a
+    single format call instead of a PromptTemplate validation pass.
+    """
+
+    def __init__(self, question_type: str, schema, single_template, batch_template):
+        self.question_type = question_type
+        self.schema = schema
+        self.batch_schema = getattr(question_schemas, f"{schema.__name__}Batch")
+        self.parser = PydanticOutputParser(pydantic_object=schema)
+
+        phrase, fields, rule = templates.compact_prompt_specs[question_type]
+        self.templates = {
+            "verbose": (single_template.template, batch_template.template),
+            "compact": (
+                templates.compact_single_template.format(phrase=phrase, fields=fields, rule=rule),
+                templates.compact_batch_template.format(phrase=phrase, fields=fields, rule=rule),
+            ),
+        }
+
+    def render(self, topic: str, difficulty: str, style: str = None) -> str:
+        return self.templates[style or settings.PROMPT_STYLE][0].format(topic=topic, difficulty=difficulty)
+
+    def render_batch(self, topic: str, difficulty: str, count: int, style: str = None) -> str:
+        return self.templates[style or settings.PROMPT_STYLE][1].format(topic=topic, difficulty=difficulty, count=count)
+
+    def token_counts(self) -> dict:
+        """Input tokens of each template variant, rendered with a short sample topic."""
+        return {
+            style: {
+                "single": count_tokens(self.render("photosynthesis", "medium", style)),
+                "batch": count_tokens(self.render_batch("photosynthesis", "medium", 5, style)),
+            }
+            for style in PROMPT_STYLES
+        }
+
+
+class PromptRegistry:
+    def __init__(self):
+        self.logger = get_logger(self.__class__.__name__)
+        self._specs = {
+            question_type: PromptSpec(question_type, schema, single, batch)
+            for question_type, (schema, single, batch) in PROMPT_SOURCES.items()
+        }
+        for question_type, counts in self.token_report().items():
+            self.logger.info(
+                "Prompt tokens for %s: verbose %s/%s, compact %s/%s (single/batch)",
+                question_type,
+                counts["verbose"]["single"], counts["verbose"]["batch"],
+                counts["compact"]["single"], counts["compact"]["batch"],
+            )
+
+    def get(self, question_type: str) -> PromptSpec:
+        if question_type not in self._specs:
+            raise ValueError(f"Unsupported question type: {question_type}")
+        return self._specs[question_type]
+
+    def token_report(self) -> dict:
+        return {question_type: spec.token_counts() for question_type, spec in self._specs.items()}
+
+
+_prompt_registry = None
+_prompt_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    global _prompt_registry
+    with _prompt_registry_lock:
+        if _prompt_registry is None:
+            _prompt_registry = PromptRegistry()
+        return _prompt_registry
+
+
+if __name__ == "__main__":
+    for question_type, counts in get_prompt_registry().token_report().items():
+        verbose, compact = counts["verbose"], counts["compact"]
+        saved = 1 - compact["single"] / verbose["single"]
+        print(
+            f"{question_type:<13} verbose {verbose['single']:>4}/{verbose['batch']:<4} "
+            f"compact {compact['single']:>4}/{compact['batch']:<4} saves {saved:.0%}"
+        )
@@ -141,4 +141,193 @@ numerical_prompt_template = PromptTemplate(
         "Your response:"
     ),
     input_variables=["topic", "difficulty"]
-)
\ No newline at end of file
+)
+
+mcq_batch_prompt_template = PromptTemplate(
+    template=(
+        "Generate {count} distinct {difficulty} multiple-choice questions about {topic}.\n\n"
+        "Return ONLY a JSON array of {count} objects, each with the following exact fields:\n"
+        "- 'question': A clear, specific question.\n"
+        "- 'options': An array of exactly 4 possible answers.\n"
+        "- 'correct_answer': The correct answer selected from the options.\n\n"
+        "Example format:\n"
+        '[\n'
+        '    {{"question": "What is the capital of France?", "options": ["London", "Berlin", "Paris", "Madrid"], "correct_answer": "Paris"}}\n'
+        ']\n\n'
+        "Your response:"
+    ),
+    input_variables=["topic", "difficulty", "count"]
+)
+
+
+fill_blank_batch_prompt_template = PromptTemplate(
+    template=(
+        "Generate {count} distinct {difficulty} fill-in-the-blank questions about {topic}.\n\n"
+        "Return ONLY a JSON array of {count} objects, each with the following fields:\n"
+        "- 'question': A sentence containing '_____' where the blank should appear.\n"
+        "- 'answer': The correct word or phrase that completes the blank.\n\n"
+        "Example format:\n"
+        '[\n'
+        '    {{"question": "The capital of France is _____.", "answer": "Paris"}}\n'
+        ']\n\n'
+        "Your response:"
+    ),
+    input_variables=["topic", "difficulty", "count"]
+)
+
+
+true_false_batch_prompt_template = PromptTemplate(
+    template=(
+        "Generate {count} distinct {difficulty} true-or-false questions about {topic}.\n\n"
+        "Return ONLY a JSON array of {count} objects, each with these fields:\n"
+        "- 'question': A factual statement.\n"
+        "- 'answer': Either true or false.\n\n"
+        "Example format:\n"
+        '[\n'
+        '    {{"question": "The sun rises in the west.", "answer": false}}\n'
+        ']\n\n'
+        "Your response:"
+    ),
+    input_variables=["topic", "difficulty", "count"]
+)
+
+
+short_answer_batch_prompt_template = PromptTemplate(
+    template=(
+        "Generate {count} distinct {difficulty} short-answer questions about {topic}.\n\n"
+        "Return ONLY a JSON array of {count} objects, each with these fields:\n"
+        "- 'question': A concise question requiring a short written response.\n"
+        "- 'expected_keywords': A list of important keywords expected in a correct answer.\n\n"
+        "Example format:\n"
+        '[\n'
+        '    {{"question": "Explain why the sky appears blue.", "expected_keywords": ["Rayleigh scattering", "shorter wavelengths", "atmosphere"]}}\n'
+        ']\n\n'
+        "Your response:"
+    ),
+    input_variables=["topic", "difficulty", "count"]
+)
+
+
+descriptive_batch_prompt_template = PromptTemplate(
+    template=(
+        "Generate {count} distinct {difficulty} descriptive questions about {topic}.\n\n"
+        "Return ONLY a JSON array of {count} objects, each with these fields:\n"
+        "- 'question': A detailed question requiring a long, descriptive response.\n"
+        "- 'rubric': A short guideline describing how the answer will be evaluated.\n\n"
+        "Example format:\n"
+        '[\n'
+        '    {{"question": "Discuss the impact of climate change on marine ecosystems.", "rubric": "Evaluate based on clarity, depth of explanation, and use of examples."}}\n'
+        ']\n\n'
+        "Your response:"
+    ),
+    input_variables=["topic", "difficulty", "count"]
+)
+
+
+ordering_batch_prompt_template = PromptTemplate(
+    template=(
+        "Generate {count} distinct {difficulty} ordering questions about {topic}.\n\n"
+        "Return ONLY a JSON array of {count} objects, each with these fields:\n"
+        "- 'question': A prompt asking to arrange items in the correct order.\n"
+        "- 'items': A list of items to arrange.\n"
+        "- 'correct_order': The correct ordered list.\n\n"
+        "Example format:\n"
+        '[\n'
+        '    {{"question": "Arrange the planets in order from closest to farthest from the sun.", "items": ["Earth", "Mars", "Mercury", "Venus"], "correct_order": ["Mercury", "Venus", "Earth", "Mars"]}}\n'
+        ']\n\n'
+        "Your response:"
+    ),
+    input_variables=["topic", "difficulty", "count"]
+)
+
+
+multi_select_batch_prompt_template = PromptTemplate(
+    template=(
+        "Generate {count} distinct {difficulty} multi-select questions about {topic}.\n\n"
+        "Return ONLY a JSON array of {count} objects, each with these fields:\n"
+        "- 'question': A question that may have multiple correct answers.\n"
+        "- 'options': A list of possible answers.\n"
+        "- 'correct_answers': A list of all correct options.\n\n"
+        "Example format:\n"
+        '[\n'
+        '    {{"question": "Which of the following are programming languages?", "options": ["Python", "HTML", "C++", "JSON"], "correct_answers": ["Python", "C++"]}}\n'
+        ']\n\n'
+        "Your response:"
+    ),
+    input_variables=["topic", "difficulty", "count"]
+)
+
+
+numerical_batch_prompt_template = PromptTemplate(
+    template=(
+        "Generate {count} distinct {difficulty} numerical questions about {topic}.\n\n"
+        "Return ONLY a JSON array of {count} objects, each with these fields:\n"
+        "- 'question': A question requiring a numeric answer.\n"
+        "- 'correct_value': The correct numeric value.\n"
+        "- 'tolerance': Acceptable margin of error for the numeric answer.\n\n"
+        "Example format:\n"
+        '[\n'
+        '    {{"question": "What is the square root of 81?", "correct_value": 9.0, "tolerance": 0.0}}\n'
+        ']\n\n'
+        "Your response:"
+    ),
+    input_variables=["topic", "difficulty", "count"]
+)
+
+
+# Token-lean variants (settings.PROMPT_STYLE = "compact"): question type ->
+# (phrase used in the request, JSON shape of one question, extra constraint).
+compact_prompt_specs = {
+    "mcq": (
+        "multiple-choice",
+        '{{"question": str, "options": [4 str], "correct_answer": str}}',
+        "correct_answer must be one of options.",
+    ),
+    "fill_blank": (
+        "fill-in-the-blank",
+        '{{"question": str, "answer": str}}',
+        "question must contain '_____' where the answer goes.",
+    ),
+    "true_false": (
+        "true-or-false",
+        '{{"question": str, "answer": bool}}',
+        "question is a factual statement.",
+    ),
+    "short_answer": (
+        "short-answer",
+        '{{"question": str, "expected_keywords": [str]}}',
+        "expected_keywords must not be empty.",
+    ),
+    "descriptive": (
+        "descriptive",
+        '{{"question": str, "rubric": str}}',
+        "rubric says how the answer is graded.",
+    ),
+    "ordering": (
+        "ordering",
+        '{{"question": str, "items": [str], "correct_order": [str]}}',
+        "correct_order is items in the right order.",
+    ),
+    "multi_select": (
+        "multi-select",
+        '{{"question": str, "options": [str], "correct_answers": [str]}}',
+        "correct_answers are taken from options.",
+    ),
+    "numerical": (
+        "numerical",
+        '{{"question": str, "correct_value": number, "tolerance": number}}',
+        "correct_value is a plain number.",
+    ),
+}
+
+compact_single_template = (
+    "Generate a {{difficulty}} {phrase} question about {{topic}}.\n"
+    "Reply with only this JSON object: {fields}\n"
+    "{rule}"
+)
+
+compact_batch_template = (
+    "Generate {{count}} distinct {{difficulty}} {phrase} questions about {{topic}}.\n"
+    "Reply with only a JSON array of {{count}} objects: {fields}\n"
+    "{rule}"
+)
@@ -0,0 +1,316 @@
+import io
+import os
+import sys
+import csv
+import json
+import time
+import queue
+import atexit
+import sqlite3
+import argparse
+import itertools
+import threading
+from uuid import uuid4
+from datetime import datetime
+from src.cache.question_cache import normalize_topic
+from src.config.settings import settings
+from src.common.logger import get_logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - compaction is skipped without pyarrow
+    pa = pq = None
+
+COLUMNS = (
+    "quiz_id", "session_id", "created_at", "topic", "question_type", "difficulty",
+    "question_number", "question", "user_answer", "correct_answer", "is_correct", "score",
+)
+_STOP = object()
+
+
+def _text(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _timestamp(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return value.timestamp()
+
+
+class ResultsStore:
+    """Append-only store of graded quiz answers.
+
+    `record_quiz` only enqueues rows; a writer thread inserts them into SQLite
+    in batches. With pyarrow installed, rows older than `compact_after` are
+    periodically moved into Parquet segments, which `query` reads transparently.
+    """
+
+    def __init__(self, db_path: str = None, batch_size: int = None, flush_interval: float = None,
+                 parquet_dir: str = None, compact_after: float = None, compact_min_rows: int = None,
+                 compact_interval: float = None):
+        self.db_path = db_path or settings.RESULTS_DB_PATH
+        self.batch_size = batch_size or settings.RESULTS_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.RESULTS_FLUSH_INTERVAL
+        self.parquet_dir = parquet_dir or settings.RESULTS_PARQUET_DIR
+        self.compact_after = settings.RESULTS_COMPACT_AFTER if compact_after is None else compact_after
+        self.compact_min_rows = settings.RESULTS_COMPACT_MIN_ROWS if compact_min_rows is None else compact_min_rows
+        self.compact_interval = compact_interval or settings.RESULTS_COMPACT_INTERVAL
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._last_compaction = time.monotonic()
+        self.stats = {"quizzes": 0, "rows": 0, "batches": 0, "segments": 0, "write_failures": 0}
+
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quiz_results ("
+            "id INTEGER PRIMARY KEY, quiz_id TEXT NOT NULL, session_id TEXT, created_at REAL NOT NULL, "
+            "topic TEXT, question_type TEXT, difficulty TEXT, question_number INTEGER, question TEXT, "
+            "user_answer TEXT, correct_answer TEXT, is_correct INTEGER, score REAL)"
+        )
+        if "score" not in {row[1] for row in self._conn.execute("PRAGMA table_info(quiz_results)")}:
+            self._conn.execute("ALTER TABLE quiz_results ADD COLUMN score REAL")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_quiz_results_created ON quiz_results (created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_quiz_results_topic ON quiz_results (topic, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_quiz_results_type ON quiz_results (question_type, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_quiz_results_quiz ON quiz_results (quiz_id)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS result_segments ("
+            "path TEXT PRIMARY KEY, min_created_at REAL NOT NULL, max_created_at REAL NOT NULL, rows INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+        self._thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self._thread.start()
+
+    def record_quiz(self, results: list, topic: str = None, question_type: str = None,
+                    difficulty: str = None, session_id: str = None) -> str:
+        """Queue one graded quiz for writing and return its id."""
+        quiz_id, now = uuid4().hex, time.time()
+        topic = normalize_topic(topic) if topic else None
+        difficulty = str(difficulty).strip().lower() if difficulty else None
+        rows = [
+            (
+                quiz_id, session_id, now, topic, question_type or r.get("question_type"), difficulty,
+                r.get("question_number"), r.get("question"), _text(r.get("user_answer")),
+                _text(r.get("correct_answer")), None if r.get("is_correct") is None else int(bool(r["is_correct"])),
+                r.get("score"),
+            )
+            for r in results
+        ]
+        if rows:
+            self._queue.put(rows)
+        return quiz_id
+
+    def flush(self):
+        """Block until every queued quiz has been written."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._maybe_compact()
+                continue
+
+            items = [first]
+            rows = 0 if first is _STOP else len(first)
+            while rows < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                items.append(item)
+                rows += 0 if item is _STOP else len(item)
+
+            batches = [item for item in items if item is not _STOP]
+            try:
+                if batches:
+                    self._write(batches)
+            except Exception as e:
+                self.stats["write_failures"] += 1
+                self.logger.error("Failed to write %s quiz results: %s", len(batches), e)
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            if len(batches) < len(items):
+                return
+            # under steady load the queue never idles, so check here as well
+            self._maybe_compact()
+
+    def _write(self, batches):
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT INTO quiz_results ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                itertools.chain.from_iterable(batches),
+            )
+            self._conn.commit()
+            self.stats["quizzes"] += len(batches)
+            self.stats["rows"] += sum(len(rows) for rows in batches)
+            self.stats["batches"] += 1
+
+    def _maybe_compact(self):
+        if pq is None or not settings.RESULTS_PARQUET_ENABLED:
+            return
+        if time.monotonic() - self._last_compaction < self.compact_interval:
+            return
+        self._last_compaction = time.monotonic()
+        try:
+            self.compact()
+        except Exception as e:
+            self.logger.error("Results compaction failed: %s", e)
+
+    def compact(self, older_than: float = None) -> int:
+        """Move rows older than `older_than` seconds into one Parquet segment; returns rows moved."""
+        if pq is None:
+            self.logger.warning("pyarrow is not installed; results stay in SQLite.")
+            return 0
+        cutoff = time.time() - (self.compact_after if older_than is None else older_than)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, {', '.join(COLUMNS)} FROM quiz_results WHERE created_at < ? ORDER BY created_at, id",
+                (cutoff,),
+            ).fetchall()
+            if len(rows) < max(1, self.compact_min_rows):
+                return 0
+
+            ids, *columns = zip(*rows)
+            table = pa.table({name: list(values) for name, values in zip(COLUMNS, columns)})
+            first, last = columns[COLUMNS.index("created_at")][0], columns[COLUMNS.index("created_at")][-1]
+            os.makedirs(self.parquet_dir, exist_ok=True)
+            path = os.path.join(self.parquet_dir, f"results_{int(first)}_{int(last)}_{uuid4().hex[:8]}.parquet")
+            pq.write_table(table, path, compression="zstd")
+
+            self._conn.execute(
+                "INSERT INTO result_segments (path, min_created_at, max_created_at, rows) VALUES (?, ?, ?, ?)",
+                (path, first, last, len(rows)),
+            )
+            self._conn.executemany("DELETE FROM quiz_results WHERE id = ?", ((i,) for i in ids))
+            self._conn.commit()
+            self.stats["segments"] += 1
+        self.logger.info("Compacted %s result rows into %s", len(rows), path)
+        return len(rows)
+
+    @staticmethod
+    def _filters(topic, question_type, quiz_id, since, until):
+        filters = []
+        if topic is not None:
+            filters.append(("topic", "=", normalize_topic(topic)))
+        if question_type is not None:
+            filters.append(("question_type", "=", question_type))
+        if quiz_id is not None:
+            filters.append(("quiz_id", "=", quiz_id))
+        if since is not None:
+            filters.append(("created_at", ">=", _timestamp(since)))
+        if until is not None:
+            filters.append(("created_at", "<", _timestamp(until)))
+        return filters
+
+    def _segment_rows(self, conn, filters, since, until):
+        if pq is None:
+            return
+        segments = conn.execute(
+            "SELECT path FROM result_segments WHERE max_created_at >= ? AND min_created_at < ? ORDER BY min_created_at",
+            (_timestamp(since) or 0.0, _timestamp(until) or float("inf")),
+        ).fetchall()
+        for (path,) in segments:
+            # segments written before a column was added simply lack it
+            present = [name for name in COLUMNS if name in pq.read_schema(path).names]
+            for row in pq.read_table(path, columns=present, filters=filters or None).to_pylist():
+                yield {name: row.get(name) for name in COLUMNS}
+
+    def query(self, topic: str = None, question_type: str = None, since=None, until=None,
+              quiz_id: str = None, limit: int = None):
+        """Yield result rows as dicts, oldest first. `since`/`until` take epoch seconds or datetimes."""
+        self.flush()
+        filters = self._filters(topic, question_type, quiz_id, since, until)
+        where = " AND ".join(f"{name} {op} ?" for name, op, _ in filters) or "1 = 1"
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = itertools.chain(
+                self._segment_rows(conn, filters, since, until),
+                (
+                    dict(zip(COLUMNS, row))
+                    for row in conn.execute(
+                        f"SELECT {', '.join(COLUMNS)} FROM quiz_results WHERE {where} ORDER BY created_at, id",
+                        [value for _, _, value in filters],
+                    )
+                ),
+            )
+            yield from itertools.islice(rows, limit)
+        finally:
+            conn.close()
+
+    def iter_csv(self, chunk_rows: int = 500, **filters):
+        """Stream matching rows as CSV text chunks."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(COLUMNS)
+        for i, row in enumerate(self.query(**filters), start=1):
+            row["created_at"] = datetime.fromtimestamp(row["created_at"]).isoformat(timespec="seconds")
+            row["is_correct"] = "" if row["is_correct"] is None else bool(row["is_correct"])
+            writer.writerow(row[name] for name in COLUMNS)
+            if i % chunk_rows == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    def export_csv(self, **filters) -> str:
+        return "".join(self.iter_csv(**filters))
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._thread.join(timeout=10)
+        with self._lock:
+            self._conn.close()
+
+
+_results_store = None
+_results_store_lock = threading.Lock()
+
+
+def get_results_store() -> ResultsStore:
+    global _results_store
+    with _results_store_lock:
+        if _results_store is None:
+            _results_store = ResultsStore()
+            atexit.register(_results_store.close)
+        return _results_store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or compact stored quiz results.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="Write matching results as CSV to stdout.")
+    export.add_argument("--topic")
+    export.add_argument("--question-type")
+    export.add_argument("--since", type=datetime.fromisoformat)
+    export.add_argument("--until", type=datetime.fromisoformat)
+    compact = sub.add_parser("compact", help="Move old rows into a Parquet segment.")
+    compact.add_argument("--older-than-days", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    store = get_results_store()
+    if args.command == "export":
+        for chunk in store.iter_csv(topic=args.topic, question_type=args.question_type, since=args.since, until=args.until):
+            sys.stdout.write(chunk)
+    else:
+        older_than = None if args.older_than_days is None else args.older_than_days * 24 * 3600
+        print(f"Compacted {store.compact(older_than)} rows.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
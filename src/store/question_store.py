@@ -0,0 +1,181 @@
+import sys
+import json
+import hashlib
+import itertools
+import threading
+from collections import OrderedDict
+from src.config.settings import settings
+from src.common.logger import get_logger
+
+FIELDS = ("type", "question", "options", "correct_answer", "expected_keywords", "rubric", "items", "correct_order")
+_FIELD_SET = frozenset(FIELDS)
+
+
+def _compact(value):
+    """Intern strings and freeze lists so equal options share one object across records."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_compact(v) for v in value)
+    return value
+
+
+class QuestionRecord:
+    """Immutable quiz question.
+
+    Reads like the question dicts it replaces (`q['options']`, `q.get('rubric')`),
+    so the UI and the grading engine take either.
+    """
+
+    __slots__ = ("id",) + FIELDS
+
+    def __init__(self, id: str, fields: dict):
+        object.__setattr__(self, "id", id)
+        for name in FIELDS:
+            object.__setattr__(self, name, _compact(fields.get(name)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("QuestionRecord is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("QuestionRecord is immutable")
+
+    def __getitem__(self, key):
+        value = getattr(self, key) if key in _FIELD_SET else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return key in _FIELD_SET and getattr(self, key) is not None
+
+    def get(self, key, default=None):
+        value = getattr(self, key) if key in _FIELD_SET else None
+        return default if value is None else value
+
+    def keys(self):
+        return [name for name in FIELDS if getattr(self, name) is not None]
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.keys()}
+
+    def __repr__(self):
+        return f"QuestionRecord({self.id!r}, {self.type!r}, {self.question!r})"
+
+
+def record_id(fields: dict) -> str:
+    raw = json.dumps([fields.get(name) for name in FIELDS], default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class QuestionStore:
+    """Process-wide, content-addressed store of quiz questions shared by all sessions.
+
+    Sessions hold record ids and take a reference on them; identical questions
+    (pool and cache hits, repeated topics) are stored once. Once the store holds
+    more than `max_records`, the least recently used unreferenced records are
+    evicted. Referenced records are never evicted.
+    """
+
+    def __init__(self, max_records: int = None):
+        self.max_records = max_records or settings.QUESTION_STORE_MAX_RECORDS
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._records = OrderedDict()
+        self._refs = {}
+        self.stats = {"added": 0, "shared": 0, "evictions": 0}
+
+    def add_many(self, questions) -> list:
+        """Store question dicts (or records), take a reference on each and return their ids.
+
+        An identical question already in the store is shared rather than copied.
+        """
+        records = [
+            q if isinstance(q, QuestionRecord) else QuestionRecord(record_id(q), q)
+            for q in questions
+        ]
+        with self._lock:
+            for record in records:
+                if record.id in self._records:
+                    self._records.move_to_end(record.id)
+                    self.stats["shared"] += 1
+                else:
+                    self._records[record.id] = record
+                    self.stats["added"] += 1
+                self._refs[record.id] = self._refs.get(record.id, 0) + 1
+            self._evict()
+        return [record.id for record in records]
+
+    def add(self, question) -> str:
+        return self.add_many([question])[0]
+
+    def release(self, ids):
+        with self._lock:
+            for key in ids:
+                count = self._refs.get(key, 0) - 1
+                if count > 0:
+                    self._refs[key] = count
+                else:
+                    self._refs.pop(key, None)
+            self._evict()
+
+    def get(self, key: str) -> QuestionRecord:
+        with self._lock:
+            return self._records[key]
+
+    def get_many(self, ids) -> list:
+        with self._lock:
+            records = self._records
+            return [records[key] for key in ids]
+
+    def _evict(self):
+        """Drop LRU unreferenced records above `max_records`. Caller holds the lock."""
+        excess = len(self._records) - self.max_records
+        if excess <= 0:
+            return
+        victims = list(itertools.islice((key for key in self._records if key not in self._refs), excess))
+        for key in victims:
+            del self._records[key]
+        self.stats["evictions"] += len(victims)
+
+    def memory_report(self) -> dict:
+        """Approximate bytes held by the records, counting shared (interned) objects once."""
+        with self._lock:
+            records = list(self._records.values())
+            referenced = len(self._refs)
+            references = sum(self._refs.values())
+
+        seen, total = set(), 0
+        stack = list(records)
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen or obj is None:
+                continue
+            seen.add(id(obj))
+            total += sys.getsizeof(obj)
+            if isinstance(obj, QuestionRecord):
+                stack.extend(getattr(obj, name) for name in QuestionRecord.__slots__)
+            elif isinstance(obj, tuple):
+                stack.extend(obj)
+
+        return {
+            "records": len(records),
+            "referenced": referenced,
+            "references": references,
+            "bytes": total,
+            "bytes_per_record": round(total / len(records), 1) if records else 0.0,
+            **self.stats,
+        }
+
+
+_question_store = None
+_question_store_lock = threading.Lock()
+
+
+def get_question_store() -> QuestionStore:
+    global _question_store
+    with _question_store_lock:
+        if _question_store is None:
+            _question_store = QuestionStore()
+        return _question_store
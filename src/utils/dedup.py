@@ -0,0 +1,100 @@
+import re
+import hashlib
+from src.config.settings import settings
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_PRIME = (1 << 61) - 1
+_STOPWORDS = frozenset(
+    "a an the of in on at to for from by with and or but is are was were be been being "
+    "what which who whom whose when where why how does do did can could would should will "
+    "this that these those it its as into about than then there their they them following "
+    "one".split()
+)
+
+
+def content_tokens(text: str) -> set:
+    """Lower-cased content words of a question stem, with plural 's' stripped."""
+    tokens = set()
+    for token in _TOKEN_RE.findall(str(text).lower()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.add(token)
+    return tokens
+
+
+def _permutations(num_perm: int):
+    """Deterministic (a, b) pairs for the universal hashes h(x) = (a * x + b) mod p."""
+    perms = []
+    for i in range(num_perm):
+        seed = hashlib.blake2b(f"smartlearn-minhash-{i}".encode("utf-8"), digest_size=16).digest()
+        perms.append((int.from_bytes(seed[:8], "big") % _PRIME | 1, int.from_bytes(seed[8:], "big") % _PRIME))
+    return perms
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = None):
+        self.num_perm = num_perm or settings.DEDUP_NUM_PERM
+        self._perms = _permutations(self.num_perm)
+
+    def signature(self, tokens: set) -> tuple:
+        if not tokens:
+            return (0,) * self.num_perm
+        hashes = [int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "big") for t in tokens]
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms)
+
+    @staticmethod
+    def similarity(sig_a: tuple, sig_b: tuple) -> float:
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class QuestionDeduplicator:
+    """Rejects questions whose stem is a near-duplicate (MinHash Jaccard) of one already accepted."""
+
+    _hasher = None
+
+    def __init__(self, threshold: float = None):
+        self.threshold = settings.DEDUP_SIMILARITY if threshold is None else threshold
+        if QuestionDeduplicator._hasher is None:
+            QuestionDeduplicator._hasher = MinHasher()
+        self._exact = set()
+        self._signatures = []
+        self.stems = []
+        self.rejected = 0
+
+    def _fingerprint(self, text):
+        tokens = content_tokens(text)
+        return frozenset(tokens), self._hasher.signature(tokens)
+
+    def _seen(self, tokens, signature):
+        if tokens in self._exact:
+            return True
+        return any(self._hasher.similarity(signature, seen) >= self.threshold for seen in self._signatures)
+
+    def is_duplicate(self, text: str) -> bool:
+        return self._seen(*self._fingerprint(text))
+
+    def add(self, text: str) -> bool:
+        """Record `text` and return True, or return False if it duplicates an earlier stem."""
+        tokens, signature = self._fingerprint(text)
+        if self._seen(tokens, signature):
+            self.rejected += 1
+            return False
+        self._exact.add(tokens)
+        self._signatures.append(signature)
+        self.stems.append(str(text))
+        return True
+
+    def filter(self, questions: list) -> list:
+        """Keep the questions (objects with a `question` attribute) that are not near-duplicates."""
+        return [q for q in questions if self.add(q.question)]
+
+
+def exclusion_hint(stems: list) -> str:
+    """Prompt suffix asking the LLM to avoid questions that are already in the quiz."""
+    if not stems:
+        return ""
+    recent = stems[-settings.DEDUP_HINT_MAX_STEMS:]
+    lines = "\n".join(f"- {stem[:150]}" for stem in recent)
+    return f"\n\nDo NOT repeat or paraphrase any of these existing questions:\n{lines}\n"
@@ -1,271 +1,264 @@
-import os
-import re
-import nltk
+import weakref
+import itertools
 import streamlit as st
-import pandas as pd
-from datetime import datetime
-from nltk.corpus import stopwords
-from src.generator.question_generator import QuestionGenerator
-
-nltk.download('stopwords', quiet=True)
+from uuid import uuid4
+from typing import TYPE_CHECKING
+from src.utils.dedup import QuestionDeduplicator
+from src.utils.questions import QUESTION_BUILDERS, BUILDERS_BY_METHOD, acollect_questions, take_pooled
+from src.grading.engine import get_grading_engine
+from src.store.question_store import get_question_store
+from src.config.settings import settings
+from src.common.logger import log_context
+from src.metrics.registry import QUIZ_SECONDS, QUESTIONS_GRADED
+
+# pandas and the LangChain stack are imported on first use to keep cold starts fast.
+if TYPE_CHECKING:
+    from src.generator.question_generator import QuestionGenerator
 
 def rerun():
     """Force Streamlit rerun by toggling a trigger flag."""
     st.session_state['rerun_trigger'] = not st.session_state.get('rerun_trigger', False)
 
 
-class QuizManager:
-    def __init__(self):
-        self.questions = []
-        self.results = []
+def _session_id():
+    """Streamlit session of the current script run, or None outside Streamlit."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
 
-    def generate_questions(self, generator: QuestionGenerator, topic: str, question_type: str, difficulty: str, num_questions: int):
-        """Generate quiz questions of the selected type and difficulty."""
-        self.questions = []
-        self.results = []
 
-        try:
-            for _ in range(num_questions):
-                qt = question_type.lower()
-
-                if qt == "multiple choice":
-                    q = generator.generate_mcq(topic, difficulty)
-                    self.questions.append({
-                        'type': 'MCQ',
-                        'question': q.question,
-                        'options': q.options,
-                        'correct_answer': q.correct_answer
-                    })
-
-                elif qt == "fill in the blank":
-                    q = generator.generate_fill_blank(topic, difficulty)
-                    self.questions.append({
-                        'type': 'Fill in the blank',
-                        'question': q.question,
-                        'correct_answer': q.answer
-                    })
-
-                elif qt == "true/false":
-                    q = generator.generate_true_false(topic, difficulty)
-                    self.questions.append({
-                        'type': 'True/False',
-                        'question': q.question,
-                        'correct_answer': q.answer
-                    })
-
-                elif qt == "short answer":
-                    q = generator.generate_short_answer(topic, difficulty)
-                    self.questions.append({
-                        'type': 'Short Answer',
-                        'question': q.question,
-                        'expected_keywords': q.expected_keywords
-                    })
-
-                elif qt == "descriptive":
-                    q = generator.generate_descriptive(topic, difficulty)
-                    self.questions.append({
-                        'type': 'Descriptive',
-                        'question': q.question,
-                        'rubric': q.rubric
-                    })
-
-                elif qt == "ordering":
-                    q = generator.generate_ordering(topic, difficulty)
-                    self.questions.append({
-                        'type': 'Ordering',
-                        'question': q.question,
-                        'items': q.items,
-                        'correct_order': q.correct_order
-                    })
-
-                elif qt == "multi-select":
-                    q = generator.generate_multi_select(topic, difficulty)
-                    self.questions.append({
-                        'type': 'Multi-Select',
-                        'question': q.question,
-                        'options': q.options,
-                        'correct_answer': q.correct_answers
-                    })
-
-                elif qt == "numerical":
-                    q = generator.generate_numerical(topic, difficulty)
-                    self.questions.append({
-                        'type': 'Numerical',
-                        'question': q.question,
-                        'correct_answer': q.correct_value
-                    })
-
-                else:
-                    st.warning(f"Unsupported question type: {question_type}")
+def render_question(i: int, q):
+    """Render question `i` and its answer widget, keyed `user_answer_{i}`."""
+    st.markdown(f"**Question {i + 1}: {q.get('question', q.get('prompt', ''))}**")
 
-        except Exception as e:
-            st.error(f"Error generating questions: {e}")
-            return False
+    qtype = q['type']
+    key = f"user_answer_{i}"
+    prev_value = st.session_state.get(key, None)
 
-        return True
+    if qtype == 'MCQ':
+        ans = st.radio(
+            "",
+            q['options'],
+            key=key,
+            index=q['options'].index(prev_value) if prev_value in q['options'] else 0
+        )
 
-    def attempt_quiz(self):
-        """Display quiz questions and record user answers persistently using session_state."""
-        for i, q in enumerate(self.questions):
-            st.markdown(f"**Question {i + 1}: {q.get('question', q.get('prompt', ''))}**")
-
-            qtype = q['type']
-            key = f"user_answer_{i}"
-            prev_value = st.session_state.get(key, None)
-
-            if qtype == 'MCQ':
-                ans = st.radio(
-                    "",
-                    q['options'],
-                    key=key,
-                    index=q['options'].index(prev_value) if prev_value in q['options'] else 0
-                )
+    elif qtype == 'Fill in the blank':
+        ans = st.text_input("", key=key, value=prev_value or "")
 
-            elif qtype == 'Fill in the blank':
-                ans = st.text_input("", key=key, value=prev_value or "")
+    elif qtype == 'True/False':
+        ans = st.radio(
+            "",
+            ["True", "False"],
+            key=key,
+            index=["True", "False"].index(prev_value) if prev_value in ["True", "False"] else 0
+        )
 
-            elif qtype == 'True/False':
-                ans = st.radio(
-                    "",
-                    ["True", "False"],
-                    key=key,
-                    index=["True", "False"].index(prev_value) if prev_value in ["True", "False"] else 0
-                )
+    elif qtype == 'Short Answer':
+        ans = st.text_area("Write your answer:", key=key, value=prev_value or "")
 
-            elif qtype == 'Short Answer':
-                ans = st.text_area("Write your answer:", key=key, value=prev_value or "")
+    elif qtype == "Descriptive":
+        ans = st.text_area("Write a detailed answer:", key=key, value=prev_value or "")
 
-            elif qtype == "Descriptive":
-                ans = st.text_area("Write a detailed answer:", key=key, value=prev_value or "")
+    elif qtype == 'Ordering':
+        st.write("Arrange these items in the correct order:")
+        st.write(q['items'])
+        ans = st.text_input("Enter your order (comma-separated):", key=key, value=prev_value or "")
 
-            elif qtype == 'Ordering':
-                st.write("Arrange these items in the correct order:")
-                st.write(q['items'])
-                ans = st.text_input("Enter your order (comma-separated):", key=key, value=prev_value or "")
+    elif qtype == 'Multi-Select':
+        valid_defaults = [v for v in (prev_value or []) if v in q['options']]
+        ans = st.multiselect(
+            "Select all correct answers:",
+            q['options'],
+            key=key,
+            default=valid_defaults
+        )
 
-            elif qtype == 'Multi-Select':
-                valid_defaults = [v for v in (prev_value or []) if v in q['options']]
-                ans = st.multiselect(
-                    "Select all correct answers:",
-                    q['options'],
-                    key=key,
-                    default=valid_defaults
-                )
+    elif qtype == 'Numerical':
+        ans = st.number_input(
+            "Enter your numerical answer:",
+            key=key,
+            value=prev_value if isinstance(prev_value, (int, float)) else 0.0,
+            format="%f"
+        )
 
-            elif qtype == 'Numerical':
-                ans = st.number_input(
-                    "Enter your numerical answer:",
-                    key=key,
-                    value=prev_value if isinstance(prev_value, (int, float)) else 0.0,
-                    format="%f"
-                )
+    else:
+        ans = ""
 
-            else:
-                ans = ""
 
-    def evaluate_quiz(self):
-        """Evaluate user answers stored in session_state."""
-        self.results = []
+# a fragment reruns alone when one of its widgets changes
+_question_fragment = st.fragment(render_question)
 
-        for i, q in enumerate(self.questions):
-            qtype = q['type']
-            ans = st.session_state.get(f"user_answer_{i}", "")
-            result = {
-                'question_number': i + 1,
-                'question_type': qtype,
+
+class QuizManager:
+    """Per-session quiz state: ids into the shared question store plus compact grading results."""
+
+    def __init__(self):
+        self.question_ids = []
+        self._graded = []
+        self.question_type = None
+        self.topic = None
+        self.difficulty = None
+        self._store = get_question_store()
+        # drop this session's references when Streamlit discards the session state
+        weakref.finalize(self, self._store.release, self.question_ids)
+
+    @property
+    def questions(self) -> list:
+        return self._store.get_many(self.question_ids)
+
+    @questions.setter
+    def questions(self, questions):
+        ids = self._store.add_many(questions)
+        self._store.release(self.question_ids)
+        self.question_ids[:] = ids
+        get_grading_engine().prepare(self.questions)
+
+    def adopt(self, other: "QuizManager"):
+        """Take over another manager's quiz (e.g. a finished background job) with our own store references."""
+        self.questions = other.questions
+        self._graded = []
+        self.question_type, self.topic, self.difficulty = other.question_type, other.topic, other.difficulty
+
+    def _append_question(self, question: dict):
+        question_id = self._store.add(question)
+        self.question_ids.append(question_id)
+        record = self._store.get(question_id)
+        get_grading_engine().prepare([record])
+        return record
+
+    @property
+    def results(self) -> list:
+        """Graded answers in the grading engine's result-dict shape."""
+        return [
+            {
+                'question_number': number,
+                'question_type': q['type'],
                 'question': q.get('question', q.get('prompt', '')),
-                'user_answer': ans,
-                'is_correct': False
+                'user_answer': answer,
+                'is_correct': is_correct,
+                'correct_answer': correct_answer,
+                'score': score,
             }
+            for (number, answer, correct_answer, is_correct, score), q in zip(self._graded, self.questions)
+        ]
 
-            def normalize(text):
-                return re.sub(r'[^\w\s]', '', str(text)).strip().lower()
-
-            if qtype == 'MCQ':
-                result['correct_answer'] = q['correct_answer']
-                result['is_correct'] = ans == q['correct_answer']
-
-            elif qtype == 'Fill in the blank':
-                result['correct_answer'] = q['correct_answer']
-                result['is_correct'] = normalize(ans) == normalize(q['correct_answer'])
-
-            elif qtype == 'True/False':
-                correct = str(q['correct_answer']).lower()
-                result['correct_answer'] = correct
-                result['is_correct'] = str(ans).lower() == correct
-
-            elif qtype == 'Short Answer':
-                keywords = [kw.lower().strip() for kw in q.get('expected_keywords', [])]
-                answer_text = str(ans).lower()
-                result['correct_answer'] = ", ".join(keywords)
-                match_count = sum(1 for kw in keywords if kw in answer_text)
-                threshold = max(1, int(len(keywords) * 0.3))
-                result['is_correct'] = match_count >= threshold
-
-            elif qtype == "Descriptive":
-                rubric = q.get("rubric", "")
-                if isinstance(rubric, (list, tuple)):
-                    rubric = " ".join(map(str, rubric))
-                result["correct_answer"] = rubric
-
-                stop_words = set(stopwords.words("english"))
-                text_source = f"{q.get('question', '')} {rubric}".lower()
-                keywords = {
-                    w for w in re.findall(r"\b[a-z]{4,}\b", text_source)
-                    if w not in stop_words
-                }
-
-                user_text = str(ans).lower()
-                matched = sum(1 for kw in keywords if kw in user_text)
-                threshold = max(2, int(len(keywords) * 0.25))
-                result["is_correct"] = matched >= threshold
-
-            elif qtype == "Ordering":
-                correct_order = [str(x).strip().lower() for x in q.get("correct_order", [])]
-                result["correct_answer"] = ", ".join(q.get("correct_order", []))
-                user_order = [x.strip().lower() for x in str(ans).split(",") if x.strip()]
-                result["is_correct"] = user_order == correct_order
-
-            elif qtype == 'Multi-Select':
-                correct_list = q.get('correct_answer', [])
-                correct = set(correct_list)
-                result['correct_answer'] = list(correct)
-                result['is_correct'] = set(ans) == correct
-
-            elif qtype == 'Numerical':
-                correct = float(q['correct_answer'])
-                try:
-                    user_ans = float(ans)
-                    result['is_correct'] = abs(user_ans - correct) < 0.001
-                except (ValueError, TypeError):
-                    result['is_correct'] = False
-                result['correct_answer'] = correct
-
-            else:
-                result['correct_answer'] = "Manual Review Needed"
-                result['is_correct'] = None
-
-            self.results.append(result)
+    def generate_questions(self, generator: "QuestionGenerator", topic: str, question_type: str, difficulty: str, num_questions: int, max_concurrency: int = None):
+        """Generate quiz questions of the selected type and difficulty."""
+        self.questions = []
+        self._graded = []
 
-    def generate_result_dataframe(self):
-        return pd.DataFrame(self.results) if self.results else pd.DataFrame()
+        qt = question_type.lower()
+        if qt not in QUESTION_BUILDERS:
+            st.warning(f"Unsupported question type: {question_type}")
+            return True
+
+        method, to_dict = QUESTION_BUILDERS[qt]
+        self.question_type, self.topic, self.difficulty = method, topic, difficulty
+
+        from src.llm.groq_client import run_async
+
+        with log_context(request_id=uuid4().hex, session_id=_session_id(), question_type=method), \
+                QUIZ_SECONDS.time(operation="generate", question_type=method):
+            try:
+                questions = run_async(
+                    acollect_questions(generator, method, topic, difficulty, num_questions, max_concurrency)
+                )
+                self.questions = [to_dict(q) for q in questions]
+                if len(self.question_ids) < num_questions:
+                    st.warning(f"Only {len(self.question_ids)} unique questions could be generated.")
+
+            except Exception as e:
+                st.error(f"Error generating questions: {e}")
+                return False
+
+            return True
 
-    def save_to_csv(self, filename_prefix="quiz_results"):
-        if not self.results:
+    def generate_questions_stream(self, generator: "QuestionGenerator", topic: str, question_type: str, difficulty: str, num_questions: int):
+        """Yield quiz questions one at a time as they become available, filling `self.questions` on the way."""
+        self.questions = []
+        self._graded = []
+
+        qt = question_type.lower()
+        if qt not in QUESTION_BUILDERS:
+            # raised rather than shown: background jobs run this outside the script thread
+            raise ValueError(f"Unsupported question type: {question_type}")
+
+        method, to_dict = QUESTION_BUILDERS[qt]
+        self.question_type, self.topic, self.difficulty = method, topic, difficulty
+        with log_context(request_id=uuid4().hex, session_id=_session_id(), question_type=method):
+            dedup = QuestionDeduplicator() if settings.DEDUP_ENABLED else None
+            pooled = take_pooled(method, topic, difficulty, num_questions)
+            missing = num_questions - len(pooled)
+            streamed = generator.stream_questions(method, topic, difficulty, missing) if missing > 0 else []
+
+            for q in itertools.chain(pooled, streamed):
+                if dedup is None or dedup.add(q.question):
+                    yield self._append_question(to_dict(q))
+
+            for _ in range(settings.DEDUP_MAX_ROUNDS if dedup else 0):
+                missing = num_questions - len(self.question_ids)
+                if missing <= 0:
+                    break
+                for q in dedup.filter(generator.generate_batch(method, topic, difficulty, missing, exclude=dedup.stems)):
+                    yield self._append_question(to_dict(q))
+
+    def attempt_quiz(self, mode: str = None):
+        """Display quiz questions and record user answers persistently using session_state.
+
+        In "form" mode the caller wraps this in `st.form`; in "fragment" mode each
+        question is its own fragment, so answering one does not rerun the page.
+        """
+        render = _question_fragment if (mode or settings.QUIZ_RENDER_MODE) == "fragment" else render_question
+        for i, q in enumerate(self.questions):
+            render(i, q)
+
+    def evaluate_quiz(self):
+        """Evaluate user answers stored in session_state."""
+        self.grade(st.session_state.get(f"user_answer_{i}", "") for i in range(len(self.question_ids)))
+
+    def grade(self, answers):
+        """Grade `answers`, in question order, and keep the compact results."""
+        with QUIZ_SECONDS.time(operation="evaluate", question_type=self.question_type):
+            self._graded = [
+                (r['question_number'], r['user_answer'], r['correct_answer'], r['is_correct'], r.get('score'))
+                for r in get_grading_engine().grade_batch(zip(self.questions, answers))
+            ]
+        QUESTIONS_GRADED.inc(len(self._graded), question_type=self.question_type)
+
+    def generate_result_dataframe(self):
+        import pandas as pd
+        results = self.results
+        return pd.DataFrame(results) if results else pd.DataFrame()
+
+    def result_summary(self) -> dict:
+        """Score and per-question results for the results view; computed once per submission."""
+        results = self.results
+        correct = sum(1 for r in results if r['is_correct'])
+        return {
+            'results': results,
+            'correct': correct,
+            'total': len(results),
+            'score_percentage': correct / len(results) * 100 if results else 0.0,
+        }
+
+    def save_results(self):
+        """Queue the graded quiz for the results store and return its quiz id."""
+        if not self._graded:
             st.warning("No results to save!")
             return None
 
-        df = self.generate_result_dataframe()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        fname = f"{filename_prefix}_{timestamp}.csv"
-
-        os.makedirs("quiz_results", exist_ok=True)
-        path = os.path.join("quiz_results", fname)
+        from src.results.store import get_results_store
 
         try:
-            df.to_csv(path, index=False)
-            st.success(f"Results saved successfully: {fname}")
-            return path
+            quiz_id = get_results_store().record_quiz(
+                self.results, self.topic, self.question_type, self.difficulty, _session_id()
+            )
+            st.success("Results saved successfully.")
+            return quiz_id
         except Exception as e:
             st.error(f"Failed to save: {e}")
             return None
\ No newline at end of file
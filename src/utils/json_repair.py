@@ -0,0 +1,220 @@
+import re
+import json
+import threading
+from collections import Counter
+from typing import get_args, get_origin
+from src.metrics.registry import REPAIRED_RESPONSES, REPAIR_RULES_APPLIED
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*(.*?)\s*```", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_PY_LITERAL_RE = re.compile(r"([\[{,:]\s*)(True|False|None)\b")
+_SINGLE_QUOTED_RE = re.compile(r"([\[{,:]\s*)'((?:[^'\\]|\\.)*)'")
+_BOOL_STRINGS = {"true": True, "yes": True, "false": False, "no": False}
+
+
+def _strip_code_fences(text):
+    match = _FENCE_RE.search(text)
+    return match.group(1) if match else text
+
+
+def _extract_span(text):
+    """Cut the first top-level JSON value out of surrounding prose, keeping truncated tails."""
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return text
+    start = min(starts)
+
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return text[start:]
+
+
+def _python_literals(text):
+    return _PY_LITERAL_RE.sub(
+        lambda m: m.group(1) + {"True": "true", "False": "false", "None": "null"}[m.group(2)], text
+    )
+
+
+def _single_quotes(text):
+    return _SINGLE_QUOTED_RE.sub(
+        lambda m: m.group(1) + json.dumps(m.group(2).replace("\\'", "'")), text
+    )
+
+
+def _trailing_commas(text):
+    return _TRAILING_COMMA_RE.sub(r"\1", text)
+
+
+def _close_truncated(text):
+    """Close an unterminated string and any brackets left open by a truncated response."""
+    stack = []
+    in_string = escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+
+    if not in_string and not stack:
+        return text
+    text = text + '"' if in_string else text.rstrip().rstrip(",")
+    return text + "".join(reversed(stack))
+
+
+# Applied cumulatively, in order, until the text parses.
+REPAIR_RULES = [
+    ("strip_code_fences", _strip_code_fences),
+    ("extract_json_span", _extract_span),
+    ("python_literals", _python_literals),
+    ("single_quotes", _single_quotes),
+    ("trailing_commas", _trailing_commas),
+    ("close_truncated", _close_truncated),
+]
+
+
+def repair_json(text: str):
+    """Parse `text` as JSON, repairing common LLM syntax defects. Returns (data, rules applied)."""
+    applied = []
+    try:
+        return json.loads(text), applied
+    except (TypeError, ValueError):
+        pass
+
+    for name, rule in REPAIR_RULES:
+        repaired = rule(text)
+        if repaired == text:
+            continue
+        text = repaired
+        applied.append(name)
+        try:
+            return json.loads(text), applied
+        except ValueError:
+            continue
+
+    raise ValueError(f"Could not repair JSON after applying {applied or 'no'} rules")
+
+
+def _model_fields(schema):
+    fields = getattr(schema, "model_fields", None)
+    if fields is not None:
+        return {name: f.annotation for name, f in fields.items()}
+    return {name: f.outer_type_ for name, f in schema.__fields__.items()}
+
+
+def _coerce_value(value, annotation, applied):
+    origin = get_origin(annotation)
+
+    if annotation is bool and isinstance(value, str) and value.strip().lower() in _BOOL_STRINGS:
+        applied.add("coerce_bool")
+        return _BOOL_STRINGS[value.strip().lower()]
+
+    if annotation in (int, float) and isinstance(value, str):
+        try:
+            number = float(value.strip().rstrip("%").replace(",", ""))
+        except ValueError:
+            return value
+        applied.add("coerce_number")
+        return number
+
+    if annotation is str and isinstance(value, (list, tuple)):
+        applied.add("coerce_str")
+        return ", ".join(map(str, value))
+
+    if annotation is str and isinstance(value, (int, float)) and not isinstance(value, bool):
+        applied.add("coerce_str")
+        return str(value)
+
+    if origin in (list, tuple):
+        item_type = (get_args(annotation) or (str,))[0]
+        if isinstance(value, str):
+            applied.add("coerce_list")
+            value = [part.strip() for part in value.split(",")] if "," in value else [value]
+        if isinstance(value, list) and item_type is str and any(not isinstance(v, str) for v in value):
+            applied.add("coerce_str")
+            value = [v if isinstance(v, str) else json.dumps(v) if isinstance(v, bool) else str(v) for v in value]
+        return value
+
+    return value
+
+
+def coerce_to_schema(data, schema):
+    """Fix obvious type mismatches between parsed JSON and `schema`. Returns (data, rules applied)."""
+    applied = set()
+    if isinstance(data, list) and len(data) == 1 and isinstance(data[0], dict):
+        applied.add("unwrap_list")
+        data = data[0]
+    if not isinstance(data, dict):
+        return data, sorted(applied)
+
+    fields = _model_fields(schema)
+    coerced = {}
+    for key, value in data.items():
+        if key not in fields:
+            coerced[key] = value
+        elif value is None and type(None) not in get_args(fields[key]):
+            # let the schema default apply instead of failing on an explicit null
+            applied.add("drop_null")
+        else:
+            coerced[key] = _coerce_value(value, fields[key], applied)
+    return coerced, sorted(applied)
+
+
+def parse_with_repair(content: str, schema):
+    """Repair and coerce an LLM response into `schema`, recording which rules made it parse."""
+    data, applied = repair_json(content)
+    try:
+        result = schema.parse_obj(data)
+    except Exception:
+        data, coerced = coerce_to_schema(data, schema)
+        applied = applied + coerced
+        result = schema.parse_obj(data)
+
+    record_repair(applied)
+    return result
+
+
+def record_repair(applied):
+    """Count a response that parsed only because the `applied` rules fixed it; no-op when none fired."""
+    if not applied:
+        return
+    with _stats_lock:
+        _stats["saved_calls"] += 1
+        _stats.update(applied)
+    REPAIRED_RESPONSES.inc()
+    for rule in applied:
+        REPAIR_RULES_APPLIED.inc(rule=rule)
+
+
+def get_repair_stats() -> dict:
+    """How many LLM calls local repair saved, and how often each rule was involved."""
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,98 @@
+import json
+from src.utils.json_repair import repair_json
+
+
+class IncrementalJSONParser:
+    """Pull complete JSON objects out of a token stream as soon as they close.
+
+    Objects are emitted when they are direct items of the top-level array, of
+    the `questions` array of a `{"questions": [...]}` wrapper (the batch schema's
+    shape), or when the response is a single top-level object. Prose and code
+    fences around the JSON are ignored.
+    """
+
+    WRAPPER_KEY = "questions"
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_depth = None
+        self._item_start = None
+        self._key_start = None
+        self._key = None
+
+    def feed(self, chunk: str) -> list:
+        self._buffer += chunk
+        items = []
+
+        while self._pos < len(self._buffer):
+            ch = self._buffer[self._pos]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = self._buffer[self._key_start:self._pos]
+                        self._key_start = None
+
+            elif ch == '"' and self._depth > 0:
+                self._in_string = True
+                if self._depth == 1 and self._item_depth == 0:
+                    # a string directly inside the top-level object: remember it as the current key
+                    self._key_start = self._pos + 1
+
+            elif ch == "[":
+                if self._item_depth is None:
+                    self._item_depth = self._depth + 1
+                elif self._depth == 1 and self._item_depth == 0 and self._key == self.WRAPPER_KEY:
+                    # {"questions": [...]}: emit the array's objects instead of the wrapper
+                    self._item_depth = 2
+                    self._item_start = None
+                self._depth += 1
+
+            elif ch == "{":
+                if self._item_depth is None:
+                    self._item_depth = self._depth
+                if self._depth == self._item_depth:
+                    self._item_start = self._pos
+                self._depth += 1
+
+            elif ch in "}]" and self._depth > 0:
+                self._depth -= 1
+                if ch == "}" and self._depth == self._item_depth and self._item_start is not None:
+                    item = self._decode(self._buffer[self._item_start:self._pos + 1])
+                    if item is not None:
+                        items.append(item)
+                    self._item_start = None
+
+            self._pos += 1
+
+        self._compact()
+        return items
+
+    @staticmethod
+    def _decode(text):
+        try:
+            return json.loads(text)
+        except ValueError:
+            try:
+                return repair_json(text)[0]
+            except ValueError:
+                return None
+
+    def _compact(self):
+        """Drop consumed text so the buffer only holds the object being built."""
+        keep_from = self._item_start if self._item_start is not None else self._pos
+        self._buffer = self._buffer[keep_from:]
+        self._pos -= keep_from
+        if self._item_start is not None:
+            self._item_start = 0
+        if self._key_start is not None:
+            self._key_start -= keep_from
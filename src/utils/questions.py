@@ -0,0 +1,164 @@
+"""Streamlit-free quiz building blocks shared by the UI, the quiz API and background jobs."""
+import asyncio
+from typing import TYPE_CHECKING
+from src.utils.dedup import QuestionDeduplicator
+from src.config.settings import settings
+
+if TYPE_CHECKING:
+    from src.generator.question_generator import QuestionGenerator
+
+
+def _mcq_to_dict(q):
+    return {
+        'type': 'MCQ',
+        'question': q.question,
+        'options': q.options,
+        'correct_answer': q.correct_answer
+    }
+
+
+def _fill_blank_to_dict(q):
+    return {
+        'type': 'Fill in the blank',
+        'question': q.question,
+        'correct_answer': q.answer
+    }
+
+
+def _true_false_to_dict(q):
+    return {
+        'type': 'True/False',
+        'question': q.question,
+        'correct_answer': q.answer
+    }
+
+
+def _short_answer_to_dict(q):
+    return {
+        'type': 'Short Answer',
+        'question': q.question,
+        'expected_keywords': q.expected_keywords
+    }
+
+
+def _descriptive_to_dict(q):
+    return {
+        'type': 'Descriptive',
+        'question': q.question,
+        'rubric': q.rubric
+    }
+
+
+def _ordering_to_dict(q):
+    return {
+        'type': 'Ordering',
+        'question': q.question,
+        'items': q.items,
+        'correct_order': q.correct_order
+    }
+
+
+def _multi_select_to_dict(q):
+    return {
+        'type': 'Multi-Select',
+        'question': q.question,
+        'options': q.options,
+        'correct_answer': q.correct_answers
+    }
+
+
+def _numerical_to_dict(q):
+    return {
+        'type': 'Numerical',
+        'question': q.question,
+        'correct_answer': q.correct_value
+    }
+
+
+# Maps the UI question type to the generator method suffix and the quiz dict builder.
+QUESTION_BUILDERS = {
+    "multiple choice": ("mcq", _mcq_to_dict),
+    "fill in the blank": ("fill_blank", _fill_blank_to_dict),
+    "true/false": ("true_false", _true_false_to_dict),
+    "short answer": ("short_answer", _short_answer_to_dict),
+    "descriptive": ("descriptive", _descriptive_to_dict),
+    "ordering": ("ordering", _ordering_to_dict),
+    "multi-select": ("multi_select", _multi_select_to_dict),
+    "numerical": ("numerical", _numerical_to_dict),
+}
+BUILDERS_BY_METHOD = {method: to_dict for method, to_dict in QUESTION_BUILDERS.values()}
+
+
+def take_pooled(method, topic, difficulty, num_questions):
+    if not settings.POOL_ENABLED:
+        return []
+    from src.pool.question_pool import get_question_pool
+    return get_question_pool().take(method, topic, difficulty, num_questions)
+
+
+def _unique(dedup, questions):
+    return dedup.filter(questions) if dedup else questions
+
+
+async def _gather_or_cancel(coros) -> list:
+    """Results of `coros` in order, like `asyncio.gather`, but the first failure cancels the rest.
+
+    A quiz is lost once one generation fails, so its siblings should stop
+    retrying and spending LLM quota on the shared loop.
+    """
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            task.cancel()  # no-op for finished tasks; also covers the caller being cancelled
+        await asyncio.wait(tasks)  # let the cancelled ones unwind before reporting
+    errors = [task.exception() for task in tasks if not task.cancelled() and task.exception() is not None]
+    if errors:
+        raise errors[0]
+    return [task.result() for task in tasks]
+
+
+async def _agenerate_all(generator: "QuestionGenerator", method: str, topic: str, difficulty: str, num_questions: int, max_concurrency: int):
+    """Fan out `num_questions` generations with at most `max_concurrency` LLM calls in flight."""
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    if settings.BATCH_SIZE > 1:
+        sizes = [min(settings.BATCH_SIZE, num_questions - i) for i in range(0, num_questions, settings.BATCH_SIZE)]
+
+        async def bounded(size):
+            async with semaphore:
+                return await generator.agenerate_batch(method, topic, difficulty, size)
+
+        batches = await _gather_or_cancel(bounded(size) for size in sizes)
+        return [q for batch in batches for q in batch]
+
+    agenerate = getattr(generator, f"agenerate_{method}")
+
+    async def bounded_single():
+        async with semaphore:
+            return await agenerate(topic, difficulty)
+
+    # results stay in submission order regardless of completion order
+    return await _gather_or_cancel(bounded_single() for _ in range(num_questions))
+
+
+async def acollect_questions(generator: "QuestionGenerator", method: str, topic: str, difficulty: str, num_questions: int, max_concurrency: int = None) -> list:
+    """Pooled plus freshly generated, de-duplicated schema questions for one quiz."""
+    dedup = QuestionDeduplicator() if settings.DEDUP_ENABLED else None
+    questions = _unique(dedup, take_pooled(method, topic, difficulty, num_questions))
+    missing = num_questions - len(questions)
+    if missing > 0:
+        questions += _unique(dedup, await _agenerate_all(
+            generator, method, topic, difficulty, missing,
+            max_concurrency or settings.MAX_CONCURRENCY
+        ))
+
+    for _ in range(settings.DEDUP_MAX_ROUNDS if dedup else 0):
+        missing = num_questions - len(questions)
+        if missing <= 0:
+            break
+        questions += dedup.filter(
+            await generator.agenerate_batch(method, topic, difficulty, missing, exclude=dedup.stems)
+        )
+    return questions
@@ -0,0 +1,68 @@
+import pytest
+from starlette.testclient import TestClient
+from src.api.server import QuizService, Quiz, create_app
+from src.config.settings import settings
+from src.models.question_schemas import MultiSelectQuestion, OrderingQuestion
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "API_RECORD_RESULTS", False)
+    service = QuizService()
+    service._store(Quiz("multi", "chemistry", "multi_select", "easy", [
+        MultiSelectQuestion(question="Which are noble gases?", options=["He", "Ne", "O", "N"], correct_answers=["He", "Ne"]),
+    ]))
+    service._store(Quiz("order", "history", "ordering", "easy", [
+        OrderingQuestion(question="Order these.", items=["b", "a", "c"], correct_order=["a", "b", "c"]),
+    ]))
+    return service
+
+
+@pytest.fixture
+def client(service):
+    return TestClient(create_app(service))
+
+
+@pytest.mark.parametrize("answer, correct", [
+    (["Ne", "He"], True),
+    (["He"], False),
+    (5, False),
+    ("He", False),
+    ([{"option": "He"}], False),
+])
+def test_multi_select_answer_shapes(client, answer, correct):
+    response = client.post("/quizzes/multi/answers", json={"answers": [answer]})
+    assert response.status_code == 200
+    assert response.json()["results"][0]["is_correct"] is correct
+
+
+@pytest.mark.parametrize("answer, correct", [
+    ("a, b, c", True),
+    (["a", "b", "c"], True),
+    (["c", "b", "a"], False),
+    (7, False),
+])
+def test_ordering_answer_shapes(client, answer, correct):
+    response = client.post("/quizzes/order/answers", json={"answers": [answer]})
+    assert response.status_code == 200
+    assert response.json()["results"][0]["is_correct"] is correct
+
+
+def test_missing_answers_count_as_blank(client):
+    body = client.post("/quizzes/multi/answers", json={"answers": []}).json()
+    assert body["total"] == 1 and body["correct"] == 0
+
+
+def test_bad_requests(client):
+    assert client.post("/quizzes/nope/answers", json={"answers": []}).status_code == 404
+    assert client.post("/quizzes/multi/answers", json={"answers": 5}).status_code == 422
+
+
+def test_grading_errors_are_422(client, service, monkeypatch):
+    def broken(*args):
+        raise TypeError("unexpected answer")
+
+    monkeypatch.setattr(service, "submit", broken)
+    response = client.post("/quizzes/multi/answers", json={"answers": [1]})
+    assert response.status_code == 422
+    assert "unexpected answer" in response.json()["detail"]
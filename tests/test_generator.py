@@ -0,0 +1,105 @@
+import time
+import asyncio
+import pytest
+from benchmarks.fake_llm import FakeLLM, Latency
+from src.config.settings import settings
+from src.generator import question_generator
+from src.generator.question_generator import QuestionGenerator
+
+
+class SlowLimiter:
+    """Every acquire waits `wait` seconds, like a limiter with a long local queue."""
+
+    def __init__(self, wait):
+        self.wait = wait
+
+    async def aacquire(self, tokens):
+        await asyncio.sleep(self.wait)
+
+    def acquire(self, tokens):
+        time.sleep(self.wait)
+
+    def try_acquire(self, tokens):
+        return True
+
+    def charge(self, tokens):
+        pass
+
+    def pause(self, seconds):
+        pass
+
+
+class SchemaRejected(Exception):
+    """A 400 the way Groq reports a json_schema response that failed validation."""
+
+    status_code = 400
+
+    def __init__(self):
+        super().__init__("Error code: 400 - {'error': {'code': 'json_validate_failed'}}")
+
+
+class RejectingStructuredLLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, prompt, **kwargs):
+        self.calls += 1
+        raise SchemaRejected()
+
+
+class RecordingRouter:
+    def __init__(self):
+        self.records = []
+
+    def record(self, model, latency, ok):
+        self.records.append((model, latency, ok))
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "HEDGING_ENABLED", False)
+    monkeypatch.setattr(settings, "GENERATION_MODE", "parser")
+    monkeypatch.setattr(question_generator, "get_rate_limiter", lambda: SlowLimiter(0.3))
+    llm = FakeLLM(latency=Latency.parse("fixed:0.01"))
+    generator = QuestionGenerator(llm=llm)
+    generator.router = RecordingRouter()
+    generator._route = lambda question_type, difficulty: ("fast-model", llm)
+    return generator
+
+
+def test_route_latency_excludes_limiter_wait(generator):
+    generator.generate("mcq", "physics", "easy")
+    generator.generate_batch("true_false", "physics", "easy", 3)
+    list(generator.stream_questions("ordering", "physics", "easy", 2))
+    assert len(generator.router.records) == 3
+    for model, latency, ok in generator.router.records:
+        assert ok and latency < 0.2
+
+
+def test_invalid_question_counts_against_the_model(generator, monkeypatch):
+    failures = iter([ValueError("bad"), None])
+
+    def validate(question_type, question):
+        error = next(failures)
+        if error:
+            raise error
+
+    monkeypatch.setattr(generator, "_validate", validate)
+    generator.generate("mcq", "physics", "easy")
+    assert [ok for _, _, ok in generator.router.records] == [False, True]
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_rejected_structured_output_retries_on_the_parser_path(generator, monkeypatch, batch):
+    monkeypatch.setattr(settings, "GENERATION_MODE", "structured")
+    llm = generator.llm
+    structured = RejectingStructuredLLM()
+    monkeypatch.setattr(llm, "with_structured_output", lambda schema, **kwargs: structured)
+    calls = llm.stats["calls"]
+
+    if batch:
+        assert len(generator.generate_batch("mcq", "physics", "easy", 2)) == 2
+    else:
+        assert generator.generate("mcq", "physics", "easy") is not None
+    assert structured.calls == 1 and llm.stats["calls"] == calls + 1
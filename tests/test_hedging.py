@@ -0,0 +1,50 @@
+import asyncio
+import pytest
+from src.llm.hedging import Hedger
+from src.metrics.registry import HEDGES
+
+
+def make_hedger():
+    hedger = Hedger(percentile=0.5, min_delay=0.0, window=10, min_samples=1, budget_ratio=1.0, budget_burst=1.0)
+    hedger.observe("mcq", 0.01)
+    return hedger
+
+
+def slow_then_fast():
+    """First call is slow, later calls answer at once."""
+    calls = []
+
+    async def call():
+        calls.append(len(calls))
+        await asyncio.sleep(0.5 if len(calls) == 1 else 0.0)
+        return len(calls)
+
+    return call, calls
+
+
+def test_hedge_fires_and_wins_when_capacity_is_free():
+    hedger = make_hedger()
+    call, calls = slow_then_fast()
+    won = HEDGES.value(question_type="mcq", event="won")
+    assert asyncio.run(hedger.run("mcq", call, lambda: True)) == 2
+    assert len(calls) == 2
+    assert HEDGES.value(question_type="mcq", event="won") == won + 1
+
+
+def test_no_hedge_without_limiter_capacity():
+    hedger = make_hedger()
+    call, calls = slow_then_fast()
+    limited = HEDGES.value(question_type="mcq", event="rate_limited")
+    assert asyncio.run(hedger.run("mcq", call, lambda: False)) == 1
+    assert len(calls) == 1
+    assert HEDGES.value(question_type="mcq", event="rate_limited") == limited + 1
+    # the unused hedge goes back into the budget
+    assert hedger._spend()
+
+
+def test_budget_caps_hedges():
+    hedger = make_hedger()
+    hedger.budget_ratio = 0.0
+    call, calls = slow_then_fast()
+    assert asyncio.run(hedger.run("mcq", call, lambda: pytest.fail("reserved without budget"))) == 1
+    assert len(calls) == 1
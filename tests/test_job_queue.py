@@ -0,0 +1,126 @@
+import time
+import threading
+import pytest
+from src.jobs.job_queue import JobQueue, JobRejectedError, RUNNING, DONE, FAILED
+
+
+class FakeManager:
+    """Stands in for QuizManager: yields `num_questions` dicts once released."""
+
+    release = threading.Event()
+
+    def __init__(self):
+        self.question_ids = []
+
+    def generate_questions_stream(self, generator, topic, question_type, difficulty, num_questions):
+        self.release.wait(5)
+        if topic == "boom":
+            raise RuntimeError("generation failed")
+        for i in range(num_questions):
+            self.question_ids.append(i)
+            yield {"question": f"{topic} {i}"}
+
+
+@pytest.fixture
+def manager():
+    """A FakeManager with its own release event, so workers left from earlier tests stay out of this one."""
+    return type("Manager", (FakeManager,), {"release": threading.Event()})
+
+
+@pytest.fixture
+def jobs(manager):
+    queue = JobQueue(manager, None, workers=1, max_queued=3, max_per_user=2)
+    yield queue
+    manager.release.set()
+
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.fetch(job_id)
+        if job is not None:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_rejects_unsupported_question_type(jobs):
+    with pytest.raises(ValueError):
+        jobs.submit("alice", "physics", "Essay", "easy", 3)
+    assert jobs.depth() == 0
+
+
+def test_limits_each_users_share(jobs):
+    jobs.submit("alice", "physics", "Multiple Choice", "easy", 1)
+    jobs.submit("alice", "physics", "Multiple Choice", "easy", 1)
+    with pytest.raises(JobRejectedError):
+        jobs.submit("alice", "physics", "Multiple Choice", "easy", 1)
+    jobs.submit("bob", "physics", "Multiple Choice", "easy", 1)
+
+
+def test_limits_the_whole_backlog(jobs):
+    # one job is taken by the worker, the next three fill the queue
+    for user in ("a", "b", "c", "d"):
+        jobs.submit(user, "physics", "True/False", "easy", 1)
+        time.sleep(0.05)
+    assert jobs.depth() == 3
+    with pytest.raises(JobRejectedError):
+        jobs.submit("e", "physics", "True/False", "easy", 1)
+
+
+def test_users_are_served_round_robin(jobs, manager):
+    order = []
+    original = manager.generate_questions_stream
+
+    def recording(self, generator, topic, *args):
+        order.append(topic)
+        return original(self, generator, topic, *args)
+
+    manager.generate_questions_stream = recording
+    try:
+        blocker = jobs.submit("x", "blocker", "Ordering", "easy", 1)
+        time.sleep(0.05)
+        ids = [
+            jobs.submit("alice", "a1", "Ordering", "easy", 1),
+            jobs.submit("alice", "a2", "Ordering", "easy", 1),
+            jobs.submit("bob", "b1", "Ordering", "easy", 1),
+        ]
+        manager.release.set()
+        for job_id in [blocker] + ids:
+            wait_for(jobs, job_id)
+    finally:
+        manager.generate_questions_stream = original
+    assert order == ["blocker", "a1", "b1", "a2"]
+
+
+def test_reports_progress_and_errors(jobs, manager):
+    ok = jobs.submit("alice", "physics", "Numerical", "easy", 3)
+    failed = jobs.submit("bob", "boom", "Numerical", "easy", 3)
+    assert jobs.status(ok)["total"] == 3
+    manager.release.set()
+
+    job = wait_for(jobs, ok)
+    assert job.status == DONE and job.ready == 3 and job.manager.question_ids == [0, 1, 2]
+    job = wait_for(jobs, failed)
+    assert job.status == FAILED and job.error == "generation failed"
+
+
+def test_progress_counts_questions_while_streaming(jobs, manager):
+    resume = threading.Event()
+    original = manager.generate_questions_stream
+
+    def slow_second_half(self, *args):
+        for i, question in enumerate(original(self, *args)):
+            if i == 1:
+                resume.wait(5)
+            yield question
+
+    manager.generate_questions_stream = slow_second_half
+    job_id = jobs.submit("alice", "physics", "Numerical", "easy", 2)
+    manager.release.set()
+    deadline = time.monotonic() + 5
+    while jobs.status(job_id)["ready"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert jobs.status(job_id)["status"] == RUNNING and jobs.status(job_id)["ready"] == 1
+    resume.set()
+    assert wait_for(jobs, job_id).ready == 2
@@ -0,0 +1,51 @@
+import json
+import pytest
+from src.utils.json_stream import IncrementalJSONParser
+
+QUESTIONS = [
+    {"question": "Which {brace} is \"quoted\"?", "options": ["a", "b]"], "correct_answer": "a"},
+    {"question": "Second", "meta": {"nested": [1, 2]}},
+    {"question": "Third"},
+]
+
+
+def feed_in_chunks(text, size):
+    parser, emitted = IncrementalJSONParser(), []
+    for i in range(0, len(text), size):
+        emitted.append(parser.feed(text[i:i + size]))
+    return parser, emitted
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 10000])
+def test_array_items_stream_as_they_close(size):
+    parser, emitted = feed_in_chunks("```json\n" + json.dumps(QUESTIONS, indent=2) + "\n```", size)
+    assert [item for batch in emitted for item in batch] == QUESTIONS
+    if size == 1:
+        # each item is emitted as soon as its closing brace arrives, not at the end
+        assert sum(1 for batch in emitted if batch) == len(QUESTIONS)
+
+
+@pytest.mark.parametrize("size", [1, 7, 10000])
+def test_questions_wrapper_streams_its_items(size):
+    text = "Here you go: " + json.dumps({"questions": QUESTIONS})
+    parser, emitted = feed_in_chunks(text, size)
+    assert [item for batch in emitted for item in batch] == QUESTIONS
+
+
+def test_wrapper_items_arrive_before_the_stream_ends():
+    text = json.dumps({"questions": QUESTIONS})
+    parser = IncrementalJSONParser()
+    first_item_end = text.index("}", text.index("correct_answer")) + 1
+    assert parser.feed(text[:first_item_end]) == [QUESTIONS[0]]
+
+
+def test_single_object_is_one_item():
+    single = {"question": "Only one", "options": ["x", "y"], "questions": "not a list"}
+    parser, emitted = feed_in_chunks(json.dumps(single), 5)
+    assert [item for batch in emitted for item in batch] == [single]
+
+
+def test_malformed_item_is_skipped():
+    text = '[{"question": "ok"}, {"question": oops}, {"question": "fine"}]'
+    parser, emitted = feed_in_chunks(text, 4)
+    assert [item for batch in emitted for item in batch] == [{"question": "ok"}, {"question": "fine"}]
@@ -0,0 +1,75 @@
+import pytest
+from src.grading.engine import GradingEngine
+from src.grading.lexical import answer_terms, reference_vector, score_batch, stem, term_id
+
+SHORT = {
+    "type": "Short Answer",
+    "question": "What does photosynthesis produce?",
+    "expected_keywords": ["glucose", "oxygen", "chemical energy"],
+}
+DESCRIPTIVE = {
+    "type": "Descriptive",
+    "question": "Describe the water cycle.",
+    "rubric": "Mentions evaporation, condensation, precipitation and collection.",
+}
+
+
+@pytest.fixture
+def engine():
+    return GradingEngine()
+
+
+def test_stem_folds_inflections():
+    assert stem("cells") == stem("cell")
+    assert stem("studies") == "study"
+    assert stem("class") == "class"
+    assert term_id("Cells".lower()) == term_id("cell")
+
+
+def test_answer_terms_drop_stopwords_and_short_tokens():
+    assert answer_terms("the a of glucose") == {term_id("glucose")}
+
+
+def test_multi_word_keyword_weighs_as_one_phrase():
+    terms, weights = reference_vector(("glucose", "chemical energy"), 1.2)
+    by_term = dict(zip(terms.tolist(), weights.tolist()))
+    assert by_term[term_id("glucose")] == pytest.approx(1.0)
+    assert by_term[term_id("chemical")] == pytest.approx(0.5)
+    assert by_term[term_id("energy")] == pytest.approx(0.5)
+
+
+def test_score_is_covered_share_of_reference():
+    reference = reference_vector(("glucose", "oxygen"), 1.2)
+    scores = score_batch([reference, reference, reference], ["glucose and oxygen", "just glucose", "nothing"])
+    assert scores.tolist() == pytest.approx([1.0, 0.5, 0.0])
+
+
+def test_empty_reference_scores_zero():
+    assert score_batch([reference_vector((), 1.2)], ["anything"]).tolist() == [0.0]
+
+
+def test_short_answer_verdict_and_score(engine):
+    result = engine.grade(SHORT, "It makes glucose and releases oxygen.")
+    assert result["is_correct"] is True
+    assert result["score"] == pytest.approx(2 / 3, abs=1e-3)
+    assert result["correct_answer"] == "glucose, oxygen, chemical energy"
+
+    assert engine.grade(SHORT, "I am not sure.")["is_correct"] is False
+
+
+@pytest.mark.parametrize("question, answer", [
+    (SHORT, "It makes glucose."),
+    (SHORT, "Glucose, oxygen and chemical energy."),
+    (DESCRIPTIVE, "Water evaporates, condenses into clouds and falls as precipitation."),
+    (DESCRIPTIVE, "Rivers."),
+])
+def test_grade_and_grade_batch_agree(engine, question, answer):
+    alone = engine.grade(question, answer)
+    others = [
+        (SHORT, "oxygen"),
+        (DESCRIPTIVE, "evaporation"),
+        ({"type": "Short Answer", "question": "Name a gas.", "expected_keywords": ["oxygen", "water"]}, "water"),
+    ]
+    in_batch = engine.grade_batch(others + [(question, answer)] + others)[len(others)]
+    assert in_batch["score"] == alone["score"]
+    assert in_batch["is_correct"] == alone["is_correct"]
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import pytest
+from src.cache.question_cache import QuestionCache
+from src.config.settings import settings
+from src.metrics.registry import CACHE_LOOKUPS
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return QuestionCache(db_path=str(tmp_path / "cache.sqlite"), memory_size=2, max_entries=3, variants=2)
+
+
+def test_key_normalizes_topic_and_difficulty():
+    assert QuestionCache.make_key("mcq", "  Cell  Biology", "Easy ") == QuestionCache.make_key("mcq", "cell biology", "easy")
+
+
+def test_key_depends_on_model():
+    key = QuestionCache.make_key("mcq", "physics", "easy")
+    assert key == QuestionCache.make_key("mcq", "physics", "easy", settings.MODEL_NAME)
+    assert key != QuestionCache.make_key("mcq", "physics", "easy", "some-other-model")
+    assert key != QuestionCache.make_key("fill_blank", "physics", "easy")
+
+
+def test_key_is_a_hit_only_once_full(cache):
+    key = cache.make_key("mcq", "physics", "easy")
+    misses = CACHE_LOOKUPS.value(result="miss", tier="none")
+    cache.put(key, {"question": "a"})
+    assert cache.get_many(key, 2) == []
+    cache.put(key, {"question": "b"})
+    assert sorted(p["question"] for p in cache.get_many(key, 2)) == ["a", "b"]
+    assert CACHE_LOOKUPS.value(result="miss", tier="none") == misses + 1
+    assert cache.stats["hits"] == 1 and cache.stats["memory_hits"] == 1
+
+
+def test_disk_tier_survives_memory_eviction(cache):
+    keys = [cache.make_key("mcq", f"topic {i}", "easy") for i in range(3)]
+    for key in keys:
+        cache.put_many(key, [{"question": "a"}, {"question": "b"}])
+    assert len(cache.get_many(keys[0], 1)) == 1
+    assert cache.stats["disk_hits"] == 1
+
+
+def test_evicts_least_recently_used_beyond_max_entries(cache):
+    keys = [cache.make_key("mcq", f"topic {i}", "easy") for i in range(4)]
+    for key in keys:
+        cache.put_many(key, [{"question": "a"}, {"question": "b"}])
+    assert cache.stats["evictions"] == 1
+    assert cache.get_many(keys[0], 1) == []
+    assert len(cache.get_many(keys[3], 1)) == 1
+
+
+class ThreadRecordingConnection:
+    """Wraps the SQLite connection and notes which threads run statements on it."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.threads = set()
+
+    def __getattr__(self, name):
+        self.threads.add(threading.get_ident())
+        return getattr(self.conn, name)
+
+
+def test_async_lookups_keep_sqlite_off_the_event_loop(cache):
+    keys = [cache.make_key("mcq", f"topic {i}", "easy") for i in range(3)]
+    cache._conn = recorder = ThreadRecordingConnection(cache._conn)
+
+    async def exercise():
+        for key in keys:
+            await cache.aput_many(key, [{"question": "a"}, {"question": "b"}])
+        assert len(await cache.aget_many(keys[2], 1)) == 1  # memory tier
+        assert len(await cache.aget_many(keys[0], 1)) == 1  # evicted from memory, read from disk
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(exercise())
+    assert recorder.threads and loop_thread not in recorder.threads
+    assert cache.stats["memory_hits"] == 1 and cache.stats["disk_hits"] == 1
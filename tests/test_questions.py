@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from src.config.settings import settings
+from src.utils.questions import acollect_questions
+
+
+class FakeGenerator:
+    """Counts in-flight calls; question `fail_at` raises, the others take `delay` seconds."""
+
+    def __init__(self, delay=0.01, fail_at=None):
+        self.delay = delay
+        self.fail_at = fail_at
+        self.started = 0
+        self.finished = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _one(self, index, delay):
+        self.started += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(delay)
+            if index == self.fail_at:
+                raise RuntimeError("generation failed")
+            self.finished += 1
+            return index
+        finally:
+            self.in_flight -= 1
+
+    async def agenerate_mcq(self, topic, difficulty):
+        index = self.started
+        # later questions finish first, so order only holds if results are kept in submission order
+        return await self._one(index, self.delay * (10 - index % 10))
+
+    async def agenerate_batch(self, method, topic, difficulty, n, exclude=None):
+        index = self.started
+        await self._one(index, self.delay)
+        return [f"{index}-{i}" for i in range(n)]
+
+
+@pytest.fixture(autouse=True)
+def plain_generation(monkeypatch):
+    monkeypatch.setattr(settings, "DEDUP_ENABLED", False)
+    monkeypatch.setattr(settings, "POOL_ENABLED", False)
+    monkeypatch.setattr(settings, "BATCH_SIZE", 1)
+
+
+def collect(generator, n, max_concurrency):
+    return asyncio.run(acollect_questions(generator, "mcq", "physics", "easy", n, max_concurrency))
+
+
+def test_keeps_submission_order():
+    assert collect(FakeGenerator(), 8, 8) == list(range(8))
+
+
+def test_respects_max_concurrency():
+    generator = FakeGenerator(delay=0.001)
+    assert len(collect(generator, 12, 3)) == 12
+    assert generator.max_in_flight == 3
+
+
+def test_batches_fan_out_in_order(monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_SIZE", 4)
+    assert collect(FakeGenerator(), 10, 4) == ["0-0", "0-1", "0-2", "0-3", "1-0", "1-1", "1-2", "1-3", "2-0", "2-1"]
+
+
+def test_first_failure_cancels_the_rest():
+    # question 9 fails first (shortest delay); the others are still sleeping and must not finish
+    generator = FakeGenerator(delay=0.02, fail_at=9)
+    with pytest.raises(RuntimeError, match="generation failed"):
+        collect(generator, 10, 10)
+    assert generator.finished == 0
+    assert generator.in_flight == 0
@@ -0,0 +1,80 @@
+import time
+import pytest
+from src.results.store import ResultsStore, COLUMNS
+
+pytest.importorskip("pyarrow")
+
+RESULTS = [
+    {"question_number": 1, "question": "2 + 2?", "user_answer": "4", "correct_answer": 4, "is_correct": True},
+    {"question_number": 2, "question": "Pick two", "user_answer": ["a", "b"], "correct_answer": ["a", "c"],
+     "is_correct": False},
+    {"question_number": 3, "question": "Explain", "user_answer": "cells", "correct_answer": "cell, energy",
+     "is_correct": False, "score": 0.5},
+    {"question_number": 4, "question": "Essay", "user_answer": "", "correct_answer": "Manual Review Needed",
+     "is_correct": None},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(db_path=str(tmp_path / "results.sqlite"), parquet_dir=str(tmp_path / "segments"),
+                         flush_interval=0.05, compact_min_rows=1, compact_interval=3600)
+    yield store
+    store.close()
+
+
+def test_round_trip(store):
+    quiz_id = store.record_quiz(RESULTS, topic="  Cell Biology ", question_type="short_answer",
+                                difficulty="Easy", session_id="s1")
+    rows = list(store.query(quiz_id=quiz_id))
+    assert [r["question_number"] for r in rows] == [1, 2, 3, 4]
+    assert {r["topic"] for r in rows} == {"cell biology"}
+    assert {r["difficulty"] for r in rows} == {"easy"}
+    assert rows[0]["correct_answer"] == "4"
+    assert rows[1]["user_answer"] == '["a", "b"]'
+    assert [r["is_correct"] for r in rows] == [1, 0, 0, None]
+    assert [r["score"] for r in rows] == [None, None, 0.5, None]
+    assert store.stats["quizzes"] == 1 and store.stats["rows"] == 4
+
+
+def test_filters(store):
+    store.record_quiz(RESULTS[:1], topic="physics", question_type="mcq")
+    store.record_quiz(RESULTS[:2], topic="chemistry", question_type="mcq")
+    store.record_quiz(RESULTS[:3], topic="physics", question_type="short_answer")
+    assert len(list(store.query(topic="Physics"))) == 4
+    assert len(list(store.query(question_type="mcq"))) == 3
+    assert len(list(store.query(since=time.time() + 60))) == 0
+    assert len(list(store.query(limit=2))) == 2
+
+
+def test_compaction_moves_rows_to_parquet(store):
+    first = store.record_quiz(RESULTS, topic="physics")
+    store.flush()
+    assert store.compact(older_than=0) == len(RESULTS)
+    second = store.record_quiz(RESULTS[:1], topic="physics")
+    store.flush()
+
+    remaining = store._conn.execute("SELECT COUNT(*) FROM quiz_results").fetchone()[0]
+    assert remaining == 1
+    assert store.stats["segments"] == 1
+
+    rows = list(store.query(topic="physics"))
+    assert [r["quiz_id"] for r in rows] == [first] * len(RESULTS) + [second]
+    assert [r["score"] for r in rows[:len(RESULTS)]] == [None, None, 0.5, None]
+    assert len(list(store.query(quiz_id=first))) == len(RESULTS)
+
+
+def test_compaction_waits_for_min_rows(store):
+    store.compact_min_rows = 10
+    store.record_quiz(RESULTS, topic="physics")
+    store.flush()
+    assert store.compact(older_than=0) == 0
+
+
+def test_csv_export(store):
+    store.record_quiz(RESULTS[2:], topic="biology")
+    lines = store.export_csv(topic="biology").splitlines()
+    assert lines[0].split(",") == list(COLUMNS)
+    assert len(lines) == 3
+    assert lines[1].endswith(",False,0.5")
+    assert lines[2].endswith(",,")
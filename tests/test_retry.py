@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+import httpx
+import pytest
+from pydantic import BaseModel, ValidationError
+from langchain_core.exceptions import OutputParserException
+from src.llm.retry import (
+    classify_error, backoff_delay, retry_after, TokenBucket,
+    RATE_LIMIT, TRANSIENT, PARSE, VALIDATION, FATAL,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, message="error", headers=None):
+        super().__init__(message)
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+class Model(BaseModel):
+    value: int
+
+
+def _validation_error():
+    try:
+        Model(value="not a number")
+    except ValidationError as e:
+        return e
+
+
+@pytest.mark.parametrize("error, kind", [
+    (StatusError(429), RATE_LIMIT),
+    (StatusError(503), TRANSIENT),
+    (StatusError(408), TRANSIENT),
+    (StatusError(401), FATAL),
+    (StatusError(400, "tool_use_failed: arguments do not match"), PARSE),
+    (StatusError(400, "json_validate_failed: Generated JSON does not match the expected schema"), PARSE),
+    (StatusError(400, "invalid_request_error"), FATAL),
+    (httpx.ReadTimeout("timed out"), TRANSIENT),
+    (TimeoutError(), TRANSIENT),
+    (OutputParserException("bad json"), PARSE),
+    (ValueError("missing field"), VALIDATION),
+    (_validation_error(), VALIDATION),
+    (KeyError("question"), FATAL),
+    (TypeError("unexpected"), FATAL),
+])
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
+
+
+def test_parse_and_validation_retry_immediately():
+    assert backoff_delay(PARSE, 3) == 0.0
+    assert backoff_delay(VALIDATION, 3) == 0.0
+
+
+def test_rate_limit_waits_at_least_retry_after():
+    error = StatusError(429, headers={"retry-after": "7"})
+    assert retry_after(error) == 7.0
+    assert backoff_delay(RATE_LIMIT, 0, error) >= 7.0
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(capacity=10, refill_per_second=2)
+    now = bucket.updated_at
+    assert bucket.wait_time(5, now) == 0.0
+    bucket.tokens = 0
+    assert bucket.wait_time(5, now) == pytest.approx(2.5)
+    assert bucket.wait_time(50, now) == pytest.approx(5.0)  # capped at capacity